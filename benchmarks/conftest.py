@@ -0,0 +1,65 @@
+import tracemalloc
+
+import pytest
+
+from class_inspector.cache import MODULE_CACHE
+
+pytest.importorskip("pytest_benchmark")
+
+N_FUNCS = [10, 100, 1000]
+N_ELEMENTS = [10**3, 10**4, 10**5, 10**6]
+
+FUNC_TEMPLATE = '''
+def func_{idx}(a: int, b: str, c: Optional[float] = None) -> str:
+    """synthetic function {idx}"""
+    if c is None:
+        raise ValueError()
+    return str(a) + b
+'''
+
+METHOD_TEMPLATE = """
+class Class{idx}:
+    def method_{idx}(self, a: List[int], b: Dict[str, int]) -> int:
+        double = lambda x: x * 2
+        return double(len(a) + len(b))
+"""
+
+
+def make_module_src(n_funcs: int) -> str:
+    src = ["from typing import Dict, List, Optional\n"]
+    for idx in range(n_funcs):
+        template = METHOD_TEMPLATE if idx % 2 else FUNC_TEMPLATE
+        src.append(template.format(idx=idx))
+    return "\n".join(src)
+
+
+@pytest.fixture(params=N_FUNCS, ids=lambda n: f"{n}_funcs")
+def module_src(request):
+    return make_module_src(request.param)
+
+
+@pytest.fixture(params=N_ELEMENTS, ids=lambda n: f"{n}_elements")
+def n_elements(request):
+    return request.param
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Time `func` with pytest-benchmark and record its peak traced memory."""
+
+    def _(func, *args, cold_cache: bool = False):
+        setup = MODULE_CACHE.clear if cold_cache else None
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        benchmark.extra_info["peak_bytes"] = peak
+
+        return benchmark.pedantic(
+            func, args, setup=setup, rounds=5, warmup_rounds=1, iterations=1
+        )
+
+    return _
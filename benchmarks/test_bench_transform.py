@@ -0,0 +1,58 @@
+import libcst as cst
+import pytest
+
+import class_inspector.transform as tf
+from class_inspector.create_tests import get_tests
+from class_inspector.cst_walkers import AddBoilerplateTransformer, FuncVisitor
+from class_inspector.utils import format_code_str, str_to_cst
+
+
+def _visit(module: cst.Module) -> dict:
+    visitor = FuncVisitor()
+    module.visit(visitor)
+    return visitor.funcs
+
+
+@pytest.mark.benchmark(group="format_code_str")
+def test_bench_format_code_str(measure, module_src):
+    measure(format_code_str, module_src)
+
+
+@pytest.mark.benchmark(group="str_to_cst")
+def test_bench_str_to_cst(measure, module_src):
+    measure(str_to_cst, module_src)
+
+
+@pytest.mark.benchmark(group="func_visitor")
+def test_bench_func_visitor(measure, module_src):
+    measure(_visit, str_to_cst(module_src))
+
+
+@pytest.mark.benchmark(group="add_boilerplate_transformer")
+def test_bench_add_boilerplate_transformer(measure, module_src):
+    module = str_to_cst(module_src)
+    transformer = AddBoilerplateTransformer(_visit(module), True, True)
+    measure(module.visit, transformer)
+
+
+@pytest.mark.benchmark(group="get_tests")
+def test_bench_get_tests(measure, module_src):
+    measure(get_tests, _visit(str_to_cst(module_src)), True, True)
+
+
+@pytest.mark.benchmark(group="add_boilerplate")
+@pytest.mark.parametrize("cold_cache", [True, False], ids=["cold", "warm"])
+def test_bench_add_boilerplate(measure, module_src, cold_cache):
+    measure(tf.add_boilerplate_from_src, module_src, True, True, cold_cache=cold_cache)
+
+
+@pytest.mark.benchmark(group="get_parametrized_tests")
+@pytest.mark.parametrize("cold_cache", [True, False], ids=["cold", "warm"])
+def test_bench_get_parametrized_tests(measure, module_src, cold_cache):
+    measure(
+        tf.get_parametrized_tests_from_src,
+        module_src,
+        True,
+        True,
+        cold_cache=cold_cache,
+    )
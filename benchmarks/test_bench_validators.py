@@ -0,0 +1,52 @@
+from collections import abc
+
+import attrs
+import pytest
+
+from class_inspector.custom_validators import (
+    compile_generic_of_type,
+    validate_collection_of_type,
+    validate_generic_bool_func,
+    validate_generic_of_type,
+    validate_iterable_of_type,
+    validate_sequence_of_type,
+)
+from class_inspector.fused_validators import define_fused
+
+VALIDATORS = {
+    "collection_of_type": validate_collection_of_type(int),
+    "iterable_of_type": validate_iterable_of_type(int),
+    "sequence_of_type": validate_sequence_of_type(int),
+    "generic_of_type": validate_generic_of_type(abc.Sequence, int),
+    "compiled_generic_of_type": compile_generic_of_type(abc.Sequence, int),
+    "generic_bool_func": validate_generic_bool_func(list, lambda item: item >= 0),
+}
+
+
+@pytest.mark.benchmark(group="validators")
+@pytest.mark.parametrize("validator", VALIDATORS.values(), ids=VALIDATORS.keys())
+def test_bench_validator(measure, n_elements, validator):
+    @attrs.define
+    class Record:
+        values: list = attrs.field(validator=[validator])
+
+    measure(Record, list(range(n_elements)))
+
+
+N_FIELDS = 20
+
+
+@pytest.mark.benchmark(group="record_init")
+@pytest.mark.parametrize(
+    "decorator", [attrs.define, define_fused], ids=["define", "fused"]
+)
+def test_bench_record_init(benchmark, decorator):
+    fields = {
+        f"field_{idx}": attrs.field(validator=[attrs.validators.instance_of(int)])
+        for idx in range(N_FIELDS)
+    }
+    Record = decorator(
+        type("Record", (), {"__annotations__": dict.fromkeys(fields, int), **fields})
+    )
+
+    benchmark(Record, *range(N_FIELDS))
@@ -0,0 +1,28 @@
+from typing import List
+
+
+def main(filepath: str, columns: List[str]) -> bool:
+    data = _read_data(filepath, columns)
+    return _save_data(data, filepath.upper())
+
+
+def _read_data(filepath: str, columns: List[str]) -> dict:
+    if _check_extension(filepath=filepath):
+        return dict.fromkeys(columns)
+    raise FileNotFoundError
+
+
+def _check_extension(filepath: str) -> bool:
+    return filepath.endswith(".csv")
+
+
+def _save_data(data: dict, filepath: str) -> bool:
+    return bool(data) and bool(filepath)
+
+
+def _used_as_callback(value: int) -> int:
+    return value
+
+
+def apply(values: List[int]) -> List[int]:
+    return list(map(_used_as_callback, values))
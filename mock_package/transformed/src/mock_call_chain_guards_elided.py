@@ -0,0 +1,48 @@
+from typing import List
+
+
+def main(filepath: str, columns: List[str]) -> bool:
+    if not all([isinstance(filepath, str), isinstance(columns, List)]):
+        raise TypeError(
+            "main expects arg types: [str, List], "
+            f"received: [{type(filepath).__name__}, {type(columns).__name__}]"
+        )
+    data = _read_data(filepath, columns)
+    return _save_data(data, filepath.upper())
+
+
+def _read_data(filepath: str, columns: List[str]) -> dict:
+    if _check_extension(filepath=filepath):
+        return dict.fromkeys(columns)
+    raise FileNotFoundError
+
+
+def _check_extension(filepath: str) -> bool:
+    return filepath.endswith(".csv")
+
+
+def _save_data(data: dict, filepath: str) -> bool:
+    if not all([isinstance(data, dict), isinstance(filepath, str)]):
+        raise TypeError(
+            "_save_data expects arg types: [dict, str], "
+            f"received: [{type(data).__name__}, {type(filepath).__name__}]"
+        )
+    return bool(data) and bool(filepath)
+
+
+def _used_as_callback(value: int) -> int:
+    if not all([isinstance(value, int)]):
+        raise TypeError(
+            "_used_as_callback expects arg types: [int], "
+            f"received: [{type(value).__name__}]"
+        )
+    return value
+
+
+def apply(values: List[int]) -> List[int]:
+    if not all([isinstance(values, List)]):
+        raise TypeError(
+            "apply expects arg types: [List], " f"received: [{type(values).__name__}]"
+        )
+    return list(map(_used_as_callback, values))
+
@@ -1,20 +1,121 @@
-from .custom_validators import (
-    validate_bool_func,
-    validate_collection,
-    validate_collection_of_type,
-    validate_generic,
-    validate_generic_bool_func,
-    validate_generic_of_type,
-    validate_iterable,
-    validate_iterable_of_type,
-    validate_sequence,
-    validate_sequence_of_type,
-)
-from .transform import add_boilerplate, get_parametrized_tests
+import importlib
+from typing import TYPE_CHECKING
+
+# submodules are imported on first attribute access so that light entry points,
+# such as the daemon client, do not pay for importing libcst, black and isort
+_LAZY_IMPORTS = {
+    "add_boilerplate": "transform",
+    "add_boilerplate_from_path": "transform",
+    "add_boilerplate_from_src": "transform",
+    "get_parametrized_tests": "transform",
+    "get_parametrized_tests_from_path": "transform",
+    "get_parametrized_tests_from_src": "transform",
+    "strip_boilerplate": "transform",
+    "strip_boilerplate_from_path": "transform",
+    "strip_boilerplate_from_src": "transform",
+    "define_fused": "fused_validators",
+    "compile_type_check": "type_validators",
+    "validate_dataframe": "frame_validators",
+    "validate_ndarray": "array_validators",
+    "guard": "runtime_guards",
+    "validate_large_collection_of_type": "parallel_validators",
+    "guard_class": "runtime_guards",
+    "compile_generic_of_type": "custom_validators",
+    "ValidatingIterator": "custom_validators",
+    "is_validation_enabled": "custom_validators",
+    "lazy_iterable_bool_func": "custom_validators",
+    "lazy_iterable_of_type": "custom_validators",
+    "set_validation_enabled": "custom_validators",
+    "validate_bool_func": "custom_validators",
+    "validate_collection": "custom_validators",
+    "validate_collection_of_type": "custom_validators",
+    "validate_generic": "custom_validators",
+    "validate_generic_bool_func": "custom_validators",
+    "validate_generic_of_type": "custom_validators",
+    "validate_iterable": "custom_validators",
+    "validate_iterable_of_type": "custom_validators",
+    "validate_mapping": "custom_validators",
+    "validate_mapping_of_type": "custom_validators",
+    "validate_sequence": "custom_validators",
+    "validate_sequence_of_type": "custom_validators",
+    "validate_type": "type_validators",
+    "get_validator_stats": "validator_stats",
+    "reset_validator_stats": "validator_stats",
+    "set_validator_stats_enabled": "validator_stats",
+    "validator_stats_report": "validator_stats",
+    "dump_timings": "instrumentation",
+    "export_timings": "instrumentation",
+    "get_timings": "instrumentation",
+    "reset_timings": "instrumentation",
+    "timings_report": "instrumentation",
+    "FuncSelector": "func_selection",
+}
+
+if TYPE_CHECKING:
+    from .array_validators import validate_ndarray
+    from .custom_validators import (
+        ValidatingIterator,
+        compile_generic_of_type,
+        is_validation_enabled,
+        lazy_iterable_bool_func,
+        lazy_iterable_of_type,
+        set_validation_enabled,
+        validate_bool_func,
+        validate_collection,
+        validate_collection_of_type,
+        validate_generic,
+        validate_generic_bool_func,
+        validate_generic_of_type,
+        validate_iterable,
+        validate_iterable_of_type,
+        validate_mapping,
+        validate_mapping_of_type,
+        validate_sequence,
+        validate_sequence_of_type,
+    )
+    from .frame_validators import validate_dataframe
+    from .func_selection import FuncSelector
+    from .fused_validators import define_fused
+    from .instrumentation import (
+        dump_timings,
+        export_timings,
+        get_timings,
+        reset_timings,
+        timings_report,
+    )
+    from .parallel_validators import validate_large_collection_of_type
+    from .runtime_guards import guard, guard_class
+    from .transform import (
+        add_boilerplate,
+        add_boilerplate_from_path,
+        add_boilerplate_from_src,
+        get_parametrized_tests,
+        get_parametrized_tests_from_path,
+        get_parametrized_tests_from_src,
+        strip_boilerplate,
+        strip_boilerplate_from_path,
+        strip_boilerplate_from_src,
+    )
+    from .type_validators import compile_type_check, validate_type
+    from .validator_stats import (
+        get_validator_stats,
+        reset_validator_stats,
+        set_validator_stats_enabled,
+        validator_stats_report,
+    )
 
 __all__ = [
     "add_boilerplate",
+    "add_boilerplate_from_path",
+    "add_boilerplate_from_src",
     "get_parametrized_tests",
+    "get_parametrized_tests_from_path",
+    "get_parametrized_tests_from_src",
+    "strip_boilerplate",
+    "strip_boilerplate_from_path",
+    "strip_boilerplate_from_src",
+    "guard",
+    "guard_class",
     "validate_sequence",
     "validate_iterable",
     "validate_collection",
@@ -25,4 +126,41 @@ __all__ = [
     "validate_generic_of_type",
     "validate_bool_func",
     "validate_generic_bool_func",
+    "compile_generic_of_type",
+    "define_fused",
+    "is_validation_enabled",
+    "set_validation_enabled",
+    "ValidatingIterator",
+    "lazy_iterable_of_type",
+    "lazy_iterable_bool_func",
+    "validate_large_collection_of_type",
+    "validate_mapping",
+    "validate_mapping_of_type",
+    "compile_type_check",
+    "validate_type",
+    "validate_ndarray",
+    "validate_dataframe",
+    "get_validator_stats",
+    "reset_validator_stats",
+    "set_validator_stats_enabled",
+    "validator_stats_report",
+    "get_timings",
+    "reset_timings",
+    "dump_timings",
+    "export_timings",
+    "timings_report",
+    "FuncSelector",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
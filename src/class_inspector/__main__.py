@@ -0,0 +1,5 @@
+import sys
+
+from class_inspector.cli import main
+
+sys.exit(main())
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import itertools
+import linecache
+from typing import Any, Callable, Dict
+
+_counter = itertools.count()
+
+
+def compile_func(src_code: str, func_name: str, namespace: Dict[str, Any]) -> Callable:
+    """
+    Compile generated source code and return the function named `func_name`.
+
+    The source is registered with linecache so tracebacks through the
+    generated function show its code, the same way attrs does for `__init__`.
+    """
+    filename = f"<class_inspector generated {func_name} {next(_counter)}>"
+    exec(compile(src_code, filename, "exec"), namespace)
+    linecache.cache[filename] = (
+        len(src_code),
+        None,
+        src_code.splitlines(keepends=True),
+        filename,
+    )
+    return namespace[func_name]
+
+
+def type_name(allowed_type: Any) -> str:
+    if isinstance(allowed_type, tuple):
+        return f"({', '.join(type_name(item) for item in allowed_type)})"
+    return getattr(allowed_type, "__name__", repr(allowed_type))
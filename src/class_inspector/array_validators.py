@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from class_inspector.custom_validators import _is_enabled_for_caller, disabled_validator
+from class_inspector.validator_stats import instrument
+
+# a shape pattern is a tuple of sizes where None matches any size of that dimension
+# and `...` matches any number of dimensions
+ShapePattern = Tuple[Union[int, None, type(Ellipsis)], ...]
+
+
+def _import_numpy() -> Any:
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as e:
+        raise ImportError("array validators require numpy, `pip install numpy`") from e
+
+
+def _get_shape_name(shape: ShapePattern) -> str:
+    dims = [
+        "..." if dim is Ellipsis else "*" if dim is None else str(dim) for dim in shape
+    ]
+    return f"({', '.join(dims)})"
+
+
+def is_shape_match(shape: Sequence[int], pattern: ShapePattern) -> bool:
+    """
+    Check a shape against a pattern, None matches any size and ``...`` any number of dimensions.
+
+    Args:
+        shape (Sequence[int]): The shape of an array.
+        pattern (ShapePattern): The pattern, e.g. ``(None, 3)`` or ``(..., 3)``.
+
+    Returns:
+        bool: True if the shape matches the pattern.
+    """
+    if Ellipsis in pattern:
+        idx = pattern.index(Ellipsis)
+        head, tail = pattern[:idx], pattern[idx + 1 :]
+        if len(shape) < len(head) + len(tail):
+            return False
+        return is_shape_match(shape[: len(head)], head) and is_shape_match(
+            shape[len(shape) - len(tail) :], tail
+        )
+    if len(shape) != len(pattern):
+        return False
+    return all(dim is None or dim == size for size, dim in zip(shape, pattern))
+
+
+def validate_ndarray(
+    dtype_kind: Optional[str] = None,
+    shape: Optional[ShapePattern] = None,
+    c_contiguous: bool = False,
+    f_contiguous: bool = False,
+    writeable: Optional[bool] = None,
+    no_nan: bool = False,
+    finite: bool = False,
+) -> Callable:
+    """
+    Validate that the value is a numpy array with a specific layout.
+
+    Every check is O(1) on the array metadata except ``no_nan`` and ``finite``,
+    which use vectorized ``min`` and ``max`` reductions rather than a python loop
+    or a temporary boolean array.
+
+    Args:
+        dtype_kind (str, optional): The allowed ``dtype.kind`` characters, e.g. "f" or "iu".
+        shape (ShapePattern, optional): The shape pattern, None matches any size of a
+            dimension and ``...`` any number of dimensions, e.g. ``(None, 3)`` or ``(..., 3)``.
+        c_contiguous (bool, optional): Require a C contiguous array. Defaults to False.
+        f_contiguous (bool, optional): Require a Fortran contiguous array. Defaults to False.
+        writeable (bool, optional): Require the array to be writeable, or read only if False.
+        no_nan (bool, optional): Require no NaN values. Defaults to False.
+        finite (bool, optional): Require no NaN or infinite values. Defaults to False.
+
+    Returns:
+        Callable: A validation function.
+
+    Raises:
+        ImportError: If numpy is not installed.
+        TypeError: If the value is not an ndarray or its dtype kind is not allowed.
+        ValueError: If the array does not have the required shape, layout or values.
+
+    Usage:
+        .. code-block:: python
+
+            @attrs.define
+            class Points:
+                coords: np.ndarray = attrs.field(
+                    validator=[validate_ndarray("f", shape=(None, 3), c_contiguous=True, finite=True)]
+                )
+    """
+    np = _import_numpy()
+    if not _is_enabled_for_caller():
+        return disabled_validator
+
+    def _(instance, attribute, value) -> None:
+        if not isinstance(value, np.ndarray):
+            raise TypeError(
+                f"{attribute.name} expecting a subclass of ndarray, received {type(value)}."
+            )
+        if dtype_kind is not None and value.dtype.kind not in dtype_kind:
+            raise TypeError(
+                f"{attribute.name} expecting an array with dtype kind in {dtype_kind!r},"
+                f" received {value.dtype}."
+            )
+        if shape is not None and not is_shape_match(value.shape, shape):
+            raise ValueError(
+                f"{attribute.name} expecting an array of shape {_get_shape_name(shape)},"
+                f" received {value.shape}."
+            )
+        if c_contiguous and not value.flags.c_contiguous:
+            raise ValueError(f"{attribute.name} expecting a C contiguous array.")
+        if f_contiguous and not value.flags.f_contiguous:
+            raise ValueError(f"{attribute.name} expecting a Fortran contiguous array.")
+        if writeable is not None and value.flags.writeable != writeable:
+            raise ValueError(
+                f"{attribute.name} expecting a {'writeable' if writeable else 'read only'} array."
+            )
+        # only floating point arrays can hold NaN or inf
+        if (no_nan or finite) and value.dtype.kind in "fc" and value.size:
+            if value.dtype.kind == "c":
+                values_ok = (
+                    np.isfinite(value).all() if finite else not np.isnan(value).any()
+                )
+            else:
+                # NaN propagates through min, and inf ends up at either end
+                low = value.min()
+                if finite:
+                    values_ok = np.isfinite(low) and np.isfinite(value.max())
+                else:
+                    values_ok = not np.isnan(low)
+            if not values_ok:
+                raise ValueError(
+                    f"{attribute.name} expecting {'finite values' if finite else 'no NaN values'}."
+                )
+
+    return instrument(_, "validate_ndarray")
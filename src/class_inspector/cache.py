@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import attrs
+from attrs.validators import instance_of
+
+# rough resident size of a parsed `cst.Module` per character of source
+CST_BYTES_PER_CHAR = 40
+
+
+def get_src_hash(src_code: str) -> str:
+    return hashlib.blake2b(src_code.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def estimate_cst_bytes(src_code: str) -> int:
+    return len(src_code) * CST_BYTES_PER_CHAR
+
+
+@attrs.define
+class ModuleCache:
+    """
+    Least recently used cache of parsed modules and visitor results,
+    bounded by the estimated memory held rather than the number of entries.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    max_bytes: int = attrs.field(default=128 << 20, validator=[instance_of(int)])
+    hits: int = attrs.field(default=0, init=False)
+    misses: int = attrs.field(default=0, init=False)
+    curr_bytes: int = attrs.field(default=0, init=False)
+    _entries: OrderedDict = attrs.field(factory=OrderedDict, init=False)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.curr_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.curr_bytes += size
+            while self.curr_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.curr_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.curr_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+MODULE_CACHE = ModuleCache()
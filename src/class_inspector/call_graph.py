@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+import attrs
+import libcst as cst
+import libcst.matchers as m
+
+from class_inspector.data_structures import FuncDetails
+from class_inspector.func_selection import FuncSelector
+from class_inspector.utils import is_dunder
+
+
+@attrs.define
+class CallSite:
+    # None when called at module level
+    caller: Optional[str] = attrs.field()
+    # the name of each argument that is passed a bare name, None otherwise
+    args: List[Optional[str]] = attrs.field(factory=list)
+    kwargs: Dict[str, Optional[str]] = attrs.field(factory=dict)
+    has_star: bool = attrs.field(default=False)
+
+
+def _get_arg_name(arg: cst.Arg) -> Optional[str]:
+    return arg.value.value if isinstance(arg.value, cst.Name) else None
+
+
+def _get_params(params: cst.Parameters) -> List[cst.Param]:
+    star_params = [params.star_arg, params.star_kwarg]
+    return [
+        *params.posonly_params,
+        *params.params,
+        *params.kwonly_params,
+        *(param for param in star_params if isinstance(param, cst.Param)),
+    ]
+
+
+@attrs.define
+class CallGraphVisitor(cst.CSTVisitor):
+    """Collects the direct calls of functions by name, along with the names
+    assigned in each function and how often each name is referenced."""
+
+    calls: Dict[str, List[CallSite]] = attrs.field(factory=dict)
+    qualnames: Dict[str, List[str]] = attrs.field(factory=dict)
+    assigned: Dict[str, Set[str]] = attrs.field(factory=dict)
+    # no validators, these are updated once per node
+    n_names: Counter = attrs.field(factory=Counter)
+    n_calls: Counter = attrs.field(factory=Counter)
+    scope: List[str] = attrs.field(factory=list)
+    func_stack: List[str] = attrs.field(factory=list)
+
+    def __attrs_post_init__(self):
+        cst.CSTVisitor.__init__(self)
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> None:
+        self._add_assigned(node.name)
+        self.scope.append(node.name.value)
+
+    def leave_ClassDef(self, original_node: cst.ClassDef) -> None:
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> None:
+        name = node.name.value
+        # a nested def rebinds its name in the functions around it
+        self._add_assigned(node.name)
+        self.qualnames.setdefault(name, []).append(".".join([*self.scope, name]))
+        self.assigned.setdefault(name, set())
+        # the name of a definition is not a reference to it
+        self.n_names[name] -= 1
+        self.scope += [name, "<locals>"]
+        self.func_stack.append(name)
+
+    def leave_FunctionDef(self, original_node: cst.FunctionDef) -> None:
+        del self.scope[-2:]
+        self.func_stack.pop()
+
+    def visit_Name(self, node: cst.Name) -> None:
+        self.n_names[node.value] += 1
+
+    def visit_Call(self, node: cst.Call) -> None:
+        if not isinstance(node.func, cst.Name):
+            return
+        callee = node.func.value
+        self.n_calls[callee] += 1
+        call_site = CallSite(self.func_stack[-1] if self.func_stack else None)
+        for arg in node.args:
+            if arg.star:
+                call_site.has_star = True
+            elif arg.keyword is not None:
+                call_site.kwargs[arg.keyword.value] = _get_arg_name(arg)
+            else:
+                call_site.args.append(_get_arg_name(arg))
+        self.calls.setdefault(callee, []).append(call_site)
+
+    def _add_assigned(self, target: Optional[cst.CSTNode]) -> None:
+        if target is None:
+            return
+        names = {name.value for name in m.findall(target, m.Name())}
+        # an inner function can rebind the names of the functions around it
+        for func_name in self.func_stack:
+            self.assigned[func_name] |= names
+
+    def visit_AssignTarget(self, node: cst.AssignTarget) -> None:
+        self._add_assigned(node.target)
+
+    def visit_AugAssign(self, node: cst.AugAssign) -> None:
+        self._add_assigned(node.target)
+
+    def visit_AnnAssign(self, node: cst.AnnAssign) -> None:
+        self._add_assigned(node.target)
+
+    def visit_For(self, node: cst.For) -> None:
+        self._add_assigned(node.target)
+
+    def visit_AsName(self, node: cst.AsName) -> None:
+        self._add_assigned(node.name)
+
+    def visit_NamedExpr(self, node: cst.NamedExpr) -> None:
+        self._add_assigned(node.target)
+
+    def visit_Del(self, node: cst.Del) -> None:
+        self._add_assigned(node.target)
+
+    # comprehensions, lambdas and match cases bind names in scopes of their own, calls
+    # in them are attributed to the enclosing function so treat them as rebinding
+
+    def visit_CompFor(self, node: cst.CompFor) -> None:
+        self._add_assigned(node.target)
+
+    def visit_Lambda(self, node: cst.Lambda) -> None:
+        for param in _get_params(node.params):
+            self._add_assigned(param.name)
+
+    def visit_MatchAs(self, node: cst.MatchAs) -> None:
+        self._add_assigned(node.name)
+
+    def visit_MatchStar(self, node: cst.MatchStar) -> None:
+        self._add_assigned(node.name)
+
+    def visit_MatchMapping(self, node: cst.MatchMapping) -> None:
+        self._add_assigned(node.rest)
+
+    def visit_ImportAlias(self, node: cst.ImportAlias) -> None:
+        if node.asname is None:
+            # `import a.b` binds `a`
+            self._add_assigned(m.findall(node.name, m.Name())[0])
+
+    def visit_Global(self, node: cst.Global) -> None:
+        for item in node.names:
+            self._add_assigned(item.name)
+
+    def visit_Nonlocal(self, node: cst.Nonlocal) -> None:
+        for item in node.names:
+            self._add_assigned(item.name)
+
+
+def _get_guarded_params(func: FuncDetails) -> Dict[str, str]:
+    return {name: param.annot for name, param in func.params.items() if param.annot}
+
+
+def _is_checked_by(
+    call_site: CallSite,
+    callee: FuncDetails,
+    caller: FuncDetails,
+    assigned: Set[str],
+) -> bool:
+    if call_site.has_star:
+        return False
+    param_names = list(callee.params)
+    passed = dict(zip(param_names, call_site.args))
+    passed.update(call_site.kwargs)
+    caller_params = _get_guarded_params(caller)
+    for name, annot in _get_guarded_params(callee).items():
+        arg_name = passed.get(name)
+        # the caller must pass on one of its own params, never rebound, of the same type
+        if arg_name is None or arg_name in assigned:
+            return False
+        if caller_params.get(arg_name) != annot:
+            return False
+    return True
+
+
+def get_elided_guards(
+    module: cst.Module,
+    funcs: Dict[str, FuncDetails],
+    selector: Optional[FuncSelector] = None,
+) -> Set[str]:
+    """
+    Get the private functions whose guards are redundant because every call to them
+    passes on the already guarded params of the function calling them.
+
+    A function qualifies if it is a uniquely named, undecorated, module level private
+    function that is only ever called directly by name from guarded functions, and every
+    annotated param is passed a param of the caller with the same annotation that the
+    caller never rebinds, including as a comprehension, lambda or match capture name.
+
+    Args:
+        module (cst.Module): The module.
+        funcs (Dict[str, FuncDetails]): The functions of the module from ``FuncVisitor``.
+        selector (FuncSelector, optional): The functions boilerplate is added to.
+
+    Returns:
+        Set[str]: The names of the functions whose guards can be left out.
+    """
+    visitor = CallGraphVisitor()
+    module.visit(visitor)
+
+    def is_guarded(name: str) -> bool:
+        if name not in funcs or is_dunder(name) or len(visitor.qualnames[name]) != 1:
+            return False
+        if selector is not None and not selector.is_selected(
+            visitor.qualnames[name][0], funcs[name]
+        ):
+            return False
+        return bool(_get_guarded_params(funcs[name]))
+
+    candidates = [
+        name
+        for name in funcs
+        if name.startswith("_")
+        and is_guarded(name)
+        # module level functions, decorators could register them to be called from elsewhere
+        and "." not in visitor.qualnames[name][0]
+        and not funcs[name].decorators
+        # any reference other than a direct call, e.g. passing it as a callback
+        and name in visitor.calls
+        and visitor.n_names[name] == visitor.n_calls[name]
+    ]
+
+    # a caller whose own guards are elided passes on params its callers checked,
+    # so by induction every call into an elided function is checked once
+    return {
+        name
+        for name in candidates
+        if all(
+            call_site.caller is not None
+            and is_guarded(call_site.caller)
+            and _is_checked_by(
+                call_site,
+                funcs[name],
+                funcs[call_site.caller],
+                visitor.assigned[call_site.caller],
+            )
+            for call_site in visitor.calls[name]
+        )
+    }
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import argparse
+import difflib
+import glob
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import attrs
+from attrs.validators import instance_of, optional
+
+from class_inspector import daemon
+from class_inspector.func_selection import FuncSelector
+from class_inspector.stats import PipelineStats, StageStats
+from class_inspector.transform import (
+    add_boilerplate_from_src,
+    get_parametrized_tests_from_src,
+    strip_boilerplate_from_src,
+)
+from class_inspector.utils import (
+    get_src_code,
+    get_src_encoding,
+    prefetch,
+    read_src_bytes,
+)
+
+DEFAULT_CACHE_DIR = ".class_inspector_cache"
+OPERATIONS = {
+    "boilerplate": add_boilerplate_from_src,
+    "tests": get_parametrized_tests_from_src,
+    "strip": strip_boilerplate_from_src,
+}
+# running these again on their own output changes nothing
+IDEMPOTENT_OPERATIONS = {"boilerplate", "strip"}
+
+
+def get_package_version() -> str:
+    try:
+        return version("class_inspector")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@attrs.define
+class FileResult:
+    path: str = attrs.field(validator=[instance_of(str)])
+    src_code: str = attrs.field(default="", validator=[instance_of(str)])
+    output: str = attrs.field(default="", validator=[instance_of(str)])
+    stats: Optional[PipelineStats] = attrs.field(
+        default=None, validator=[optional(instance_of(PipelineStats))]
+    )
+    cached: bool = attrs.field(default=False, validator=[instance_of(bool)])
+    error: str = attrs.field(default="", validator=[instance_of(str)])
+
+    @property
+    def changed(self) -> bool:
+        return not self.error and self.output != self.src_code
+
+
+@attrs.define
+class ResultCache:
+    """
+    On-disk cache of outputs keyed by the source, the operation and its options,
+    so unchanged files skip parsing entirely on the next run.
+    """
+
+    cache_dir: str = attrs.field(validator=[instance_of(str)])
+
+    def get_key(self, src_code: str, operation: str, options: Dict) -> str:
+        key = "\0".join(
+            [get_package_version(), operation, repr(sorted(options.items())), src_code]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get_path(self, key: str) -> Path:
+        return Path(self.cache_dir, key[:2], key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.get_path(key)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def put(self, key: str, output: str) -> None:
+        path = self.get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename so concurrent runs never read a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(output, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+def expand_paths(paths: Iterable[str]) -> List[str]:
+    expanded = {}
+    for path in paths:
+        matches = glob.glob(path, recursive=True) or [path]
+        for match in sorted(matches):
+            if os.path.isdir(match):
+                for file_path in sorted(Path(match).rglob("*.py")):
+                    expanded[str(file_path)] = None
+            else:
+                expanded[match] = None
+    return list(expanded)
+
+
+def process_src(path: str, src_code: str, operation: str, options: Dict) -> FileResult:
+    stats = PipelineStats(path)
+    try:
+        output = OPERATIONS[operation](src_code, stats=stats, **options)
+    except Exception as e:
+        return FileResult(path, src_code, error=f"{type(e).__name__}: {e}")
+    return FileResult(path, src_code, output, stats)
+
+
+def process_paths(
+    paths: Sequence[str],
+    operation: str,
+    options: Dict,
+    jobs: int = 1,
+    cache: Optional[ResultCache] = None,
+) -> List[FileResult]:
+    results, pending, keys = {}, {}, {}
+    # the next files are read while the current one is looked up in the cache
+    for path, future in prefetch(get_src_code, paths):
+        try:
+            src_code = future.result()
+        except (OSError, SyntaxError, UnicodeDecodeError) as e:
+            results[path] = FileResult(path, error=f"{type(e).__name__}: {e}")
+            continue
+
+        if cache is not None:
+            keys[path] = cache.get_key(src_code, operation, options)
+            output = cache.get(keys[path])
+            if output is not None:
+                results[path] = FileResult(path, src_code, output, cached=True)
+                continue
+        pending[path] = src_code
+
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            processed = executor.map(
+                process_src,
+                pending.keys(),
+                pending.values(),
+                [operation] * len(pending),
+                [options] * len(pending),
+                chunksize=max(1, len(pending) // (jobs * 4)),
+            )
+            processed = list(processed)
+    else:
+        processed = [
+            process_src(path, src_code, operation, options)
+            for path, src_code in pending.items()
+        ]
+
+    for result in processed:
+        results[result.path] = result
+        if cache is not None and not result.error:
+            cache.put(keys[result.path], result.output)
+            if result.changed and operation in IDEMPOTENT_OPERATIONS:
+                # so the next run over the rewritten file is a cache hit
+                output_key = cache.get_key(result.output, operation, options)
+                cache.put(output_key, result.output)
+
+    return [results[path] for path in paths]
+
+
+def write_src(path: str, src_code: str) -> None:
+    encoding = get_src_encoding(read_src_bytes(path))
+    with open(path, "w", encoding=encoding, newline="\n") as f:
+        f.write(src_code)
+
+
+def get_diff(result: FileResult) -> str:
+    return "".join(
+        difflib.unified_diff(
+            result.src_code.splitlines(keepends=True),
+            result.output.splitlines(keepends=True),
+            fromfile=f"a/{result.path}",
+            tofile=f"b/{result.path}",
+        )
+    )
+
+
+def get_summary(results: Sequence[FileResult], wall_time: float) -> str:
+    stages: Dict[str, StageStats] = {}
+    for result in results:
+        if result.stats is None:
+            continue
+        for stage in result.stats.stages.values():
+            total = stages.setdefault(stage.name, StageStats(stage.name))
+            total.wall_time += stage.wall_time
+            total.cpu_time += stage.cpu_time
+            total.calls += stage.calls
+
+    n_changed = sum(result.changed for result in results)
+    n_cached = sum(result.cached for result in results)
+    n_errors = sum(bool(result.error) for result in results)
+    lines = [
+        f"{len(results)} files, {n_changed} changed, {n_cached} cached, "
+        f"{n_errors} errors in {wall_time:.3f}s",
+    ]
+    for stage in stages.values():
+        lines.append(
+            f"  {stage.name:<16}{stage.calls:>8} calls"
+            f"{stage.wall_time:>10.3f}s wall{stage.cpu_time:>10.3f}s cpu"
+        )
+    return "\n".join(lines)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="class-inspector",
+        description="Add boilerplate to, remove it from, or generate tests for, python files.",
+    )
+    subparsers = parser.add_subparsers(dest="operation", required=True)
+
+    shared = argparse.ArgumentParser(add_help=False)
+    shared.add_argument("paths", nargs="+", help="files, directories or globs")
+    shared.add_argument(
+        "-j", "--jobs", type=int, default=1, help="number of worker processes"
+    )
+    shared.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    shared.add_argument("--no-cache", action="store_true")
+    shared.add_argument(
+        "-q", "--quiet", action="store_true", help="do not print the timing summary"
+    )
+
+    # operations that rewrite files
+    writing = argparse.ArgumentParser(add_help=False)
+    writing.add_argument(
+        "--check",
+        action="store_true",
+        help="do not write files, exit 1 if any file would change",
+    )
+    writing.add_argument(
+        "--diff", action="store_true", help="print a diff instead of writing files"
+    )
+
+    boilerplate = subparsers.add_parser(
+        "boilerplate",
+        parents=[shared, writing],
+        help="add boilerplate to files in place",
+    )
+    boilerplate.add_argument("--add-debugs", action="store_true")
+    boilerplate.add_argument("--add-guards", action="store_true")
+    boilerplate.add_argument(
+        "--add-timing",
+        action="store_true",
+        help="time each function call into class_inspector.instrumentation",
+    )
+    boilerplate.add_argument(
+        "--sample-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="only run the debugs and guards on 1 in N calls",
+    )
+    boilerplate.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        metavar="PER_SECOND",
+        help="only run the debugs and guards on at most PER_SECOND calls per second",
+    )
+    boilerplate.add_argument(
+        "--elide-guards",
+        action="store_true",
+        help="leave out the guards of private functions only called from guarded functions",
+    )
+    selection = boilerplate.add_argument_group(
+        "selection", "only add boilerplate to some of the functions"
+    )
+    selection.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="qualified names to include, e.g. 'MyClass.*'",
+    )
+    selection.add_argument("--exclude", action="append", default=[], metavar="GLOB")
+    selection.add_argument(
+        "--include-decorator",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="only include functions with a matching decorator, e.g. 'app.route'",
+    )
+    selection.add_argument(
+        "--exclude-decorator", action="append", default=[], metavar="GLOB"
+    )
+    selection.add_argument(
+        "--skip-private",
+        action="store_true",
+        help="skip functions and classes whose name starts with an underscore",
+    )
+    selection.add_argument(
+        "--profile", default=None, help="a cProfile stats file to select functions by"
+    )
+    selection.add_argument(
+        "--top-n",
+        type=int,
+        default=None,
+        help="only include the N functions with the most cumulative time in --profile",
+    )
+    selection.add_argument(
+        "--max-call-rate",
+        type=float,
+        default=None,
+        metavar="PER_SECOND",
+        help="skip functions called more than PER_SECOND times per second in --profile",
+    )
+
+    subparsers.add_parser(
+        "strip",
+        parents=[shared, writing],
+        help="remove the boilerplate added by `boilerplate` from files in place",
+    )
+
+    tests = subparsers.add_parser(
+        "tests", parents=[shared], help="print parametrized tests for files"
+    )
+    tests.add_argument("--no-test-raises", action="store_true")
+    tests.add_argument("--raises-arg-types", action="store_true")
+
+    daemon = subparsers.add_parser(
+        "daemon", help="serve requests from class-inspector-client on a unix socket"
+    )
+    daemon.add_argument("--socket", default=None)
+    daemon.add_argument(
+        "--stop", action="store_true", help="stop the daemon listening on --socket"
+    )
+
+    return parser
+
+
+def get_selector(args: argparse.Namespace) -> Optional[FuncSelector]:
+    rules = {
+        "include": args.include,
+        "exclude": args.exclude,
+        "include_decorators": args.include_decorator,
+        "exclude_decorators": args.exclude_decorator,
+        "skip_private": args.skip_private,
+    }
+    if args.profile is not None:
+        # only rank the functions of the files being transformed
+        return FuncSelector.from_profile(
+            args.profile,
+            args.top_n,
+            args.max_call_rate,
+            expand_paths(args.paths),
+            **rules,
+        )
+    if any(rules.values()):
+        return FuncSelector(**rules)
+    return None
+
+
+def get_options(args: argparse.Namespace) -> Dict:
+    if args.operation == "boilerplate":
+        return {
+            "add_debugs": args.add_debugs,
+            "add_guards": args.add_guards,
+            "add_timing": args.add_timing,
+            "sample_every": args.sample_every,
+            "rate_limit": args.rate_limit,
+            "selector": get_selector(args),
+            "elide_guards": args.elide_guards,
+        }
+    if args.operation == "strip":
+        return {}
+    return {
+        "test_raises": not args.no_test_raises,
+        "raises_arg_types": args.raises_arg_types,
+    }
+
+
+def run_daemon(socket_path: Optional[str], stop: bool) -> int:
+    if stop:
+        try:
+            daemon.request({"op": "shutdown"}, socket_path)
+        except OSError:
+            print("no daemon running", file=sys.stderr)
+            return 1
+        return 0
+    try:
+        daemon.serve(socket_path)
+    except (FileExistsError, PermissionError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = get_parser().parse_args(argv)
+    if args.operation == "daemon":
+        return run_daemon(args.socket, args.stop)
+    start = time.perf_counter()
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    paths = expand_paths(args.paths)
+    results = process_paths(paths, args.operation, get_options(args), args.jobs, cache)
+
+    exit_code = 0
+    for result in results:
+        if result.error:
+            print(f"error: {result.path}: {result.error}", file=sys.stderr)
+            exit_code = 1
+        elif args.operation == "tests":
+            print(f"# {result.path}\n{result.output}")
+        elif result.changed:
+            if args.diff:
+                print(get_diff(result), end="")
+            if args.check:
+                print(f"would change: {result.path}", file=sys.stderr)
+                exit_code = 1
+            elif not args.diff:
+                write_src(result.path, result.output)
+
+    if not args.quiet:
+        print(get_summary(results, time.perf_counter() - start), file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,70 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Optional, Set, Tuple
 
 import attrs
 import libcst as cst
 import libcst.matchers as m
-from attrs.validators import instance_of
+from attrs.validators import ge, gt, instance_of, optional
+from libcst.metadata import PositionProvider
 
 from class_inspector.data_structures import FuncDetails, ParamDetails
+from class_inspector.func_selection import FuncSelector
 from class_inspector.guard_conditions import get_guard_conditions
 from class_inspector.utils import is_dunder
 
 
-def get_annotation_type(annot_node: cst.Annotation | None) -> str:
-    def parse_node(node: cst.CSTNode) -> str:
-        if isinstance(node, cst.Name):
-            return node.value
-        elif isinstance(node, cst.Attribute):
-            return f"{parse_node(node.value)}.{node.attr.value}"
-        elif isinstance(node, cst.Subscript):
-            base = parse_node(node.value)
-            slices = ", ".join(
-                parse_node(element.slice.value)
-                for element in node.slice
-                if isinstance(element, cst.SubscriptElement)
-                and isinstance(element.slice, cst.Index)
-            )
-            return f"{base}[{slices}]"
-        return ""
+def get_node_name(node: cst.CSTNode) -> str:
+    if isinstance(node, cst.Name):
+        return node.value
+    elif isinstance(node, cst.Attribute):
+        return f"{get_node_name(node.value)}.{node.attr.value}"
+    elif isinstance(node, cst.Subscript):
+        base = get_node_name(node.value)
+        slices = ", ".join(
+            get_node_name(element.slice.value)
+            for element in node.slice
+            if isinstance(element, cst.SubscriptElement)
+            and isinstance(element.slice, cst.Index)
+        )
+        return f"{base}[{slices}]"
+    return ""
+
 
+def get_annotation_type(annot_node: cst.Annotation | None) -> str:
     if isinstance(annot_node, cst.Annotation):
-        return parse_node(annot_node.annotation)
+        return get_node_name(annot_node.annotation)
     return ""
 
 
+def get_decorator_name(decorator: cst.Decorator) -> str:
+    # `@functools.lru_cache(maxsize=None)` is named "functools.lru_cache"
+    node = decorator.decorator
+    if isinstance(node, cst.Call):
+        node = node.func
+    return get_node_name(node)
+
+
+def count_nodes(node: cst.CSTNode) -> int:
+    counter = NodeCounter()
+    node.visit(counter)
+    return counter.n_nodes
+
+
+@attrs.define
+class NodeCounter(cst.CSTVisitor):
+    # no validator, this is incremented once per node
+    n_nodes: int = attrs.field(default=0)
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        self.n_nodes += 1
+        return True
+
+
 @attrs.define
 class FuncVisitor(cst.CSTVisitor):
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
     funcs: Dict[str, FuncDetails] = attrs.field(default=None)
     curr_class: str = attrs.field(default="", validator=[instance_of(str)])
     curr_func: str = attrs.field(default="", validator=[instance_of(str)])
@@ -43,6 +72,7 @@ class FuncVisitor(cst.CSTVisitor):
     in_lambda: bool = attrs.field(default=False, validator=[instance_of(bool)])
 
     def __attrs_post_init__(self):
+        cst.CSTVisitor.__init__(self)
         self.funcs = {}
 
     def visit_ClassDef(self, node: cst.ClassDef):
@@ -57,6 +87,15 @@ class FuncVisitor(cst.CSTVisitor):
             node.name.value, class_name=self.curr_class
         )
         self.funcs[self.curr_func].return_annot = get_annotation_type(node.returns)
+        self.funcs[self.curr_func].decorators = [
+            get_decorator_name(decorator) for decorator in node.decorators
+        ]
+
+        # positions are only resolved when visited through a `cst.MetadataWrapper`
+        if PositionProvider in self.metadata:
+            position = self.get_metadata(PositionProvider, node)
+            self.funcs[self.curr_func].start_line = position.start.line
+            self.funcs[self.curr_func].end_line = position.end.line
 
     def leave_FunctionDef(self, node: cst.FunctionDef) -> None:
         self.curr_func = ""
@@ -74,7 +113,12 @@ class FuncVisitor(cst.CSTVisitor):
                 )
 
     def visit_Raise(self, node: cst.Raise) -> None:
-        self.funcs[self.curr_func].raises.append(node.exc.func.value)
+        # `raise Error(...)` and `raise Error`, but not a bare `raise` or `raise error`
+        exc = node.exc.func if isinstance(node.exc, cst.Call) else node.exc
+        if self.curr_func and isinstance(exc, (cst.Name, cst.Attribute)):
+            name = get_node_name(exc)
+            if name.rsplit(".", 1)[-1][:1].isupper():
+                self.funcs[self.curr_func].raises.append(name)
 
     def visit_Lambda(self, node: cst.Lambda) -> None:
         self.in_lambda = True
@@ -83,49 +127,373 @@ class FuncVisitor(cst.CSTVisitor):
         self.in_lambda = False
 
 
+INSTRUMENTATION_MODULE = "class_inspector.instrumentation"
+DOCSTRING = m.SimpleStatementLine(body=[m.Expr(value=m.SimpleString())])
+FUTURE_IMPORT = m.SimpleStatementLine(body=[m.ImportFrom(module=m.Name("__future__"))])
+
+
+def is_generator(node: cst.FunctionDef) -> bool:
+    finder = YieldFinder()
+    node.body.visit(finder)
+    return finder.found
+
+
+@attrs.define
+class YieldFinder(cst.CSTVisitor):
+    found: bool = attrs.field(default=False, validator=[instance_of(bool)])
+
+    def visit_Yield(self, node: cst.Yield) -> None:
+        self.found = True
+
+    # yields in nested scopes belong to those scopes
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        return False
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        return False
+
+    def visit_Lambda(self, node: cst.Lambda) -> bool:
+        return False
+
+
+def get_timing_stmts(
+    qualname: str, body: List[cst.BaseStatement]
+) -> List[cst.BaseStatement]:
+    start = cst.parse_statement("_ci_start_ns = perf_counter_ns()\n")
+    record = cst.parse_statement(
+        f"record_timing(__name__, {qualname!r}, perf_counter_ns() - _ci_start_ns)\n"
+    )
+    return [
+        start,
+        cst.Try(
+            body=cst.IndentedBlock(body=body),
+            finalbody=cst.Finally(body=cst.IndentedBlock(body=[record])),
+        ),
+    ]
+
+
+def get_gate_conditions(
+    qualname: str, sample_every: int, rate_limit: Optional[float]
+) -> List[str]:
+    conditions = []
+    # sample first so unsampled calls don't take tokens
+    if sample_every > 1:
+        conditions.append(f"sample_call(__name__, {qualname!r}, {sample_every})")
+    if rate_limit is not None:
+        conditions.append(f"take_token(__name__, {qualname!r}, {rate_limit!r})")
+    return conditions
+
+
+# the statements `AddBoilerplateTransformer` generates
+DEBUG_STMT = m.SimpleStatementLine(
+    body=[
+        m.Expr(
+            value=m.Call(
+                func=m.Attribute(value=m.Name("logger"), attr=m.Name("debug")),
+                args=[m.Arg(value=m.Call(func=m.Name("locals"), args=[]))],
+            )
+        )
+    ]
+)
+GUARD_STMT = m.If(
+    test=m.UnaryOperation(
+        operator=m.Not(),
+        expression=m.Call(
+            func=m.Name("all"),
+            args=[
+                m.Arg(
+                    value=m.List(
+                        elements=[
+                            m.ZeroOrMore(
+                                m.Element(value=m.Call(func=m.Name("isinstance")))
+                            )
+                        ]
+                    )
+                )
+            ],
+        ),
+    ),
+    body=m.IndentedBlock(
+        body=[
+            m.SimpleStatementLine(
+                body=[
+                    m.Raise(
+                        exc=m.Call(
+                            func=m.Name("TypeError"),
+                            args=[
+                                m.Arg(
+                                    value=m.ConcatenatedString(
+                                        left=m.SimpleString(
+                                            value=m.MatchRegex(
+                                                r'"\w+ expects arg types: \[.*\], "'
+                                            )
+                                        )
+                                    )
+                                )
+                            ],
+                        )
+                    )
+                ]
+            )
+        ]
+    ),
+    orelse=None,
+)
+GATE_CALL = m.Call(
+    func=m.Name("sample_call") | m.Name("take_token"),
+    args=[m.Arg(value=m.Name("__name__")), m.ZeroOrMore()],
+)
+GATE_STMT = m.If(
+    test=GATE_CALL
+    | m.BooleanOperation(left=GATE_CALL, operator=m.And(), right=GATE_CALL),
+    body=m.IndentedBlock(body=[m.AtLeastN(DEBUG_STMT | GUARD_STMT, n=1)]),
+    orelse=None,
+)
+TIMING_START_STMT = m.SimpleStatementLine(
+    body=[
+        m.Assign(
+            targets=[m.AssignTarget(target=m.Name("_ci_start_ns"))],
+            value=m.Call(func=m.Name("perf_counter_ns"), args=[]),
+        )
+    ]
+)
+TIMING_TRY_STMT = m.Try(
+    handlers=[],
+    orelse=None,
+    finalbody=m.Finally(
+        body=m.IndentedBlock(
+            body=[
+                m.SimpleStatementLine(
+                    body=[m.Expr(value=m.Call(func=m.Name("record_timing")))]
+                )
+            ]
+        )
+    ),
+)
+GENERATED_IMPORT = m.SimpleStatementLine(
+    body=[
+        m.ImportFrom(
+            module=m.Attribute(
+                value=m.Name("class_inspector"), attr=m.Name("instrumentation")
+            )
+        )
+        | m.ImportFrom(
+            module=m.Name("time"),
+            names=[m.ImportAlias(name=m.Name("perf_counter_ns"), asname=None)],
+        )
+    ]
+)
+
+
+def strip_generated_stmts(
+    body: List[cst.BaseStatement],
+) -> Tuple[List[cst.BaseStatement], bool]:
+    """Remove the debugs, guards and timing generated at the start of a function body,
+    returning the remaining body and whether anything was removed."""
+    idx = 0
+    while idx < len(body) and m.matches(body[idx], DEBUG_STMT | GUARD_STMT | GATE_STMT):
+        idx += 1
+
+    if (
+        len(body) - idx == 2
+        and m.matches(body[idx], TIMING_START_STMT)
+        and m.matches(body[idx + 1], TIMING_TRY_STMT)
+    ):
+        timed_body, _ = strip_generated_stmts(list(body[idx + 1].body.body))
+        return timed_body, True
+    return body[idx:], idx > 0
+
+
+def get_imported_names(stmt: cst.SimpleStatementLine) -> Set[str]:
+    return {alias.evaluated_name for alias in stmt.body[0].names}
+
+
+def drop_unused_generated_imports(
+    body: List[cst.BaseStatement],
+) -> List[cst.BaseStatement]:
+    used_names = {
+        name.value
+        for stmt in body
+        if not m.matches(stmt, GENERATED_IMPORT)
+        for name in m.findall(stmt, m.Name())
+    }
+    new_body = []
+    for stmt in body:
+        if m.matches(stmt, GENERATED_IMPORT):
+            import_from = stmt.body[0]
+            names = [
+                alias.with_changes(comma=cst.MaybeSentinel.DEFAULT)
+                for alias in import_from.names
+                if alias.evaluated_alias or alias.evaluated_name in used_names
+            ]
+            if not names:
+                continue
+            stmt = stmt.with_changes(body=[import_from.with_changes(names=names)])
+        new_body.append(stmt)
+    return new_body
+
+
 @attrs.define
 class AddBoilerplateTransformer(cst.CSTTransformer):
     funcs: Dict[str, FuncDetails] = attrs.field()
     add_debugs: bool = attrs.field(default=False, validator=[instance_of(bool)])
     add_guards: bool = attrs.field(default=False, validator=[instance_of(bool)])
+    add_timing: bool = attrs.field(default=False, validator=[instance_of(bool)])
+    # debugs and guards run on 1 in `sample_every` calls, and at most `rate_limit` calls per second
+    sample_every: int = attrs.field(default=1, validator=[instance_of(int), ge(1)])
+    rate_limit: Optional[float] = attrs.field(
+        default=None, validator=[optional([instance_of((int, float)), gt(0)])]
+    )
+    selector: Optional[FuncSelector] = attrs.field(
+        default=None, validator=[optional(instance_of(FuncSelector))]
+    )
+    # the functions whose guards are left out, from `call_graph.get_elided_guards`
+    elided_guards: Set[str] = attrs.field(factory=set)
+    # the enclosing classes and functions, to get the qualified name of each function
+    scope: List[str] = attrs.field(factory=list)
+    # the names the added code uses from `class_inspector.instrumentation`
+    helpers: Set[str] = attrs.field(factory=set)
+    # the functions whose boilerplate from a previous run was replaced
+    n_replaced: int = attrs.field(default=0)
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> None:
+        self.scope.append(node.name.value)
+
+    def leave_ClassDef(
+        self, original_node: cst.ClassDef, updated_node: cst.ClassDef
+    ) -> cst.ClassDef:
+        self.scope.pop()
+        return updated_node
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> None:
+        self.scope += [node.name.value, "<locals>"]
 
     def leave_FunctionDef(
         self, original_node: cst.FunctionDef, updated_node: cst.FunctionDef
     ) -> cst.FunctionDef:
-        if any(
-            [
-                original_node.name.value not in self.funcs,
-                is_dunder(original_node.name.value),
-                not self.funcs[original_node.name.value].params,
-            ]
-        ):
+        qualname = ".".join(self.scope[:-1])
+        del self.scope[-2:]
+
+        name = original_node.name.value
+        if name not in self.funcs or is_dunder(name):
+            return updated_node
+        func = self.funcs[name]
+        if self.selector is not None and not self.selector.is_selected(qualname, func):
+            return updated_node
+        if not isinstance(updated_node.body, cst.IndentedBlock):
             return updated_node
 
         existing_body = list(updated_node.body.body)
+        docstring = []
+        if existing_body and m.matches(existing_body[0], DOCSTRING):
+            docstring = [existing_body.pop(0)]
 
-        if existing_body and m.matches(
-            existing_body[0],
-            m.SimpleStatementLine(body=[m.Expr(value=m.SimpleString())]),
-        ):
-            docstring = existing_body.pop(0)
+        # boilerplate from a previous run is replaced rather than added to again
+        stripped_body, replaced = strip_generated_stmts(existing_body)
+        if replaced and stripped_body:
+            existing_body = stripped_body
+            self.n_replaced += 1
         else:
-            docstring = None
+            replaced = False
 
-        additions = []
+        add_timing = self.add_timing and not is_generator(original_node)
+        if not func.params and not add_timing:
+            if not replaced:
+                return updated_node
+            return updated_node.with_changes(
+                body=cst.IndentedBlock(body=[*docstring, *existing_body])
+            )
 
-        if self.add_debugs:
-            debugs = "logger.debug(locals())\n"
-            additions.append(cst.parse_statement(debugs))
-        if self.add_guards:
-            guards = get_guard_conditions(self.funcs[original_node.name.value])
+        debugs, guards = [], []
 
-            if guards:
-                additions.append(cst.parse_statement(guards))
+        if self.add_debugs and func.params:
+            debugs.append(cst.parse_statement("logger.debug(locals())\n"))
+        if self.add_guards and func.params and name not in self.elided_guards:
+            guard_conditions = get_guard_conditions(func)
 
-        if docstring is not None:
-            additions_body = [docstring, *additions, *existing_body]
+            if guard_conditions:
+                guards.append(cst.parse_statement(guard_conditions))
+
+        gates = get_gate_conditions(qualname, self.sample_every, self.rate_limit)
+        if gates and (debugs or guards):
+            # one gate for both so each sampled call is logged and checked
+            gated = cst.If(
+                test=cst.parse_expression(" and ".join(gates)),
+                body=cst.IndentedBlock(body=[*debugs, *guards]),
+            )
+            debugs, guards = [], [gated]
+            self.helpers.update(gate.split("(", 1)[0] for gate in gates)
+
+        if add_timing:
+            # guards are timed along with the body, debugs are not
+            existing_body = get_timing_stmts(qualname, [*guards, *existing_body])
+            additions = debugs
+            self.helpers.add("record_timing")
         else:
-            additions_body = [*additions, *existing_body]
+            additions = [*debugs, *guards]
+
+        new_body = cst.IndentedBlock(body=[*docstring, *additions, *existing_body])
+        return updated_node.with_changes(body=new_body)
 
-        new_body = cst.IndentedBlock(body=additions_body)
+    def leave_Module(
+        self, original_node: cst.Module, updated_node: cst.Module
+    ) -> cst.Module:
+        if not self.helpers and not self.n_replaced:
+            return updated_node
+
+        # imports of replaced boilerplate may no longer be used, or already be there
+        body = drop_unused_generated_imports(list(updated_node.body))
+        imported_names = set()
+        for stmt in body:
+            if m.matches(stmt, GENERATED_IMPORT):
+                imported_names |= get_imported_names(stmt)
+
+        imports = []
+        if "record_timing" in self.helpers and "perf_counter_ns" not in imported_names:
+            imports.append(cst.parse_statement("from time import perf_counter_ns\n"))
+        helpers = sorted(self.helpers - imported_names)
+        if helpers:
+            imports.append(
+                cst.parse_statement(
+                    f"from {INSTRUMENTATION_MODULE} import {', '.join(helpers)}\n"
+                )
+            )
+
+        idx = 0
+        while idx < len(body) and m.matches(body[idx], DOCSTRING | FUTURE_IMPORT):
+            idx += 1
+        return updated_node.with_changes(body=[*body[:idx], *imports, *body[idx:]])
+
+
+@attrs.define
+class StripBoilerplateTransformer(cst.CSTTransformer):
+    n_stripped: int = attrs.field(default=0)
+
+    def leave_FunctionDef(
+        self, original_node: cst.FunctionDef, updated_node: cst.FunctionDef
+    ) -> cst.FunctionDef:
+        if not isinstance(updated_node.body, cst.IndentedBlock):
+            return updated_node
+
+        existing_body = list(updated_node.body.body)
+        docstring = []
+        if existing_body and m.matches(existing_body[0], DOCSTRING):
+            docstring = [existing_body.pop(0)]
+
+        stripped_body, changed = strip_generated_stmts(existing_body)
+        if not changed or not stripped_body:
+            return updated_node
+
+        self.n_stripped += 1
+        new_body = cst.IndentedBlock(body=[*docstring, *stripped_body])
         return updated_node.with_changes(body=new_body)
+
+    def leave_Module(
+        self, original_node: cst.Module, updated_node: cst.Module
+    ) -> cst.Module:
+        if not self.n_stripped:
+            return updated_node
+
+        # drop the generated imports the remaining code no longer uses
+        body = drop_unused_generated_imports(list(updated_node.body))
+        return updated_node.with_changes(body=body)
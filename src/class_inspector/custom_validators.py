@@ -1,7 +1,39 @@
+import os
+import sys
 from collections import abc
-from typing import Callable, List, Type
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import attrs
+
+from class_inspector._codegen import compile_func, type_name
+from class_inspector.validator_stats import instrument
+
+BUILTIN_CONTAINERS = (list, tuple, set, frozenset, dict, str, bytes, range)
+VALIDATION_ENV_VAR = "CLASS_INSPECTOR_VALIDATION"
+
+# module name -> enabled, the `None` key holds the global setting
+_validation_overrides: Dict[Optional[str], bool] = {}
 
 __all__: List[str] = [
+    "ValidatingIterator",
+    "lazy_iterable_bool_func",
+    "lazy_iterable_of_type",
+    "compile_generic_of_type",
+    "disabled_validator",
+    "is_validation_enabled",
+    "set_validation_enabled",
     "validate_bool_func",
     "validate_collection",
     "validate_collection_of_type",
@@ -10,11 +42,94 @@ __all__: List[str] = [
     "validate_generic_of_type",
     "validate_iterable",
     "validate_iterable_of_type",
+    "validate_mapping",
+    "validate_mapping_of_type",
     "validate_sequence",
     "validate_sequence_of_type",
 ]
 
 
+def set_validation_enabled(
+    enabled: Optional[bool], module: Optional[str] = None
+) -> None:
+    """
+    Enable or disable the validator factories, globally or for a module and its submodules.
+
+    The setting is read when a factory is called, i.e. when the class using the
+    validator is defined. While disabled the factories return ``disabled_validator``,
+    which ``define_fused`` drops entirely so disabled validation costs nothing.
+    Classes defined before the call are not affected.
+
+    Args:
+        enabled (Optional[bool]): The new setting, None removes the override.
+        module (str, optional): The dotted module name to set. Defaults to the global setting.
+
+    Usage:
+        .. code-block:: python
+
+            from class_inspector.custom_validators import set_validation_enabled
+
+            # trust the inputs of the batch jobs, before their modules are imported
+            set_validation_enabled(False, "my_package.batch")
+    """
+    if enabled is None:
+        _validation_overrides.pop(module, None)
+    else:
+        _validation_overrides[module] = enabled
+
+
+def is_validation_enabled(module: Optional[str] = None) -> bool:
+    """
+    Get whether validators are enabled for a module.
+
+    The closest override of the module or one of its parent packages wins, then the
+    global setting, then the ``CLASS_INSPECTOR_VALIDATION`` environment variable,
+    where ``0``, ``false``, ``off`` or ``no`` disables validation.
+
+    Args:
+        module (str, optional): The dotted module name. Defaults to only the global setting.
+
+    Returns:
+        bool: True if validators created in the module should validate.
+    """
+    name = module
+    while name:
+        if name in _validation_overrides:
+            return _validation_overrides[name]
+        name = name.rpartition(".")[0]
+    if None in _validation_overrides:
+        return _validation_overrides[None]
+    return os.environ.get(VALIDATION_ENV_VAR, "1").lower() not in (
+        "0",
+        "false",
+        "off",
+        "no",
+    )
+
+
+def _is_enabled_for_caller() -> bool:
+    # called from a factory, so the module defining the class is two frames up
+    return is_validation_enabled(sys._getframe(2).f_globals.get("__name__"))
+
+
+def disabled_validator(instance, attribute, value) -> None:
+    """The validator returned by the factories while validation is disabled."""
+
+
+disabled_validator.disabled = True
+
+
+def _with_types(
+    validator: Callable,
+    generic_type: Type,
+    allowed_type: Optional[Union[Type, Tuple[Type, ...]]] = None,
+) -> Callable:
+    # lets `fused_validators` inline the isinstance checks instead of calling the validator
+    validator.generic_type = generic_type
+    validator.allowed_type = allowed_type
+    return validator
+
+
 def validate_bool_func(bool_func) -> Callable:
     """
     Validate the value using a custom boolean function.
@@ -31,6 +146,9 @@ def validate_bool_func(bool_func) -> Callable:
     if not isinstance(bool_func, Callable):
         raise TypeError("provided boolean function must be callable")
 
+    if not _is_enabled_for_caller():
+        return disabled_validator
+
     def _(instance, attribute, value) -> None:
         if not bool_func(value):
             raise ValueError(
@@ -38,7 +156,7 @@ def validate_bool_func(bool_func) -> Callable:
                 f" received {value}. "
             )
 
-    return _
+    return instrument(_, "validate_bool_func")
 
 
 def validate_collection(instance, attribute, value) -> None:
@@ -73,6 +191,8 @@ def validate_collection_of_type(allowed_type: Type) -> Callable:
     Raises:
         TypeError: If the value is not a subclass of Collection.
     """
+    if not _is_enabled_for_caller():
+        return disabled_validator
 
     def _(instance, attribute, value) -> None:
         if not isinstance(value, abc.Collection):
@@ -88,7 +208,11 @@ def validate_collection_of_type(allowed_type: Type) -> Callable:
                     f" received {type(item)}."
                 )
 
-    return _
+    return instrument(
+        _with_types(_, abc.Collection, allowed_type),
+        "validate_collection_of_type",
+        True,
+    )
 
 
 def validate_generic(generic_type: Type) -> Callable:
@@ -101,6 +225,8 @@ def validate_generic(generic_type: Type) -> Callable:
     Returns:
         Callable: A validation function.
     """
+    if not _is_enabled_for_caller():
+        return disabled_validator
 
     def _(instance, attribute, value) -> None:
         if not isinstance(value, generic_type):
@@ -109,7 +235,7 @@ def validate_generic(generic_type: Type) -> Callable:
                 f" received {type(value)}. "
             )
 
-    return _
+    return instrument(_with_types(_, generic_type), "validate_generic")
 
 
 def validate_generic_bool_func(generic_type: Type, bool_func: Callable) -> Callable:
@@ -130,12 +256,23 @@ def validate_generic_bool_func(generic_type: Type, bool_func: Callable) -> Calla
     if not isinstance(bool_func, Callable):
         raise TypeError("provided boolean function must be callable")
 
+    if not _is_enabled_for_caller():
+        return disabled_validator
+
     def _(instance, attribute, value) -> None:
         if not isinstance(value, generic_type):
             raise TypeError(
                 f"{attribute.name} expecting a subclass of {generic_type.__name__},"
                 f" received {type(value)}. "
             )
+        if isinstance(value, ValidatingIterator):
+            # checking the items here would exhaust the stream, check them as consumed
+            value.chain(
+                bool_func,
+                f"{attribute.name} does not pass {bool_func.__name__}",
+                ValueError,
+            )
+            return
         for item in value:
             if not bool_func(item):
                 raise ValueError(
@@ -143,7 +280,7 @@ def validate_generic_bool_func(generic_type: Type, bool_func: Callable) -> Calla
                     f" received {value}. "
                 )
 
-    return _
+    return instrument(_, "validate_generic_bool_func", True)
 
 
 def validate_generic_of_type(generic_type: Type, allowed_type: Type) -> Callable:
@@ -157,6 +294,8 @@ def validate_generic_of_type(generic_type: Type, allowed_type: Type) -> Callable
     Returns:
         Callable: A validation function.
     """
+    if not _is_enabled_for_caller():
+        return disabled_validator
 
     def _(instance, attribute, value) -> None:
         if not isinstance(value, generic_type):
@@ -171,7 +310,78 @@ def validate_generic_of_type(generic_type: Type, allowed_type: Type) -> Callable
                     f" received {type(item)}."
                 )
 
-    return _
+    return instrument(
+        _with_types(_, generic_type, allowed_type), "validate_generic_of_type", True
+    )
+
+
+def compile_generic_of_type(
+    generic_type: Type, allowed_type: Union[Type, Tuple[Type, ...]]
+) -> Callable:
+    """
+    Generate and compile a validator specialised to a generic type and item type.
+
+    Behaves like ``validate_generic_of_type`` but the types and their names are
+    inlined as constants, and exact type matches skip the slower ``isinstance``
+    checks against abstract base classes. Validators are cached, so each
+    combination is only compiled once.
+
+    Args:
+        generic_type (Type): The generic type.
+        allowed_type (Union[Type, Tuple[Type, ...]]): The type each item in the collection should be.
+
+    Returns:
+        Callable: A validation function.
+    """
+    if not _is_enabled_for_caller():
+        return disabled_validator
+    return instrument(
+        _compile_generic_of_type(generic_type, allowed_type),
+        "compile_generic_of_type",
+        True,
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_generic_of_type(
+    generic_type: Type, allowed_type: Union[Type, Tuple[Type, ...]]
+) -> Callable:
+    namespace = {
+        "generic_type": generic_type,
+        "allowed_type": allowed_type,
+        "exact_generic_types": frozenset(
+            builtin
+            for builtin in BUILTIN_CONTAINERS
+            if issubclass(builtin, generic_type)
+        ),
+    }
+    # an exact type check only pays off against a single type,
+    # `isinstance` with a tuple is already cheaper than a set lookup plus the fallback
+    is_allowed = "isinstance(item, allowed_type)"
+    if not isinstance(allowed_type, tuple):
+        is_allowed = f"type(item) is allowed_type or {is_allowed}"
+
+    src_code = "\n".join(
+        [
+            "def validate(instance, attribute, value):",
+            "    if type(value) not in exact_generic_types and not isinstance(",
+            "        value, generic_type",
+            "    ):",
+            "        raise TypeError(",
+            f'            f"{{attribute.name}} expecting a subclass of {type_name(generic_type)},"',
+            '            f" received {type(value)}. "',
+            "        )",
+            "    for item in value:",
+            f"        if not ({is_allowed}):",
+            "            raise TypeError(",
+            f'                f"{{attribute.name}} expecting a collection of {type_name(allowed_type)},"',
+            '                f" received {type(item)}."',
+            "            )",
+        ]
+    )
+    return _with_types(
+        compile_func(src_code, "validate", namespace), generic_type, allowed_type
+    )
 
 
 def validate_iterable(instance, attribute, value) -> None:
@@ -197,6 +407,9 @@ def validate_iterable_of_type(allowed_type: Type) -> Callable:
     """
     Validate that the value is an iterable of a specific type.
 
+    Iterating over a one-shot iterator or generator exhausts it, convert those
+    with ``lazy_iterable_of_type`` so their items are checked as they are consumed.
+
     Args:
         allowed_type (Type): The type each item in the iterable should be.
 
@@ -206,6 +419,8 @@ def validate_iterable_of_type(allowed_type: Type) -> Callable:
     Raises:
         TypeError: If the value is not a subclass of Iterable.
     """
+    if not _is_enabled_for_caller():
+        return disabled_validator
 
     def _(instance, attribute, value) -> None:
         if not isinstance(value, abc.Iterable):
@@ -213,6 +428,13 @@ def validate_iterable_of_type(allowed_type: Type) -> Callable:
                 f"{attribute.name} expecting a subclass of Iterable, received {type(value)}."
                 " Must implement [__iter__]"
             )
+        if isinstance(value, ValidatingIterator):
+            # checking the items here would exhaust the stream, check them as consumed
+            value.chain(
+                lambda item: isinstance(item, allowed_type),
+                f"{attribute.name} expecting a iterable of {allowed_type.__name__}",
+            )
+            return
         for item in value:
             if not isinstance(item, allowed_type):
                 raise TypeError(
@@ -220,9 +442,216 @@ def validate_iterable_of_type(allowed_type: Type) -> Callable:
                     f" received {type(item)}."
                 )
 
+    return instrument(
+        _with_types(_, abc.Iterable, allowed_type), "validate_iterable_of_type", True
+    )
+
+
+@attrs.define
+class ValidatingIterator:
+    """
+    An iterator that checks each item as it is consumed instead of up front,
+    so streams are validated without being exhausted or held in memory.
+
+    Raises at the first offending item, the items before it have already been
+    consumed. Created by the ``lazy_iterable_of_type`` and ``lazy_iterable_bool_func``
+    converters, the iterable validators of the field chain their checks onto it.
+    """
+
+    iterable: Iterable = attrs.field()
+    is_valid: Callable[[Any], bool] = attrs.field()
+    expected: str = attrs.field()
+    error_type: Type[Exception] = attrs.field(default=TypeError)
+    _items: Iterator = attrs.field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._items = self._check_items()
+
+    def _check_items(self) -> Iterator:
+        is_valid = self.is_valid
+        for idx, item in enumerate(self.iterable):
+            if not is_valid(item):
+                raise self.error_type(
+                    f"{self.expected}, received {type(item)} at index {idx}."
+                )
+            yield item
+
+    def chain(
+        self,
+        is_valid: Callable[[Any], bool],
+        expected: str,
+        error_type: Type[Exception] = TypeError,
+    ) -> None:
+        """
+        Also check each item not consumed yet with ``is_valid``, used by validators
+        so their check runs on the stream rather than exhausting it.
+
+        Args:
+            is_valid (Callable[[Any], bool]): The check of each item.
+            expected (str): The start of the error message.
+            error_type (Type[Exception], optional): The error raised. Defaults to TypeError.
+        """
+        self._items = ValidatingIterator(self._items, is_valid, expected, error_type)
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._items)
+
+
+def _get_iterable(name: str, value: Any) -> Iterable:
+    if not isinstance(value, abc.Iterable):
+        raise TypeError(
+            f"{name} expecting a subclass of Iterable, received {type(value)}."
+            " Must implement [__iter__]"
+        )
+    return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def lazy_iterable_of_type(
+    allowed_type: Type, name: str = "value"
+) -> Callable[[Iterable], Iterable]:
+    """
+    Create an attrs converter that wraps the value in a ``ValidatingIterator``
+    checking each item is of a specific type as it is consumed.
+
+    Args:
+        allowed_type (Type): The type each item in the iterable should be.
+        name (str, optional): The name used in error messages, attrs doesn't give
+            converters the attribute. Defaults to "value".
+
+    Returns:
+        Callable[[Iterable], Iterable]: A converter function.
+
+    Raises:
+        TypeError: If the value is not a subclass of Iterable.
+
+    Usage:
+        .. code-block:: python
+
+            @attrs.define
+            class Stream:
+                rows: Iterator[int] = attrs.field(converter=lazy_iterable_of_type(int, "rows"))
+
+            stream = Stream(row for row in [1, 2, "3"])
+            list(stream.rows)
+            # TypeError: rows expecting a iterable of int, received <class 'str'> at index 2.
+    """
+    if not _is_enabled_for_caller():
+        return _identity
+
+    def is_valid(item) -> bool:
+        return isinstance(item, allowed_type)
+
+    expected = f"{name} expecting a iterable of {type_name(allowed_type)}"
+
+    def _(value) -> ValidatingIterator:
+        return ValidatingIterator(_get_iterable(name, value), is_valid, expected)
+
+    return _
+
+
+def lazy_iterable_bool_func(
+    bool_func: Callable, name: str = "value"
+) -> Callable[[Iterable], Iterable]:
+    """
+    Create an attrs converter that wraps the value in a ``ValidatingIterator``
+    checking each item with a custom boolean function as it is consumed.
+
+    Args:
+        bool_func (Callable): The boolean function to apply to each item.
+        name (str, optional): The name used in error messages. Defaults to "value".
+
+    Returns:
+        Callable[[Iterable], Iterable]: A converter function.
+
+    Raises:
+        TypeError: If the provided boolean function is not callable.
+    """
+    if not isinstance(bool_func, Callable):
+        raise TypeError("provided boolean function must be callable")
+
+    if not _is_enabled_for_caller():
+        return _identity
+
+    expected = f"{name} does not pass {bool_func.__name__}"
+
+    def _(value) -> ValidatingIterator:
+        return ValidatingIterator(
+            _get_iterable(name, value), bool_func, expected, ValueError
+        )
+
     return _
 
 
+def validate_mapping(instance, attribute, value) -> None:
+    """
+    Validate that the value is a subclass of Mapping.
+
+    Args:
+        instance: The instance the attribute belongs to.
+        attribute: The attribute being validated.
+        value: The value of the attribute.
+
+    Raises:
+        TypeError: If the value is not a subclass of Mapping.
+    """
+    if not isinstance(value, abc.Mapping):
+        raise TypeError(
+            f"{attribute.name} expecting a subclass of Mapping, received {type(value)}."
+            " Must implement [__getitem__, __iter__, __len__]"
+        )
+
+
+def validate_mapping_of_type(
+    key_type: Union[Type, Tuple[Type, ...]], value_type: Union[Type, Tuple[Type, ...]]
+) -> Callable:
+    """
+    Validate that the value is a mapping with keys and values of specific types,
+    checking both in a single pass over ``items()``.
+
+    Args:
+        key_type (Union[Type, Tuple[Type, ...]]): The type each key should be.
+        value_type (Union[Type, Tuple[Type, ...]]): The type each value should be.
+
+    Returns:
+        Callable: A validation function.
+
+    Raises:
+        TypeError: If the value is not a subclass of Mapping.
+    """
+    if not _is_enabled_for_caller():
+        return disabled_validator
+    expected = (
+        f"expecting a mapping of {type_name(key_type)} to {type_name(value_type)}"
+    )
+
+    def _(instance, attribute, value) -> None:
+        if type(value) is not dict and not isinstance(value, abc.Mapping):
+            raise TypeError(
+                f"{attribute.name} expecting a subclass of Mapping, received {type(value)}."
+                " Must implement [__getitem__, __iter__, __len__]"
+            )
+        for key, item in value.items():
+            if type(key) is not key_type and not isinstance(key, key_type):
+                raise TypeError(
+                    f"{attribute.name} {expected}, received key of {type(key)}."
+                )
+            if type(item) is not value_type and not isinstance(item, value_type):
+                raise TypeError(
+                    f"{attribute.name} {expected}, received {type(item)} for key {key!r}."
+                )
+
+    _.key_type = key_type
+    _.value_type = value_type
+    return instrument(_with_types(_, abc.Mapping), "validate_mapping_of_type", True)
+
+
 def validate_sequence(instance, attribute, value) -> None:
     """
     Validate that the value is a subclass of Sequence.
@@ -256,6 +685,8 @@ def validate_sequence_of_type(allowed_type: Type) -> Callable:
     Raises:
         TypeError: If the value is not a subclass of Sequence.
     """
+    if not _is_enabled_for_caller():
+        return disabled_validator
 
     def _(instance, attribute, value) -> None:
         if not isinstance(value, abc.Sequence):
@@ -271,4 +702,15 @@ def validate_sequence_of_type(allowed_type: Type) -> Callable:
                     f" received {type(item)}."
                 )
 
-    return _
+    return instrument(
+        _with_types(_, abc.Sequence, allowed_type), "validate_sequence_of_type", True
+    )
+
+
+for _validator, _generic_type in (
+    (validate_collection, abc.Collection),
+    (validate_iterable, abc.Iterable),
+    (validate_mapping, abc.Mapping),
+    (validate_sequence, abc.Sequence),
+):
+    _with_types(_validator, _generic_type)
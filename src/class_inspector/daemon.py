@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from stat import S_ISDIR
+from typing import Dict, Optional, Sequence
+
+# only the standard library is imported at module level so the client starts fast,
+# libcst, black and isort are imported and kept warm by the server
+ENCODING = "utf-8"
+
+
+def get_default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        # private to the user by the XDG spec
+        return os.path.join(runtime_dir, f"class_inspector-{os.getuid()}.sock")
+    # the shared temp dir is not, `serve` creates a private directory in it
+    return os.path.join(
+        tempfile.gettempdir(), f"class_inspector-{os.getuid()}", "daemon.sock"
+    )
+
+
+def _check_owner(path: str) -> os.stat_result:
+    # another user could create the socket, or its directory, under a predictable name
+    stat = os.lstat(path)
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    return stat
+
+
+def _make_private_dir(path: str) -> None:
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(path, 0o700)
+    stat = _check_owner(path)
+    if not S_ISDIR(stat.st_mode):
+        raise NotADirectoryError(f"{path} is not a directory")
+    if stat.st_mode & 0o077:
+        os.chmod(path, 0o700)
+
+
+def request(payload: Dict, socket_path: Optional[str] = None) -> Dict:
+    """Send a single request to the daemon and return its response.
+
+    Args:
+        payload (Dict): The request, its ``op`` is one of
+            ``ping``, ``transform``, ``run`` or ``shutdown``.
+        socket_path (str, optional): Defaults to ``get_default_socket_path()``.
+
+    Returns:
+        Dict: The response, ``ok`` is False and ``error`` is set if the request failed.
+
+    Raises:
+        OSError: If the daemon is not running, or its socket is owned by another user.
+    """
+    socket_path = socket_path or get_default_socket_path()
+    _check_owner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(payload).encode(ENCODING) + b"\n")
+        with client.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def handle_request(payload: Dict) -> Dict:
+    op = payload.get("op")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if op == "transform":
+        from class_inspector.cli import process_src
+
+        result = process_src(
+            payload.get("path", "<src>"),
+            payload["src_code"],
+            payload.get("operation", "boilerplate"),
+            payload.get("options", {}),
+        )
+        return {"ok": not result.error, "output": result.output, "error": result.error}
+    if op == "run":
+        from class_inspector.cli import main
+
+        if payload["argv"][:1] == ["daemon"]:
+            return {"ok": False, "error": "can not start a daemon from the daemon"}
+
+        # the server handles one request at a time so changing cwd is safe here
+        os.chdir(payload.get("cwd", os.getcwd()))
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exit_code = main(payload["argv"])
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+        return {
+            "ok": True,
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+    return {"ok": False, "error": f"unknown op: {op}"}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            payload = json.loads(line)
+            if payload.get("op") == "shutdown":
+                response = {"ok": True}
+                # `shutdown` blocks until `serve_forever` returns so can't run here
+                threading.Thread(target=self.server.shutdown).start()
+            else:
+                response = handle_request(payload)
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode(ENCODING) + b"\n")
+
+
+def warm_up() -> None:
+    from class_inspector.transform import add_boilerplate_from_src
+
+    add_boilerplate_from_src("def f(a: int):\n    return a\n", True, True)
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """Serve requests on a unix socket until a ``shutdown`` request arrives.
+
+    The socket is only accessible to the current user.
+
+    Args:
+        socket_path (str, optional): Defaults to ``get_default_socket_path()``.
+
+    Raises:
+        FileExistsError: If a daemon is already listening on ``socket_path``.
+        PermissionError: If ``socket_path``, or the default socket's directory,
+            is owned by another user.
+    """
+    if socket_path is None:
+        socket_path = get_default_socket_path()
+        if not os.environ.get("XDG_RUNTIME_DIR"):
+            _make_private_dir(os.path.dirname(socket_path))
+    try:
+        request({"op": "ping"}, socket_path)
+    except OSError:
+        pass
+    else:
+        raise FileExistsError(f"a daemon is already listening on {socket_path}")
+    # a stale socket left by a daemon that didn't shut down cleanly
+    with contextlib.suppress(FileNotFoundError):
+        _check_owner(socket_path)
+        os.unlink(socket_path)
+
+    warm_up()
+    with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+        os.chmod(socket_path, 0o600)
+        try:
+            server.serve_forever(poll_interval=0.1)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(socket_path)
+
+
+def client_main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run ``class-inspector`` through the daemon, falling back to running locally."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    socket_path = os.environ.get("CLASS_INSPECTOR_SOCKET")
+    try:
+        response = request({"op": "run", "argv": argv, "cwd": os.getcwd()}, socket_path)
+    except OSError:
+        from class_inspector.cli import main
+
+        return main(argv)
+
+    if not response["ok"]:
+        print(f"error: {response['error']}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(client_main())
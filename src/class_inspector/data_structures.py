@@ -22,7 +22,11 @@ class FuncDetails:
     return_annot: str = attrs.field(default="", validator=[instance_of(str)])
     raises: list = attrs.field(default=None)
     class_name: str = attrs.field(default="")
+    start_line: int = attrs.field(default=0, validator=[instance_of(int)])
+    end_line: int = attrs.field(default=0, validator=[instance_of(int)])
+    decorators: list = attrs.field(default=None)
 
     def __attrs_post_init__(self):
         self.params = self.params or {}
         self.raises = self.raises or []
+        self.decorators = self.decorators or []
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from class_inspector.custom_validators import _is_enabled_for_caller, disabled_validator
+from class_inspector.validator_stats import instrument
+
+
+def _import_pandas() -> Any:
+    try:
+        return importlib.import_module("pandas")
+    except ImportError as e:
+        raise ImportError(
+            "frame validators require pandas, `pip install pandas`"
+        ) from e
+
+
+def _to_mask(result: Any) -> Any:
+    # predicates may return a boolean Series, with missing values for nulls, or an array
+    if hasattr(result, "to_numpy"):
+        return result.to_numpy(dtype=bool, na_value=False)
+    return importlib.import_module("numpy").asarray(result, dtype=bool)
+
+
+def validate_dataframe(
+    columns: Sequence[str] = (),
+    dtypes: Optional[Mapping[str, Any]] = None,
+    dtype_kinds: Optional[Mapping[str, str]] = None,
+    index_type: Optional[type] = None,
+    non_null: Sequence[str] = (),
+    predicates: Optional[Mapping[str, Callable]] = None,
+) -> Callable:
+    """
+    Validate that the value is a pandas DataFrame matching a schema.
+
+    Column, dtype and index checks only read the frame metadata, ``non_null`` and
+    ``predicates`` run vectorized over whole columns, so no python code runs per row.
+
+    Args:
+        columns (Sequence[str], optional): The columns that must be present.
+        dtypes (Mapping[str, Any], optional): The exact dtype of each column, e.g. ``{"id": "int64"}``.
+        dtype_kinds (Mapping[str, str], optional): The allowed ``dtype.kind`` characters
+            of each column, e.g. ``{"price": "f", "qty": "iu"}``.
+        index_type (type, optional): The required index class, e.g. ``pd.DatetimeIndex``.
+        non_null (Sequence[str], optional): The columns that must not contain nulls.
+        predicates (Mapping[str, Callable], optional): Functions taking a column and
+            returning a boolean mask that is True for valid rows, e.g. ``{"qty": lambda s: s >= 0}``.
+
+    Returns:
+        Callable: A validation function.
+
+    Raises:
+        ImportError: If pandas is not installed.
+        TypeError: If the value is not a DataFrame, or a dtype or the index type is wrong.
+        ValueError: If columns are missing, contain nulls or rows fail a predicate.
+
+    Usage:
+        .. code-block:: python
+
+            @attrs.define
+            class Prices:
+                data: pd.DataFrame = attrs.field(
+                    validator=[
+                        validate_dataframe(
+                            dtype_kinds={"price": "f"},
+                            non_null=["price"],
+                            predicates={"price": lambda price: price > 0},
+                        )
+                    ]
+                )
+    """
+    pd = _import_pandas()
+    if not _is_enabled_for_caller():
+        return disabled_validator
+
+    dtypes = {
+        col: pd.api.types.pandas_dtype(dtype) for col, dtype in (dtypes or {}).items()
+    }
+    dtype_kinds = dict(dtype_kinds or {})
+    predicates = dict(predicates or {})
+    required = list(
+        dict.fromkeys([*columns, *dtypes, *dtype_kinds, *non_null, *predicates])
+    )
+
+    def _(instance, attribute, value) -> None:
+        if not isinstance(value, pd.DataFrame):
+            raise TypeError(
+                f"{attribute.name} expecting a subclass of DataFrame, received {type(value)}."
+            )
+        missing = [col for col in required if col not in value.columns]
+        if missing:
+            raise ValueError(f"{attribute.name} is missing columns {missing}.")
+        if index_type is not None and not isinstance(value.index, index_type):
+            raise TypeError(
+                f"{attribute.name} expecting an index of {index_type.__name__},"
+                f" received {type(value.index)}."
+            )
+        frame_dtypes = value.dtypes
+        for col, dtype in dtypes.items():
+            if frame_dtypes[col] != dtype:
+                raise TypeError(
+                    f"{attribute.name} expecting column {col!r} of dtype {dtype},"
+                    f" received {frame_dtypes[col]}."
+                )
+        for col, kinds in dtype_kinds.items():
+            if frame_dtypes[col].kind not in kinds:
+                raise TypeError(
+                    f"{attribute.name} expecting column {col!r} with dtype kind in {kinds!r},"
+                    f" received {frame_dtypes[col]}."
+                )
+        for col in non_null:
+            n_nulls = int(value[col].isna().sum())
+            if n_nulls:
+                raise ValueError(
+                    f"{attribute.name} expecting no nulls in column {col!r}, received {n_nulls}."
+                )
+        for col, predicate in predicates.items():
+            is_valid = _to_mask(predicate(value[col]))
+            if not is_valid.all():
+                first = value.index[(~is_valid).argmax()]
+                raise ValueError(
+                    f"{attribute.name} column {col!r} does not pass"
+                    f" {getattr(predicate, '__name__', predicate)},"
+                    f" {int((~is_valid).sum())} rows failed, first at index {first!r}."
+                )
+
+    return instrument(_, "validate_dataframe")
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+import pstats
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import attrs
+
+from class_inspector.data_structures import FuncDetails
+from class_inspector.utils import is_dunder
+
+
+def _to_tuple(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    # sorted so the repr, which the cli cache keys on, is stable
+    return tuple(sorted(values or ()))
+
+
+def _to_optional_tuple(values: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    return None if values is None else _to_tuple(values)
+
+
+def _matches_any(value: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatchcase(value, pattern) for pattern in patterns)
+
+
+@attrs.define(frozen=True)
+class ProfileEntry:
+    calls: int = attrs.field(default=0)
+    cumtime: float = attrs.field(default=0.0)
+
+
+def load_profile(
+    path: str, filenames: Optional[Iterable[str]] = None
+) -> Tuple[Dict[str, ProfileEntry], float]:
+    """
+    Load the functions of a cProfile stats file, e.g. from ``python -m cProfile -o``.
+
+    cProfile records function names rather than qualified names, so functions
+    of the same name are merged. Builtins and code without a function name,
+    e.g. ``<module>`` or ``<lambda>``, are left out as they can't be instrumented.
+
+    Args:
+        path (str): The path of the stats file.
+        filenames (Iterable[str], optional): Only load the functions defined in these
+            files. Defaults to None, any file.
+
+    Returns:
+        Tuple[Dict[str, ProfileEntry], float]: The calls and cumulative time of each
+            function name, and the total time of the profile in seconds.
+    """
+    stats = pstats.Stats(path)
+    real_paths = (
+        None
+        if filenames is None
+        else {os.path.realpath(filename) for filename in filenames}
+    )
+    entries: Dict[str, ProfileEntry] = {}
+    for (filename, _, name), (_, n_calls, _, cumtime, _) in stats.stats.items():
+        # builtins are recorded with "~" as their filename
+        if filename == "~" or not name.isidentifier():
+            continue
+        if real_paths is not None and os.path.realpath(filename) not in real_paths:
+            continue
+        entry = entries.get(name, ProfileEntry())
+        entries[name] = ProfileEntry(entry.calls + n_calls, entry.cumtime + cumtime)
+    return entries, stats.total_tt
+
+
+@attrs.define(frozen=True)
+class FuncSelector:
+    """
+    Select which functions ``add_boilerplate`` instruments.
+
+    A function is selected if its qualified name matches an ``include`` glob (or there
+    are none), it has an ``include_decorators`` decorator (or there are none), and
+    it is not excluded by any of the other rules. Use ``from_profile`` to select
+    functions by how hot they are in a profile.
+
+    Args:
+        include (Iterable[str], optional): Qualified name globs to instrument, e.g. "MyClass.*".
+        exclude (Iterable[str], optional): Qualified name globs not to instrument.
+        include_decorators (Iterable[str], optional): Decorator name globs to instrument, e.g. "app.route".
+        exclude_decorators (Iterable[str], optional): Decorator name globs not to instrument,
+            e.g. "functools.lru_cache".
+        skip_private (bool, optional): Skip functions whose name, or the name of an enclosing
+            class or function, starts with an underscore. Defaults to False.
+        hot_names (Iterable[str], optional): Only instrument functions with these names.
+            Defaults to None, any name.
+        skip_names (Iterable[str], optional): Function names not to instrument.
+    """
+
+    include: Tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+    exclude: Tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+    include_decorators: Tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+    exclude_decorators: Tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+    skip_private: bool = attrs.field(default=False)
+    hot_names: Optional[Tuple[str, ...]] = attrs.field(
+        default=None, converter=_to_optional_tuple
+    )
+    skip_names: Tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+
+    @classmethod
+    def from_profile(
+        cls,
+        path: str,
+        top_n: Optional[int] = None,
+        max_call_rate: Optional[float] = None,
+        filenames: Optional[Iterable[str]] = None,
+        **kwargs,
+    ) -> FuncSelector:
+        """
+        Select functions from a cProfile stats file.
+
+        Args:
+            path (str): The path of the stats file.
+            top_n (int, optional): Only instrument the ``top_n`` functions with the most
+                cumulative time. Defaults to None, any function.
+            max_call_rate (float, optional): Skip functions called more than ``max_call_rate``
+                times per second of the profile, e.g. tight inner helpers. Defaults to None.
+            filenames (Iterable[str], optional): Only rank the functions defined in these files,
+                e.g. the files being transformed. Defaults to None, any file.
+            **kwargs: The other ``FuncSelector`` rules.
+
+        Returns:
+            FuncSelector: The selector.
+        """
+        entries, total_time = load_profile(path, filenames)
+        hot_names: Optional[List[str]] = None
+        if top_n is not None:
+            hot_names = sorted(
+                entries, key=lambda name: entries[name].cumtime, reverse=True
+            )[:top_n]
+        skip_names: List[str] = []
+        if max_call_rate is not None and total_time > 0:
+            skip_names = [
+                name
+                for name, entry in entries.items()
+                if entry.calls / total_time > max_call_rate
+            ]
+        return cls(hot_names=hot_names, skip_names=skip_names, **kwargs)
+
+    def is_selected(self, qualname: str, func: FuncDetails) -> bool:
+        if self.include and not _matches_any(qualname, self.include):
+            return False
+        if _matches_any(qualname, self.exclude):
+            return False
+        if self.include_decorators and not any(
+            _matches_any(decorator, self.include_decorators)
+            for decorator in func.decorators
+        ):
+            return False
+        if any(
+            _matches_any(decorator, self.exclude_decorators)
+            for decorator in func.decorators
+        ):
+            return False
+        if self.skip_private and any(
+            name.startswith("_") and not is_dunder(name)
+            for name in qualname.split(".")
+            if name != "<locals>"
+        ):
+            return False
+        if self.hot_names is not None and func.name not in self.hot_names:
+            return False
+        return func.name not in self.skip_names
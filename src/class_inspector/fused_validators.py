@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import inspect
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import attrs
+from attrs import setters
+from attrs.validators import and_, get_disabled, instance_of, optional
+
+from class_inspector._codegen import compile_func
+from class_inspector.custom_validators import ValidatingIterator, is_validation_enabled
+
+# the original validators of fused fields are kept in the field metadata under this key
+# so that subclasses, and `attrs.fields` readers, can still find them
+VALIDATOR_KEY = "class_inspector.validator"
+
+_AND_VALIDATOR = type(and_())
+_INSTANCE_OF_VALIDATOR = type(instance_of(object))
+_OPTIONAL_VALIDATOR = type(optional(instance_of(object)))
+
+
+def _get_validators(validator: Optional[Callable]) -> List[Callable]:
+    if validator is None:
+        return []
+    if isinstance(validator, _AND_VALIDATOR):
+        return [item for sub in validator._validators for item in _get_validators(sub)]
+    return [validator]
+
+
+def _is_allowed_src(name: str, allowed_type: Any, type_ref: str) -> str:
+    if isinstance(allowed_type, tuple):
+        return f"isinstance({name}, {type_ref})"
+    return f"type({name}) is {type_ref} or isinstance({name}, {type_ref})"
+
+
+@attrs.define
+class _FusedSrc:
+    lines: List[str] = attrs.field(factory=list)
+    namespace: Dict[str, Any] = attrs.field(factory=dict)
+
+    def add_name(self, prefix: str, value: Any) -> str:
+        name = f"__ci_{prefix}_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def add_validator(
+        self, validator: Callable, attribute: attrs.Attribute, value: str, indent: str
+    ) -> None:
+        # every inlined check falls back to calling the original validator on failure,
+        # so the raised exceptions are exactly the ones attrs would raise
+        attr_ref = self.add_name("attr", attribute)
+        validator_ref = self.add_name("validator", validator)
+        fail = f"{validator_ref}(self, {attr_ref}, {value})"
+
+        if isinstance(validator, _OPTIONAL_VALIDATOR):
+            self.lines.append(f"{indent}if {value} is not None:")
+            for item in _get_validators(validator.validator):
+                self.add_validator(item, attribute, value, indent + "    ")
+        elif isinstance(validator, _INSTANCE_OF_VALIDATOR):
+            type_ref = self.add_name("type", validator.type)
+            self.lines += [
+                f"{indent}if not ({_is_allowed_src(value, validator.type, type_ref)}):",
+                f"{indent}    {fail}",
+            ]
+        elif getattr(validator, "generic_type", None) is not None:
+            generic_ref = self.add_name("type", validator.generic_type)
+            self.lines += [
+                f"{indent}if not isinstance({value}, {generic_ref}):",
+                f"{indent}    {fail}",
+            ]
+            allowed_type = getattr(validator, "allowed_type", None)
+            if allowed_type is not None:
+                type_ref = self.add_name("type", allowed_type)
+                if issubclass(ValidatingIterator, validator.generic_type):
+                    # the validator chains its check onto lazily validated streams
+                    iterator_ref = self.add_name("type", ValidatingIterator)
+                    self.lines += [
+                        f"{indent}if type({value}) is {iterator_ref}:",
+                        f"{indent}    {fail}",
+                        f"{indent}else:",
+                    ]
+                    indent += "    "
+                self.lines += [
+                    f"{indent}for item in {value}:",
+                    f"{indent}    if not ({_is_allowed_src('item', allowed_type, type_ref)}):",
+                    f"{indent}        {fail}",
+                    f"{indent}        break",
+                ]
+            elif getattr(validator, "value_type", None) is not None:
+                key_ref = self.add_name("type", validator.key_type)
+                value_ref = self.add_name("type", validator.value_type)
+                is_key_allowed = _is_allowed_src("key", validator.key_type, key_ref)
+                is_value_allowed = _is_allowed_src(
+                    "item", validator.value_type, value_ref
+                )
+                self.lines += [
+                    f"{indent}for key, item in {value}.items():",
+                    f"{indent}    if not ({is_key_allowed}) or not ({is_value_allowed}):",
+                    f"{indent}        {fail}",
+                    f"{indent}        break",
+                ]
+        else:
+            self.lines.append(f"{indent}{fail}")
+
+
+def compile_post_init(
+    fields: Sequence[Tuple[attrs.Attribute, Callable]],
+    post_init: Optional[Callable] = None,
+) -> Callable:
+    """
+    Generate a single ``__attrs_post_init__`` that runs the validators of every field.
+
+    Args:
+        fields (Sequence[Tuple[attrs.Attribute, Callable]]): The fields and their validators.
+        post_init (Callable, optional): An existing ``__attrs_post_init__`` to call afterwards.
+
+    Returns:
+        Callable: The fused ``__attrs_post_init__``.
+    """
+    src = _FusedSrc()
+    src.namespace["__ci_get_disabled"] = get_disabled
+    src.lines += [
+        "def __attrs_post_init__(self):",
+        "    if not __ci_get_disabled():",
+    ]
+    for idx, (attribute, validator) in enumerate(fields):
+        value = f"value_{idx}"
+        src.lines.append(f"        {value} = self.{attribute.name}")
+        for item in _get_validators(validator):
+            src.add_validator(item, attribute, value, " " * 8)
+    if not fields:
+        src.lines.append("        pass")
+    if post_init is not None:
+        src.namespace["__ci_post_init"] = post_init
+        src.lines.append("    __ci_post_init(self)")
+
+    fused = compile_func("\n".join(src.lines), "__attrs_post_init__", src.namespace)
+    fused.__ci_post_init__ = post_init
+    return fused
+
+
+def _validate_on_setattr(validator: Callable) -> Callable:
+    def _(instance, attribute, value):
+        if not get_disabled():
+            validator(instance, attribute, value)
+        return value
+
+    return _
+
+
+def _get_on_setattr(
+    on_setattr: Any, field: attrs.Attribute, validator: Callable
+) -> Any:
+    hooks = list(on_setattr) if isinstance(on_setattr, (list, tuple)) else [on_setattr]
+    if setters.validate not in hooks:
+        return None
+    hooks = [
+        _validate_on_setattr(validator) if hook is setters.validate else hook
+        for hook in hooks
+        if hook is not setters.convert or field.converter is not None
+    ]
+    return hooks[0] if len(hooks) == 1 else setters.pipe(*hooks)
+
+
+def _get_enabled_validator(validator: Optional[Callable]) -> Optional[Callable]:
+    validators = [
+        item
+        for item in _get_validators(validator)
+        if not getattr(item, "disabled", False)
+    ]
+    if len(validators) > 1:
+        return and_(*validators)
+    return validators[0] if validators else None
+
+
+def _fuse_fields(
+    cls: type,
+    fields: List[attrs.Attribute],
+    on_setattr: Any,
+    field_transformer: Optional[Callable],
+) -> List[attrs.Attribute]:
+    if field_transformer is not None:
+        fields = list(field_transformer(cls, fields))
+    enabled = is_validation_enabled(cls.__module__)
+
+    fused_fields, to_validate = [], []
+    for field in fields:
+        validator = _get_enabled_validator(
+            field.validator or field.metadata.get(VALIDATOR_KEY)
+        )
+        if validator is None:
+            fused_fields.append(field.evolve(validator=None))
+            continue
+
+        changes: Dict[str, Any] = {
+            "validator": None,
+            "metadata": {**field.metadata, VALIDATOR_KEY: validator},
+        }
+        if not enabled:
+            # keep the validator in the metadata for subclasses in enabled modules
+            fused_fields.append(field.evolve(**changes))
+            continue
+        if field.on_setattr is None and on_setattr not in (None, setters.NO_OP):
+            changes["on_setattr"] = _get_on_setattr(on_setattr, field, validator)
+        field = field.evolve(**changes)
+        fused_fields.append(field)
+        # like attrs, fields that `__init__` never sets are only validated on assignment
+        if field.init or field.default is not attrs.NOTHING:
+            to_validate.append((field, validator))
+
+    # skip any fused `__attrs_post_init__` inherited from a base class,
+    # its validators are already part of `to_validate`
+    post_init = getattr(cls, "__attrs_post_init__", None)
+    while hasattr(post_init, "__ci_post_init__"):
+        post_init = post_init.__ci_post_init__
+    if to_validate:
+        cls.__attrs_post_init__ = compile_post_init(to_validate, post_init)
+    elif post_init is not getattr(cls, "__attrs_post_init__", None):
+        cls.__attrs_post_init__ = post_init
+    return fused_fields
+
+
+def _has_frozen_base(cls: type) -> bool:
+    return any(
+        getattr(base.__setattr__, "__name__", None) == "_frozen_setattrs"
+        for base in inspect.getmro(cls)[1:]
+    )
+
+
+def define_fused(maybe_cls: Optional[type] = None, /, **kwargs) -> Any:
+    """
+    A drop-in replacement for ``attrs.define`` that fuses the field validators.
+
+    Instead of calling one validator per field from ``__init__``, the validators
+    are compiled into a single ``__attrs_post_init__``. ``instance_of``, ``optional``
+    and the validators from ``class_inspector.custom_validators`` are inlined,
+    any other validator is called as usual. The raised exceptions are unchanged,
+    assignments are still validated when ``on_setattr`` includes ``attrs.setters.validate``,
+    and ``attrs.validators.set_disabled`` is respected.
+
+    Validators switched off with ``custom_validators.set_validation_enabled`` are dropped,
+    and if validation is disabled for the module of the class no checks are generated at all.
+
+    Args:
+        maybe_cls (type, optional): The class to decorate.
+        **kwargs: Passed on to ``attrs.define``.
+
+    Returns:
+        Any: The decorated class, or a decorator if ``maybe_cls`` is None.
+
+    Usage:
+        .. code-block:: python
+
+            from attrs import field
+            from attrs.validators import instance_of
+            from class_inspector.fused_validators import define_fused
+
+            @define_fused
+            class Record:
+                name: str = field(validator=[instance_of(str)])
+                price: float = field(validator=[instance_of(float)])
+    """
+
+    def wrap(cls: type) -> type:
+        on_setattr = kwargs.get("on_setattr")
+        if kwargs.get("frozen") or _has_frozen_base(cls):
+            on_setattr = setters.NO_OP
+        elif on_setattr is None:
+            on_setattr = [setters.convert, setters.validate]
+
+        field_transformer = partial(
+            _fuse_fields,
+            on_setattr=on_setattr,
+            field_transformer=kwargs.get("field_transformer"),
+        )
+        return attrs.define(cls, **{**kwargs, "field_transformer": field_transformer})
+
+    if maybe_cls is None:
+        return wrap
+    return wrap(maybe_cls)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import attrs
+
+# power of two buckets so the bucket of a call is ``elapsed_ns.bit_length()``, bucket
+# ``idx`` holds calls taking less than ``BUCKET_BOUNDS_NS[idx]``, i.e. 1ns up to ~292 years
+N_BUCKETS = 64
+BUCKET_BOUNDS_NS: Tuple[int, ...] = tuple(2**idx for idx in range(N_BUCKETS))
+
+# (module, qualname)
+FuncKey = Tuple[str, str]
+
+# each thread records into its own shard so the hot path never takes a lock,
+# the lock is only taken to add a shard and to read or reset them all
+_local = threading.local()
+_lock = threading.Lock()
+_shards: List[Dict[FuncKey, List[int]]] = []
+
+
+def _new_shard() -> Dict[FuncKey, List[int]]:
+    shard: Dict[FuncKey, List[int]] = {}
+    with _lock:
+        _shards.append(shard)
+    _local.shard = shard
+    return shard
+
+
+def record_timing(module: str, qualname: str, elapsed_ns: int) -> None:
+    """
+    Record one call of a function, called by the code ``add_boilerplate(add_timing=True)`` adds.
+
+    Args:
+        module (str): The module of the function, i.e. its ``__name__``.
+        qualname (str): The qualified name of the function, e.g. "MockClass.mock_method".
+        elapsed_ns (int): The time the call took in nanoseconds.
+    """
+    try:
+        counts = _local.shard[module, qualname]
+    except (AttributeError, KeyError):
+        shard = getattr(_local, "shard", None)
+        if shard is None:
+            shard = _new_shard()
+        # the bucket counts followed by the total time
+        counts = shard[module, qualname] = [0] * (N_BUCKETS + 1)
+    counts[elapsed_ns.bit_length()] += 1
+    counts[-1] += elapsed_ns
+
+
+def sample_call(module: str, qualname: str, every: int) -> bool:
+    """
+    Check whether to sample this call of a function, called by the code
+    ``add_boilerplate(sample_every=every)`` adds.
+
+    Each thread counts the calls of each function, so sampling is lock free,
+    and the first call in each thread is always sampled.
+
+    Args:
+        module (str): The module of the function, i.e. its ``__name__``.
+        qualname (str): The qualified name of the function.
+        every (int): Sample 1 in ``every`` calls.
+
+    Returns:
+        bool: True for every ``every``th call.
+    """
+    try:
+        counts = _local.samples
+    except AttributeError:
+        counts = _local.samples = {}
+    key = (module, qualname)
+    count = counts.get(key, 0)
+    counts[key] = count + 1
+    return count % every == 0
+
+
+@attrs.define
+class TokenBucket:
+    rate: float = attrs.field()
+    burst: float = attrs.field()
+    tokens: float = attrs.field(default=attrs.Factory(lambda self: self.burst, True))
+    updated: float = attrs.field(factory=lambda: time.monotonic())
+    lock: threading.Lock = attrs.field(factory=threading.Lock, eq=False, repr=False)
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+_buckets: Dict[FuncKey, TokenBucket] = {}
+
+
+def take_token(module: str, qualname: str, rate: float) -> bool:
+    """
+    Take a token from the function's token bucket, called by the code
+    ``add_boilerplate(rate_limit=rate)`` adds.
+
+    The bucket is shared by all threads, refills at ``rate`` tokens per second
+    and holds up to a second's worth of tokens, at least 1.
+
+    Args:
+        module (str): The module of the function, i.e. its ``__name__``.
+        qualname (str): The qualified name of the function.
+        rate (float): The number of calls allowed per second.
+
+    Returns:
+        bool: True if a token was available.
+    """
+    bucket = _buckets.get((module, qualname))
+    if bucket is None:
+        with _lock:
+            bucket = _buckets.setdefault(
+                (module, qualname), TokenBucket(rate, max(1.0, rate))
+            )
+    return bucket.take()
+
+
+@attrs.define
+class TimingHistogram:
+    name: str = attrs.field()
+    counts: List[int] = attrs.field(factory=lambda: [0] * N_BUCKETS)
+    total_ns: int = attrs.field(default=0)
+
+    @property
+    def calls(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean_ns(self) -> float:
+        calls = self.calls
+        return self.total_ns / calls if calls else 0.0
+
+    def quantile(self, q: float) -> int:
+        """
+        Get the upper bound of the bucket holding the ``q`` quantile.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            int: The bound in nanoseconds, 0 with no calls.
+        """
+        target = q * self.calls
+        cumulative = 0
+        for bound, count in zip(BUCKET_BOUNDS_NS, self.counts):
+            cumulative += count
+            if count and cumulative >= target:
+                return bound
+        return 0
+
+
+def get_timings() -> Dict[str, TimingHistogram]:
+    """
+    Get a snapshot of the recorded timings, merged across threads.
+
+    Returns:
+        Dict[str, TimingHistogram]: The histograms keyed by "module.qualname".
+    """
+    timings: Dict[str, TimingHistogram] = {}
+    with _lock:
+        for shard in _shards:
+            for (module, qualname), counts in list(shard.items()):
+                name = f"{module}.{qualname}"
+                histogram = timings.get(name)
+                if histogram is None:
+                    histogram = timings[name] = TimingHistogram(name)
+                for idx in range(N_BUCKETS):
+                    histogram.counts[idx] += counts[idx]
+                histogram.total_ns += counts[-1]
+    return timings
+
+
+def reset_timings() -> None:
+    with _lock:
+        for shard in _shards:
+            shard.clear()
+
+
+def dump_timings() -> Dict:
+    """
+    Get the recorded timings in a json serializable form.
+
+    Returns:
+        Dict: The bucket bounds and each function's calls, total, mean and p50, p90
+            and p99 in nanoseconds and bucket counts.
+    """
+    return {
+        "bucket_bounds_ns": list(BUCKET_BOUNDS_NS),
+        "functions": {
+            name: {
+                "calls": histogram.calls,
+                "total_ns": histogram.total_ns,
+                "mean_ns": histogram.mean_ns,
+                "p50_ns": histogram.quantile(0.5),
+                "p90_ns": histogram.quantile(0.9),
+                "p99_ns": histogram.quantile(0.99),
+                "counts": histogram.counts,
+            }
+            for name, histogram in get_timings().items()
+        },
+    }
+
+
+def export_timings(path: str) -> None:
+    """
+    Write the recorded timings to a json file, see ``dump_timings``.
+
+    Args:
+        path (str): The path of the file.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dump_timings(), f, indent=2)
+
+
+def timings_report(sort_by: str = "total_ns", n: Optional[int] = None) -> str:
+    """
+    Format the recorded timings as a table, the functions taking the most time first by default.
+
+    Args:
+        sort_by (str, optional): The ``TimingHistogram`` attribute to sort by. Defaults to "total_ns".
+        n (int, optional): The number of rows to show. Defaults to all.
+
+    Returns:
+        str: The report.
+    """
+    timings = sorted(
+        get_timings().values(),
+        key=lambda histogram: getattr(histogram, sort_by),
+        reverse=True,
+    )[:n]
+    lines = [
+        f"{'function':<60}{'calls':>10}{'total ms':>12}{'mean us':>10}"
+        f"{'p50 us':>10}{'p99 us':>10}"
+    ]
+    for histogram in timings:
+        lines.append(
+            f"{histogram.name:<60}{histogram.calls:>10}{histogram.total_ns / 1e6:>12.3f}"
+            f"{histogram.mean_ns / 1e3:>10.3f}{histogram.quantile(0.5) / 1e3:>10.3f}"
+            f"{histogram.quantile(0.99) / 1e3:>10.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import array
+import os
+import sys
+from collections import abc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence, Tuple, Type, Union
+
+from class_inspector._codegen import type_name
+from class_inspector.custom_validators import _is_enabled_for_caller, disabled_validator
+from class_inspector.validator_stats import instrument
+
+PARALLEL_THRESHOLD = 1_000_000
+MIN_CHUNK_SIZE = 100_000
+
+# threads only speed up pure python checks when the interpreter runs without the GIL
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+ARRAY_TYPECODES = {
+    **dict.fromkeys("bBhHiIlLqQ", int),
+    **dict.fromkeys("fd", float),
+    **dict.fromkeys("uw", str),
+}
+
+
+def get_item_type(value: Any) -> Optional[type]:
+    """
+    Get the type of every item of a homogeneous container without iterating it.
+
+    Args:
+        value (Any): The container.
+
+    Returns:
+        Optional[type]: The item type for 1d numpy arrays with a non object dtype
+            and ``array.array``, otherwise None.
+    """
+    if isinstance(value, array.array):
+        return ARRAY_TYPECODES.get(value.typecode)
+    # only check for numpy if it's already imported, it can't be an ndarray otherwise
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        if value.ndim == 1 and value.dtype.kind != "O":
+            return value.dtype.type
+    return None
+
+
+def _find_invalid_item(
+    value: Sequence, allowed_type: Union[Type, Tuple[Type, ...]], start: int, stop: int
+) -> Optional[int]:
+    for idx, item in enumerate(value[start:stop], start):
+        if not isinstance(item, allowed_type):
+            return idx
+    return None
+
+
+def validate_large_collection_of_type(
+    allowed_type: Union[Type, Tuple[Type, ...]],
+    threshold: int = PARALLEL_THRESHOLD,
+    max_workers: Optional[int] = None,
+) -> Callable:
+    """
+    Validate that the value is a collection of a specific type, splitting very large
+    sequences into chunks that are checked on a thread pool.
+
+    1d numpy arrays and ``array.array`` are checked in O(1) from their dtype or typecode.
+    Sequences of at least ``threshold`` items are checked in parallel on free-threaded
+    builds of python, everything else is checked sequentially like
+    ``validate_collection_of_type``.
+
+    Args:
+        allowed_type (Union[Type, Tuple[Type, ...]]): The type each item in the collection should be.
+        threshold (int, optional): The minimum length to validate in parallel. Defaults to 1,000,000.
+        max_workers (int, optional): The number of threads. Defaults to ``os.cpu_count()``.
+
+    Returns:
+        Callable: A validation function.
+
+    Raises:
+        TypeError: If the value is not a subclass of Collection.
+    """
+    if not _is_enabled_for_caller():
+        return disabled_validator
+    n_workers = max_workers or os.cpu_count() or 1
+
+    def raise_invalid(attribute, item_type: type) -> None:
+        raise TypeError(
+            f"{attribute.name} expecting a collection of {type_name(allowed_type)},"
+            f" received {item_type}."
+        )
+
+    def _(instance, attribute, value) -> None:
+        if not isinstance(value, abc.Collection):
+            raise TypeError(
+                f"{attribute.name} expecting a subclass of Collection, received {type(value)}."
+                " Must implement "
+                "[__contains__, __iter__, __len__]"
+            )
+
+        item_type = get_item_type(value)
+        if item_type is not None:
+            if len(value) and not issubclass(item_type, allowed_type):
+                raise_invalid(attribute, item_type)
+            return
+
+        if FREE_THREADED and n_workers > 1 and len(value) >= threshold:
+            if isinstance(value, abc.Sequence):
+                chunk_size = max(MIN_CHUNK_SIZE, -(-len(value) // n_workers))
+                starts = range(0, len(value), chunk_size)
+                with ThreadPoolExecutor(n_workers) as executor:
+                    invalid = executor.map(
+                        lambda start: _find_invalid_item(
+                            value, allowed_type, start, start + chunk_size
+                        ),
+                        starts,
+                    )
+                    # chunks are in order so the first invalid index is the earliest
+                    for idx in invalid:
+                        if idx is not None:
+                            raise_invalid(attribute, type(value[idx]))
+                return
+
+        for item in value:
+            if not isinstance(item, allowed_type):
+                raise_invalid(attribute, type(item))
+
+    return instrument(_, "validate_large_collection_of_type", True)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import inspect
+import types
+import typing
+from functools import update_wrapper, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from class_inspector._codegen import compile_func, type_name
+
+NoneType = type(None)
+UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+Param = inspect.Parameter
+T = TypeVar("T")
+
+
+def get_runtime_isinstance_type(hint: Any) -> Optional[Union[type, Tuple[type, ...]]]:
+    """
+    The runtime counterpart of ``guard_conditions.get_isinstance_type``,
+    returns None when the hint can't be checked with ``isinstance``.
+
+    Args:
+        hint (Any): A resolved type hint.
+
+    Returns:
+        Optional[Union[type, Tuple[type, ...]]]: The second argument for ``isinstance``.
+    """
+    if hint is Any:
+        return None
+    if hint is None or hint is NoneType:
+        return NoneType
+    origin = typing.get_origin(hint)
+    if origin is None:
+        return hint if isinstance(hint, type) else None
+
+    if origin in UNION_TYPES:
+        allowed_types: Dict[type, None] = {}
+        for arg in typing.get_args(hint):
+            arg_type = get_runtime_isinstance_type(arg)
+            if arg_type is None:
+                return None
+            for item in arg_type if isinstance(arg_type, tuple) else (arg_type,):
+                allowed_types[item] = None
+        return tuple(allowed_types)
+
+    # generic containers are checked on the outer type, `List[int]` -> `list`
+    return origin if isinstance(origin, type) else None
+
+
+def _get_signature_src(sig: inspect.Signature) -> Tuple[str, str, Dict[str, Any]]:
+    params: List[str] = []
+    call_args: List[str] = []
+    defaults: Dict[str, Any] = {}
+    prev_kind = None
+    star_added = False
+
+    for idx, param in enumerate(sig.parameters.values()):
+        if prev_kind == Param.POSITIONAL_ONLY and param.kind != Param.POSITIONAL_ONLY:
+            params.append("/")
+        if param.kind == Param.KEYWORD_ONLY and not star_added:
+            params.append("*")
+            star_added = True
+
+        if param.kind == Param.VAR_POSITIONAL:
+            params.append(f"*{param.name}")
+            call_args.append(f"*{param.name}")
+            star_added = True
+        elif param.kind == Param.VAR_KEYWORD:
+            params.append(f"**{param.name}")
+            call_args.append(f"**{param.name}")
+        else:
+            param_src = param.name
+            if param.default is not Param.empty:
+                defaults[f"__ci_default_{idx}"] = param.default
+                param_src += f"=__ci_default_{idx}"
+            params.append(param_src)
+            call_args.append(
+                f"{param.name}={param.name}"
+                if param.kind == Param.KEYWORD_ONLY
+                else param.name
+            )
+        prev_kind = param.kind
+
+    if prev_kind == Param.POSITIONAL_ONLY:
+        params.append("/")
+    return ", ".join(params), ", ".join(call_args), defaults
+
+
+def _compile_guard(func: Callable, hints: Dict[str, Any]) -> Callable:
+    sig = inspect.signature(func)
+    checks = []
+    for param in sig.parameters.values():
+        if param.kind in (Param.VAR_POSITIONAL, Param.VAR_KEYWORD):
+            continue
+        if param.name in hints:
+            allowed_type = get_runtime_isinstance_type(hints[param.name])
+            if allowed_type is not None:
+                checks.append((param.name, allowed_type))
+
+    if not checks:
+        return func
+
+    params_src, call_args_src, namespace = _get_signature_src(sig)
+    namespace["__ci_func"] = func
+    # params named e.g. `type` would shadow the builtins in the generated function
+    namespace["__ci_isinstance"] = isinstance
+    namespace["__ci_type"] = type
+    namespace["__ci_type_error"] = TypeError
+    namespace["__ci_message"] = (
+        f"{func.__name__} expects arg types: "
+        f"[{', '.join(type_name(allowed_type) for _, allowed_type in checks)}], "
+    )
+    is_instances = []
+    for idx, (name, allowed_type) in enumerate(checks):
+        namespace[f"__ci_allowed_type_{idx}"] = allowed_type
+        is_instances.append(f"__ci_isinstance({name}, __ci_allowed_type_{idx})")
+    received = ", ".join(f"{{__ci_type({name}).__name__}}" for name, _ in checks)
+
+    is_async = inspect.iscoroutinefunction(func)
+    src_code = "\n".join(
+        [
+            f"{'async ' if is_async else ''}def __ci_guarded({params_src}):",
+            f"    if not ({' and '.join(is_instances)}):",
+            f'        raise __ci_type_error(__ci_message + f"received: [{received}]")',
+            f"    return {'await ' if is_async else ''}__ci_func({call_args_src})",
+        ]
+    )
+    guarded = compile_func(src_code, "__ci_guarded", namespace)
+    return update_wrapper(guarded, func)
+
+
+def guard(func: T, localns: Optional[Dict[str, Any]] = None) -> T:
+    """Check the types of the annotated arguments on every call.
+
+    The type hints are resolved once and compiled into a wrapper with the same
+    signature as ``func``, raising the same ``TypeError`` as the guards from ``add_guards``.
+
+    Args:
+        func (T): The function, staticmethod or classmethod to guard.
+        localns (Dict[str, Any], optional): Extra names used to resolve forward references.
+
+    Returns:
+        T: The guarded function, or ``func`` itself if none of its arguments are annotated.
+
+    Usage:
+        .. code-block:: python
+
+            from class_inspector.runtime_guards import guard
+
+            @guard
+            def example_function(a: int, b: str = "default") -> str:
+                return str(a) + b
+
+            example_function("1")
+            # TypeError: example_function expects arg types: [int, str], received: [str, str]
+    """
+    if isinstance(func, (staticmethod, classmethod)):
+        return type(func)(guard(func.__func__, localns))
+
+    try:
+        hints = typing.get_type_hints(func, localns=localns)
+    except NameError:
+        # forward references to names not defined yet are resolved on the first call
+        guarded = None
+
+        @wraps(func)
+        def deferred(*args, **kwargs):
+            nonlocal guarded
+            if guarded is None:
+                guarded = _compile_guard(
+                    func, typing.get_type_hints(func, localns=localns)
+                )
+            return guarded(*args, **kwargs)
+
+        return deferred
+
+    return _compile_guard(func, hints)
+
+
+def guard_class(cls: T) -> T:
+    """Guard every non dunder method, staticmethod and classmethod of a class.
+
+    Args:
+        cls (T): The class to guard.
+
+    Returns:
+        T: The same class with its methods replaced in place.
+    """
+    localns = {cls.__name__: cls}
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("__") and name.endswith("__"):
+            continue
+        if inspect.isfunction(attr) or isinstance(attr, (staticmethod, classmethod)):
+            setattr(cls, name, guard(attr, localns))
+    return cls
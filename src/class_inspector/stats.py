@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+import attrs
+from attrs.validators import instance_of
+
+
+@attrs.define
+class StageStats:
+    name: str = attrs.field(validator=[instance_of(str)])
+    wall_time: float = attrs.field(default=0.0, validator=[instance_of(float)])
+    cpu_time: float = attrs.field(default=0.0, validator=[instance_of(float)])
+    calls: int = attrs.field(default=0, validator=[instance_of(int)])
+
+
+@attrs.define
+class PipelineStats:
+    """
+    Per-stage timings and sizes for a single run of the transform pipeline.
+
+    Pass an instance as ``stats`` to any of the entry points in
+    ``class_inspector.transform`` and it is filled in as the run progresses.
+    """
+
+    path: str = attrs.field(default="", validator=[instance_of(str)])
+    stages: Dict[str, StageStats] = attrs.field(factory=dict)
+    n_bytes: int = attrs.field(default=0, validator=[instance_of(int)])
+    n_nodes: int = attrs.field(default=0, validator=[instance_of(int)])
+    n_funcs: int = attrs.field(default=0, validator=[instance_of(int)])
+    cache_hits: int = attrs.field(default=0, validator=[instance_of(int)])
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stage = self.stages.setdefault(name, StageStats(name))
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stage.wall_time += time.perf_counter() - wall_start
+            stage.cpu_time += time.process_time() - cpu_start
+            stage.calls += 1
+
+    @property
+    def wall_time(self) -> float:
+        return sum(stage.wall_time for stage in self.stages.values())
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(stage.cpu_time for stage in self.stages.values())
+
+    def report(self) -> str:
+        lines = [
+            f"{self.path or '<src>'}: {self.n_bytes} bytes, {self.n_nodes} nodes, "
+            f"{self.n_funcs} funcs, {self.cache_hits} cache hits",
+            f"{'stage':<20}{'calls':>8}{'wall ms':>12}{'cpu ms':>12}",
+        ]
+        for stage in self.stages.values():
+            lines.append(
+                f"{stage.name:<20}{stage.calls:>8}"
+                f"{stage.wall_time * 1e3:>12.3f}{stage.cpu_time * 1e3:>12.3f}"
+            )
+        lines.append(
+            f"{'total':<20}{'':>8}"
+            f"{self.wall_time * 1e3:>12.3f}{self.cpu_time * 1e3:>12.3f}"
+        )
+        return "\n".join(lines)
+
+
+def time_stage(stats: Optional[PipelineStats], name: str) -> ContextManager:
+    if stats is None:
+        return nullcontext()
+    return stats.stage(name)
+
+
+@attrs.define
+class ProfileReport:
+    result: Any = attrs.field()
+    stats: PipelineStats = attrs.field(validator=[instance_of(PipelineStats)])
+    profile: pstats.Stats = attrs.field(validator=[instance_of(pstats.Stats)])
+    peak_bytes: int = attrs.field(validator=[instance_of(int)])
+    top_allocations: List[tracemalloc.Statistic] = attrs.field(factory=list)
+
+    def report(self, n_funcs: int = 25, sort_by: str = "cumulative") -> str:
+        profile_str = io.StringIO()
+        self.profile.stream = profile_str
+        self.profile.sort_stats(sort_by).print_stats(n_funcs)
+        allocations = "\n".join(str(stat) for stat in self.top_allocations)
+        return "\n\n".join(
+            [
+                self.stats.report(),
+                f"peak traced memory: {self.peak_bytes} bytes",
+                allocations,
+                profile_str.getvalue(),
+            ]
+        )
+
+
+def profile_file(
+    func: Callable, path: str, /, n_allocations: int = 10, **kwargs
+) -> ProfileReport:
+    """Run one of the path based entry points under cProfile and tracemalloc.
+
+    Modules already held in ``cache.MODULE_CACHE`` skip parsing,
+    clear it first to profile a cold run.
+
+    Args:
+        func (Callable): The entry point to profile, e.g. ``add_boilerplate_from_path``.
+        path (str): The path of the python file to process.
+        n_allocations (int, optional): The number of largest allocation sites to keep. Defaults to 10.
+        **kwargs: Passed on to ``func``.
+
+    Returns:
+        ProfileReport: The result of ``func`` along with its stage timings, profile and memory usage.
+    """
+    stats = PipelineStats()
+    profiler = cProfile.Profile()
+    # leave any tracing the caller started running, only measuring the peak of this call
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        profiler.enable()
+        try:
+            result = func(path, stats=stats, **kwargs)
+        finally:
+            profiler.disable()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return ProfileReport(
+        result,
+        stats,
+        pstats.Stats(profiler),
+        peak_bytes,
+        snapshot.statistics("lineno")[:n_allocations],
+    )
@@ -1,14 +1,25 @@
 import inspect
 from types import FunctionType, ModuleType
-from typing import Union
+from typing import Dict, Iterable, Optional, Tuple, Union
 
+import libcst as cst
+
+from class_inspector.cache import MODULE_CACHE, estimate_cst_bytes, get_src_hash
+from class_inspector.call_graph import get_elided_guards
 from class_inspector.create_tests import get_tests
 from class_inspector.cst_walkers import (
     AddBoilerplateTransformer,
     FuncVisitor,
+    StripBoilerplateTransformer,
+    count_nodes,
 )
+from class_inspector.data_structures import FuncDetails
+from class_inspector.func_selection import FuncSelector
+from class_inspector.stats import PipelineStats, time_stage
 from class_inspector.utils import (
     format_code_str,
+    get_changed_lines,
+    get_src_code,
     str_to_cst,
 )
 
@@ -18,6 +29,12 @@ def add_boilerplate(
     /,
     add_debugs: bool = True,
     add_guards: bool = False,
+    add_timing: bool = False,
+    sample_every: int = 1,
+    rate_limit: Optional[float] = None,
+    selector: Optional[FuncSelector] = None,
+    elide_guards: bool = False,
+    stats: Optional[PipelineStats] = None,
 ) -> str:
     """Add boilerplate to the object.
 
@@ -27,6 +44,23 @@ def add_boilerplate(
             Add debugs to each of the functions or methods. Defaults to True.
         add_guards (bool, optional):
             Add guard conditions to each of the functions, will check the type hints if supplied. Defaults to False.
+        add_timing (bool, optional):
+            Time each call of the functions into the histograms of ``class_inspector.instrumentation``,
+            keyed by module and qualified name. Generators are not timed. Defaults to False.
+        sample_every (int, optional):
+            Only run the debugs and guards on 1 in ``sample_every`` calls of each function,
+            counted per thread. Defaults to 1.
+        rate_limit (float, optional):
+            Only run the debugs and guards on at most ``rate_limit`` calls per second of each function,
+            allowing bursts of up to a second's worth. Defaults to None.
+        selector (FuncSelector, optional):
+            Only add boilerplate to the functions it selects, by name, decorator or profile. Defaults to None, all functions.
+        elide_guards (bool, optional):
+            Leave out the guards of private functions that are only called from guarded functions passing on
+            params of the same type, so each value is checked once per entry point. Not done when sampling or
+            rate limiting, as the callers' guards don't run on every call. Defaults to False.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
 
     Returns:
         str: The class, function or module with modifications.
@@ -57,12 +91,213 @@ def add_boilerplate(
                     return str(a) + b
                 return a
     """
-    module = str_to_cst(format_code_str(inspect.getsource(obj)))
-    visitor = FuncVisitor()
-    module.visit(visitor)
-    transformer = AddBoilerplateTransformer(visitor.funcs, add_debugs, add_guards)
-    modified_module = module.visit(transformer)
-    return format_code_str(modified_module.code)
+    with time_stage(stats, "getsource"):
+        src_code = inspect.getsource(obj)
+    return add_boilerplate_from_src(
+        src_code,
+        add_debugs,
+        add_guards,
+        add_timing,
+        sample_every,
+        rate_limit,
+        selector,
+        elide_guards,
+        stats,
+    )
+
+
+def add_boilerplate_from_src(
+    src_code: str,
+    /,
+    add_debugs: bool = True,
+    add_guards: bool = False,
+    add_timing: bool = False,
+    sample_every: int = 1,
+    rate_limit: Optional[float] = None,
+    selector: Optional[FuncSelector] = None,
+    elide_guards: bool = False,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Add boilerplate to source code without importing the module it belongs to.
+
+    Boilerplate added by a previous run is replaced, so running it again on its own
+    output changes nothing.
+
+    Args:
+        src_code (str): The source code to add boilerplate to.
+        add_debugs (bool, optional):
+            Add debugs to each of the functions or methods. Defaults to True.
+        add_guards (bool, optional):
+            Add guard conditions to each of the functions, will check the type hints if supplied. Defaults to False.
+        add_timing (bool, optional):
+            Time each call of the functions into the histograms of ``class_inspector.instrumentation``,
+            keyed by module and qualified name. Generators are not timed. Defaults to False.
+        sample_every (int, optional):
+            Only run the debugs and guards on 1 in ``sample_every`` calls of each function,
+            counted per thread. Defaults to 1.
+        rate_limit (float, optional):
+            Only run the debugs and guards on at most ``rate_limit`` calls per second of each function,
+            allowing bursts of up to a second's worth. Defaults to None.
+        selector (FuncSelector, optional):
+            Only add boilerplate to the functions it selects, by name, decorator or profile. Defaults to None, all functions.
+        elide_guards (bool, optional):
+            Leave out the guards of private functions that are only called from guarded functions passing on
+            params of the same type, so each value is checked once per entry point. Not done when sampling or
+            rate limiting, as the callers' guards don't run on every call. Defaults to False.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The source code with modifications.
+    """
+    module, funcs = _parse_src(src_code, stats)
+    elided_guards = set()
+    if elide_guards and add_guards and sample_every == 1 and rate_limit is None:
+        with time_stage(stats, "call_graph"):
+            elided_guards = get_elided_guards(module, funcs, selector)
+    with time_stage(stats, "transform"):
+        transformer = AddBoilerplateTransformer(
+            funcs,
+            add_debugs,
+            add_guards,
+            add_timing,
+            sample_every,
+            rate_limit,
+            selector,
+            elided_guards,
+        )
+        modified_module = module.visit(transformer)
+    with time_stage(stats, "format_output"):
+        return format_code_str(modified_module.code)
+
+
+def add_boilerplate_from_path(
+    path: str,
+    /,
+    add_debugs: bool = True,
+    add_guards: bool = False,
+    add_timing: bool = False,
+    sample_every: int = 1,
+    rate_limit: Optional[float] = None,
+    selector: Optional[FuncSelector] = None,
+    elide_guards: bool = False,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Add boilerplate to a source file without importing it.
+
+    Args:
+        path (str): The path of the python file to add boilerplate to.
+        add_debugs (bool, optional):
+            Add debugs to each of the functions or methods. Defaults to True.
+        add_guards (bool, optional):
+            Add guard conditions to each of the functions, will check the type hints if supplied. Defaults to False.
+        add_timing (bool, optional):
+            Time each call of the functions into the histograms of ``class_inspector.instrumentation``,
+            keyed by module and qualified name. Generators are not timed. Defaults to False.
+        sample_every (int, optional):
+            Only run the debugs and guards on 1 in ``sample_every`` calls of each function,
+            counted per thread. Defaults to 1.
+        rate_limit (float, optional):
+            Only run the debugs and guards on at most ``rate_limit`` calls per second of each function,
+            allowing bursts of up to a second's worth. Defaults to None.
+        selector (FuncSelector, optional):
+            Only add boilerplate to the functions it selects, by name, decorator or profile. Defaults to None, all functions.
+        elide_guards (bool, optional):
+            Leave out the guards of private functions that are only called from guarded functions passing on
+            params of the same type, so each value is checked once per entry point. Not done when sampling or
+            rate limiting, as the callers' guards don't run on every call. Defaults to False.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The file contents with modifications.
+    """
+    if stats is not None:
+        stats.path = path
+    with time_stage(stats, "read"):
+        src_code = get_src_code(path)
+    return add_boilerplate_from_src(
+        src_code,
+        add_debugs,
+        add_guards,
+        add_timing,
+        sample_every,
+        rate_limit,
+        selector,
+        elide_guards,
+        stats,
+    )
+
+
+def strip_boilerplate(
+    obj: Union[ModuleType, FunctionType],
+    /,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Remove the boilerplate ``add_boilerplate`` added to the object.
+
+    Only the exact debugs, guards, sampling gates and timing it generates at the start
+    of each function are removed, along with the instrumentation imports left unused.
+
+    Args:
+        obj (Union[ModuleType, FunctionType]): The object to remove boilerplate from.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The class, function or module without the boilerplate.
+    """
+    with time_stage(stats, "getsource"):
+        src_code = inspect.getsource(obj)
+    return strip_boilerplate_from_src(src_code, stats)
+
+
+def strip_boilerplate_from_src(
+    src_code: str,
+    /,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Remove the boilerplate ``add_boilerplate`` added to source code without importing it.
+
+    Args:
+        src_code (str): The source code to remove boilerplate from.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The source code without the boilerplate, ``src_code`` itself if there was none.
+    """
+    module, _ = _parse_src(src_code, stats)
+    transformer = StripBoilerplateTransformer()
+    with time_stage(stats, "transform"):
+        modified_module = module.visit(transformer)
+    if not transformer.n_stripped:
+        # only rewrite, and so reformat, source that had boilerplate to remove
+        return src_code
+    with time_stage(stats, "format_output"):
+        return format_code_str(modified_module.code)
+
+
+def strip_boilerplate_from_path(
+    path: str,
+    /,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Remove the boilerplate ``add_boilerplate`` added to a source file without importing it.
+
+    Args:
+        path (str): The path of the python file to remove boilerplate from.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The file contents without the boilerplate.
+    """
+    if stats is not None:
+        stats.path = path
+    with time_stage(stats, "read"):
+        src_code = get_src_code(path)
+    return strip_boilerplate_from_src(src_code, stats)
 
 
 def get_parametrized_tests(
@@ -70,6 +305,8 @@ def get_parametrized_tests(
     /,
     test_raises: bool = True,
     raises_arg_types: bool = False,
+    changed_lines: Optional[Union[str, Iterable[int]]] = None,
+    stats: Optional[PipelineStats] = None,
 ) -> str:
     """_summary_
 
@@ -77,6 +314,12 @@ def get_parametrized_tests(
         obj (Union[ModuleType, FunctionType]): The object to get tests for.
         test_raises (bool, optional): Create tests for each of the exceptions raised in the function. Defaults to True.
         raises_arg_types (bool, optional): Create tests to check the type of each of the input arguments. Defaults to False.
+        changed_lines (Union[str, Iterable[int]], optional):
+            A unified diff (e.g. the output of ``git diff -U0``) or the line numbers that changed in the
+            file defining ``obj``. When given, tests are only created for the functions those lines touch,
+            the hunks of a diff covering several files are matched to that file. Defaults to None.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
 
     Returns:
         str: The parametrized tests for the given object, returns a test per function if given a module or per method if given classes
@@ -117,7 +360,165 @@ def get_parametrized_tests(
                     assert example_function(a, b) == expected_result
 
     """
-    module = str_to_cst(format_code_str(inspect.getsource(obj)))
-    visitor = FuncVisitor()
-    module.visit(visitor)
-    return get_tests(visitor.funcs, test_raises, raises_arg_types)
+    with time_stage(stats, "getsource"):
+        src_lines, first_line = inspect.getsourcelines(obj)
+    return _get_parametrized_tests(
+        "".join(src_lines),
+        test_raises,
+        raises_arg_types,
+        changed_lines,
+        stats,
+        first_line,
+        inspect.getsourcefile(obj),
+    )
+
+
+def get_parametrized_tests_from_src(
+    src_code: str,
+    /,
+    test_raises: bool = True,
+    raises_arg_types: bool = False,
+    changed_lines: Optional[Union[str, Iterable[int]]] = None,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Get parametrized tests for source code without importing the module it belongs to.
+
+    Args:
+        src_code (str): The source code to get tests for.
+        test_raises (bool, optional): Create tests for each of the exceptions raised in the function. Defaults to True.
+        raises_arg_types (bool, optional): Create tests to check the type of each of the input arguments. Defaults to False.
+        changed_lines (Union[str, Iterable[int]], optional):
+            A unified diff of one file or the line numbers that changed in ``src_code``.
+            When given, tests are only created for the functions those lines touch. Defaults to None.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The parametrized tests, a test per function or method in the source code.
+
+    Raises:
+        ValueError: If ``changed_lines`` is a diff changing several files.
+    """
+    return _get_parametrized_tests(
+        src_code, test_raises, raises_arg_types, changed_lines, stats
+    )
+
+
+def get_parametrized_tests_from_path(
+    path: str,
+    /,
+    test_raises: bool = True,
+    raises_arg_types: bool = False,
+    changed_lines: Optional[Union[str, Iterable[int]]] = None,
+    stats: Optional[PipelineStats] = None,
+) -> str:
+    """Get parametrized tests for a source file without importing it.
+
+    Args:
+        path (str): The path of the python file to get tests for.
+        test_raises (bool, optional): Create tests for each of the exceptions raised in the function. Defaults to True.
+        raises_arg_types (bool, optional): Create tests to check the type of each of the input arguments. Defaults to False.
+        changed_lines (Union[str, Iterable[int]], optional):
+            A unified diff or the line numbers that changed in the file.
+            When given, tests are only created for the functions those lines touch,
+            the hunks of a diff covering several files are matched to ``path``. Defaults to None.
+        stats (PipelineStats, optional):
+            Filled in with the wall time, cpu time, bytes and node counts of each stage. Defaults to None.
+
+    Returns:
+        str: The parametrized tests, a test per function or method in the file.
+    """
+    if stats is not None:
+        stats.path = path
+    with time_stage(stats, "read"):
+        src_code = get_src_code(path)
+    return _get_parametrized_tests(
+        src_code, test_raises, raises_arg_types, changed_lines, stats, path=path
+    )
+
+
+def _get_parametrized_tests(
+    src_code: str,
+    test_raises: bool,
+    raises_arg_types: bool,
+    changed_lines: Optional[Union[str, Iterable[int]]] = None,
+    stats: Optional[PipelineStats] = None,
+    first_line: int = 1,
+    path: Optional[str] = None,
+) -> str:
+    if changed_lines is not None:
+        funcs = _get_changed_funcs(src_code, changed_lines, stats, first_line, path)
+    else:
+        _, funcs = _parse_src(src_code, stats)
+    with time_stage(stats, "get_tests"):
+        return get_tests(funcs, test_raises, raises_arg_types)
+
+
+def _parse_src(
+    src_code: str, stats: Optional[PipelineStats] = None
+) -> Tuple[cst.Module, Dict[str, FuncDetails]]:
+    key = (get_src_hash(src_code), "formatted")
+    parsed = MODULE_CACHE.get(key)
+    if parsed is None:
+        with time_stage(stats, "format_input"):
+            formatted_code = format_code_str(src_code)
+        with time_stage(stats, "parse"):
+            module = str_to_cst(formatted_code)
+        with time_stage(stats, "visit"):
+            visitor = FuncVisitor()
+            module.visit(visitor)
+        parsed = (module, visitor.funcs)
+        MODULE_CACHE.put(key, parsed, estimate_cst_bytes(src_code))
+    elif stats is not None:
+        stats.cache_hits += 1
+
+    if stats is not None:
+        stats.n_bytes = len(src_code.encode("utf-8"))
+        stats.n_nodes = count_nodes(parsed[0])
+        stats.n_funcs = len(parsed[1])
+    return parsed
+
+
+def _parse_src_positions(
+    src_code: str, stats: Optional[PipelineStats] = None
+) -> Dict[str, FuncDetails]:
+    # the source is parsed unformatted so the positions line up with the file on disk
+    key = (get_src_hash(src_code), "positions")
+    funcs = MODULE_CACHE.get(key)
+    if funcs is None:
+        with time_stage(stats, "parse"):
+            module = str_to_cst(src_code)
+        with time_stage(stats, "visit"):
+            visitor = FuncVisitor()
+            cst.MetadataWrapper(module, unsafe_skip_copy=True).visit(visitor)
+        funcs = visitor.funcs
+        MODULE_CACHE.put(key, funcs, len(src_code))
+        if stats is not None:
+            stats.n_nodes = count_nodes(module)
+    elif stats is not None:
+        stats.cache_hits += 1
+
+    if stats is not None:
+        stats.n_bytes = len(src_code.encode("utf-8"))
+        stats.n_funcs = len(funcs)
+    return funcs
+
+
+def _get_changed_funcs(
+    src_code: str,
+    changed_lines: Union[str, Iterable[int]],
+    stats: Optional[PipelineStats] = None,
+    first_line: int = 1,
+    path: Optional[str] = None,
+) -> Dict[str, FuncDetails]:
+    if isinstance(changed_lines, str):
+        changed_lines = get_changed_lines(changed_lines, path)
+
+    offset = max(first_line - 1, 0)
+    lines = {line - offset for line in changed_lines}
+
+    return {
+        name: func
+        for name, func in _parse_src_positions(src_code, stats).items()
+        if any(func.start_line <= line <= func.end_line for line in lines)
+    }
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import itertools
+import typing
+from collections import abc
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+import attrs
+
+from class_inspector._codegen import compile_func
+from class_inspector.custom_validators import _is_enabled_for_caller, disabled_validator
+from class_inspector.runtime_guards import UNION_TYPES, NoneType
+from class_inspector.validator_stats import instrument
+
+ANY_TYPES = (Any, object)
+
+
+def _get_hint_name(hint: Any) -> str:
+    if isinstance(hint, type) and typing.get_origin(hint) is None:
+        return hint.__name__
+    return repr(hint).replace("typing.", "")
+
+
+@attrs.define
+class _CheckSrc:
+    """Accumulates the source and namespace of a compiled type check."""
+
+    lines: List[str] = attrs.field(factory=list)
+    namespace: Dict[str, Any] = attrs.field(factory=dict)
+    counter: Any = attrs.field(factory=itertools.count)
+
+    def add_name(self, prefix: str, value: Any) -> str:
+        name = f"__ci_{prefix}_{next(self.counter)}"
+        self.namespace[name] = value
+        return name
+
+    def new_var(self) -> str:
+        return f"v_{next(self.counter)}"
+
+    def get_expr(self, hint: Any, var: str) -> Optional[str]:
+        """Get an expression checking ``var`` against ``hint``,
+        None if the hint needs statements, e.g. a loop over its items."""
+        hint = _unwrap(hint)
+        if hint in ANY_TYPES:
+            return "True"
+        if hint is None or hint is NoneType:
+            return f"{var} is None"
+
+        origin = typing.get_origin(hint)
+        if origin is None:
+            if not isinstance(hint, type):
+                raise TypeError(f"can not compile a check for {hint!r}")
+            type_ref = self.add_name("type", hint)
+            return f"(type({var}) is {type_ref} or isinstance({var}, {type_ref}))"
+
+        args = typing.get_args(hint)
+        if _is_empty_tuple(hint):
+            type_ref = self.add_name("type", origin)
+            return f"(isinstance({var}, {type_ref}) and len({var}) == 0)"
+        if origin is typing.Literal:
+            literals = self.add_name(
+                "literals", frozenset((type(arg), arg) for arg in args)
+            )
+            literal_types = self.add_name("type", tuple({type(arg) for arg in args}))
+            return f"(isinstance({var}, {literal_types}) and (type({var}), {var}) in {literals})"
+        if origin in UNION_TYPES:
+            exprs = [self.get_expr(arg, var) for arg in args]
+            if None in exprs:
+                return None
+            return f"({' or '.join(exprs)})"
+        if origin is type:
+            return f"isinstance({var}, type)"
+        if _has_item_checks(origin, args):
+            return None
+        type_ref = self.add_name("type", origin)
+        return f"isinstance({var}, {type_ref})"
+
+    def add_check(self, hint: Any, var: str, indent: str) -> None:
+        """Add statements that return False if ``var`` does not match ``hint``."""
+        hint = _unwrap(hint)
+        expr = self.get_expr(hint, var)
+        if expr is not None:
+            if expr != "True":
+                self.lines += [f"{indent}if not {expr}:", f"{indent}    return False"]
+            return
+
+        origin, args = typing.get_origin(hint), typing.get_args(hint)
+        if origin in UNION_TYPES:
+            self._add_union_check(args, var, indent)
+            return
+
+        type_ref = self.add_name("type", origin)
+        self.lines += [
+            f"{indent}if not (type({var}) is {type_ref} or isinstance({var}, {type_ref})):",
+            f"{indent}    return False",
+        ]
+        if issubclass(origin, tuple):
+            self._add_tuple_check(args, var, indent)
+        elif issubclass(origin, abc.Mapping):
+            key_var, value_var = self.new_var(), self.new_var()
+            self.lines.append(f"{indent}for {key_var}, {value_var} in {var}.items():")
+            self.add_check(args[0], key_var, indent + "    ")
+            self.add_check(args[1], value_var, indent + "    ")
+            self._add_pass(indent + "    ")
+        else:
+            item_var = self.new_var()
+            if not issubclass(origin, abc.Collection):
+                # only check the items of iterables that won't be exhausted by it
+                collection_ref = self.add_name("type", abc.Collection)
+                self.lines.append(f"{indent}if isinstance({var}, {collection_ref}):")
+                indent += "    "
+            self.lines.append(f"{indent}for {item_var} in {var}:")
+            self.add_check(args[0], item_var, indent + "    ")
+            self._add_pass(indent + "    ")
+
+    def _add_union_check(self, args: Any, var: str, indent: str) -> None:
+        exprs, complex_args = [], []
+        for arg in args:
+            expr = self.get_expr(arg, var)
+            if expr is None:
+                complex_args.append(arg)
+            else:
+                exprs.append(expr)
+
+        if len(complex_args) == 1:
+            # e.g. `Optional[List[int]]`, inline the loop when the simple types don't match
+            if exprs:
+                self.lines.append(f"{indent}if not ({' or '.join(exprs)}):")
+                indent += "    "
+            self.add_check(complex_args[0], var, indent)
+            self._add_pass(indent)
+            return
+
+        for arg in complex_args:
+            exprs.append(f"{self.add_name('check', compile_type_check(arg))}({var})")
+        self.lines += [
+            f"{indent}if not ({' or '.join(exprs)}):",
+            f"{indent}    return False",
+        ]
+
+    def _add_tuple_check(self, args: Any, var: str, indent: str) -> None:
+        if len(args) == 2 and args[1] is Ellipsis:
+            item_var = self.new_var()
+            self.lines.append(f"{indent}for {item_var} in {var}:")
+            self.add_check(args[0], item_var, indent + "    ")
+            self._add_pass(indent + "    ")
+            return
+
+        self.lines += [
+            f"{indent}if len({var}) != {len(args)}:",
+            f"{indent}    return False",
+        ]
+        for idx, arg in enumerate(args):
+            item_var = self.new_var()
+            self.lines.append(f"{indent}{item_var} = {var}[{idx}]")
+            self.add_check(arg, item_var, indent)
+
+    def _add_pass(self, indent: str) -> None:
+        # loops and ifs whose items are not checked still need a body
+        if not self.lines[-1].startswith(indent):
+            self.lines.append(f"{indent}pass")
+
+
+def _unwrap(hint: Any) -> Any:
+    if typing.get_origin(hint) is typing.Annotated:
+        return typing.get_args(hint)[0]
+    if isinstance(hint, typing.TypeVar):
+        return hint.__bound__ or Any
+    if hasattr(hint, "__supertype__"):
+        return _unwrap(hint.__supertype__)
+    return hint
+
+
+def _is_empty_tuple(hint: Any) -> bool:
+    if typing.get_origin(hint) is not tuple:
+        return False
+    args = typing.get_args(hint)
+    if args == ((),):
+        # `Tuple[()]` before python 3.11
+        return True
+    # from 3.11 `Tuple[()]` has no args, like the bare `Tuple` which has no `__args__`
+    return not args and getattr(hint, "__args__", None) == ()
+
+
+def _has_item_checks(origin: Any, args: Any) -> bool:
+    if not isinstance(origin, type) or not issubclass(origin, abc.Iterable):
+        return False
+    if issubclass(origin, tuple):
+        return bool(args)
+    return any(_unwrap(arg) not in ANY_TYPES for arg in args)
+
+
+@lru_cache(maxsize=None)
+def compile_type_check(hint: Any) -> Callable[[Any], bool]:
+    """
+    Compile a typing hint into a single function returning whether a value matches it.
+
+    Nested generics are checked with nested loops in the one generated function,
+    so each level of a structure is visited once. Supports classes, ``Any``, ``None``,
+    ``Union``, ``Optional``, ``X | Y``, ``Literal``, ``Annotated``, ``NewType``,
+    ``TypeVar`` bounds, fixed and variadic tuples, mappings and other generic collections.
+    The items of iterables that aren't collections, e.g. generators, are not checked
+    so they are not exhausted. Checks are memoized per hint.
+
+    Args:
+        hint (Any): The typing hint.
+
+    Returns:
+        Callable[[Any], bool]: The compiled check.
+
+    Raises:
+        TypeError: If the hint, or one of its arguments, can't be checked at runtime.
+    """
+    src = _CheckSrc()
+    src.lines.append("def check(value):")
+    src.add_check(hint, "value", "    ")
+    src.lines.append("    return True")
+    return compile_func("\n".join(src.lines), "check", src.namespace)
+
+
+def validate_type(hint: Any) -> Callable:
+    """
+    Validate that the value matches a typing hint, including the items of nested generics.
+
+    Args:
+        hint (Any): The typing hint, e.g. ``List[Dict[str, Optional[float]]]``.
+
+    Returns:
+        Callable: A validation function.
+
+    Raises:
+        TypeError: If the hint can't be checked at runtime.
+
+    Usage:
+        .. code-block:: python
+
+            @attrs.define
+            class Features:
+                rows: List[Dict[str, Optional[float]]] = attrs.field(
+                    validator=[validate_type(List[Dict[str, Optional[float]]])]
+                )
+    """
+    check = compile_type_check(hint)
+    if not _is_enabled_for_caller():
+        return disabled_validator
+    hint_name = _get_hint_name(hint)
+
+    def _(instance, attribute, value) -> None:
+        if not check(value):
+            raise TypeError(
+                f"{attribute.name} expecting {hint_name}, received {type(value)}."
+            )
+
+    return instrument(_, "validate_type")
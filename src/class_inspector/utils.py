@@ -1,19 +1,90 @@
 from __future__ import annotations
 
+import io
+import os
 import re
 import threading
+import tokenize
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
-from typing import Callable, Tuple, Union
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import black
 import isort
 import libcst as cst
 
+T = TypeVar("T")
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
 
 def get_src_code(path: str) -> str:
-    with open(path, "r") as f:
-        src_code = f.read()
-    return src_code
+    src_bytes = read_src_bytes(path)
+    src_code = src_bytes.decode(get_src_encoding(src_bytes))
+    return src_code.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_src_bytes(path: str) -> bytes:
+    # libcst only parses str or bytes, so mapping the file would still copy it
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def get_src_encoding(src_bytes: bytes) -> str:
+    # honours a utf-8 BOM and PEP 263 coding cookies, defaulting to utf-8
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(src_bytes).readline)
+    return encoding
+
+
+def prefetch(
+    func: Callable[[str], T], paths: Iterable[str], max_workers: int = 4
+) -> Iterator[Tuple[str, Future[T]]]:
+    """
+    Call ``func`` on each path in a thread pool, keeping ``max_workers`` calls
+    in flight ahead of the path being consumed.
+
+    Futures are yielded rather than results, so the caller can handle the error of
+    one path, e.g. an unreadable file, and carry on with the rest.
+
+    Args:
+        func (Callable[[str], T]): The function reading a path, e.g. ``get_src_code``.
+        paths (Iterable[str]): The paths, in the order their futures are yielded.
+        max_workers (int, optional): The number of calls in flight. Defaults to 4.
+
+    Returns:
+        Iterator[Tuple[str, Future[T]]]: Each path and the future of its result.
+    """
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            (path, executor.submit(func, path)) for path in islice(paths, max_workers)
+        )
+        while pending:
+            path, future = pending.popleft()
+            for next_path in islice(paths, 1):
+                pending.append((next_path, executor.submit(func, next_path)))
+            yield path, future
+
+
+def read_src_modules(
+    paths: Iterable[str], max_workers: int = 4
+) -> Iterator[Tuple[str, cst.Module]]:
+    # keep `max_workers` reads in flight while the current file is parsed
+    for path, future in prefetch(read_src_bytes, paths, max_workers):
+        yield path, cst.parse_module(future.result())
 
 
 def str_to_cst(code: str) -> cst.Module:
@@ -28,6 +99,100 @@ def format_code_str(code_snippet: str) -> str:
     return black.format_str(isort.code(code_snippet), mode=black.FileMode())
 
 
+def _get_diff_path(header: str) -> Optional[str]:
+    # "+++ b/pkg/mod.py", optionally followed by a tab and a timestamp
+    diff_path = header[4:].split("\t")[0].strip()
+    if diff_path == "/dev/null":
+        return None
+    if diff_path.startswith("b/"):
+        diff_path = diff_path[2:]
+    return diff_path
+
+
+def _is_same_file(diff_path: str, path: str) -> bool:
+    # diff paths are relative to the repository root, `path` may be absolute
+    diff_parts = Path(os.path.normpath(diff_path)).parts
+    parts = Path(os.path.normpath(os.path.abspath(path))).parts
+    return parts[-len(diff_parts) :] == diff_parts
+
+
+def get_changed_lines(diff: str, path: Optional[str] = None) -> Set[int]:
+    """
+    Get the line numbers a unified diff changes in the new version of a file.
+
+    Args:
+        diff (str): The diff, e.g. the output of ``git diff -U0``.
+        path (str, optional): The file to get the changed lines of when the diff covers
+            several files, matched against the ``+++`` file headers. Defaults to None.
+
+    Returns:
+        Set[int]: The added lines, and the lines left standing just above removals.
+
+    Raises:
+        ValueError: If the diff changes several files and ``path`` isn't given.
+    """
+    # hunks without a file header, e.g. a diff of one file's hunks, are keyed by ""
+    files: Dict[str, Set[int]] = {}
+    changed_lines = files.setdefault("", set())
+    old_remaining, new_remaining, new_line = 0, 0, 0
+    # removed lines not (yet) replaced by added lines
+    pending_removal = False
+
+    for line in diff.splitlines():
+        if not (old_remaining or new_remaining):
+            if line.startswith("+++ "):
+                diff_path = _get_diff_path(line)
+                # the lines of deleted files are not in any file
+                changed_lines = (
+                    set() if diff_path is None else files.setdefault(diff_path, set())
+                )
+                continue
+            hunk = HUNK_HEADER.match(line)
+            if hunk:
+                old_count, new_start, new_count = hunk.groups()
+                old_remaining = int(old_count) if old_count is not None else 1
+                new_remaining = int(new_count) if new_count is not None else 1
+                new_line = int(new_start)
+                # `+N,0` is a pure removal after line N, which is marked like the
+                # removals between context lines, as the line left standing above it
+                new_line += new_remaining == 0
+            continue
+
+        if line.startswith("+"):
+            changed_lines.add(new_line)
+            new_line += 1
+            new_remaining -= 1
+            pending_removal = False
+        elif line.startswith("-"):
+            old_remaining -= 1
+            # a removal replaced by added lines is marked by them, otherwise
+            # it touches the line left standing just above it
+            pending_removal = bool(new_remaining)
+            if not pending_removal:
+                changed_lines.add(max(new_line - 1, 1))
+        elif not line.startswith("\\"):
+            if pending_removal:
+                changed_lines.add(max(new_line - 1, 1))
+                pending_removal = False
+            new_line += 1
+            new_remaining -= 1
+            old_remaining -= 1
+
+    files = {diff_path: lines for diff_path, lines in files.items() if lines}
+    if path is not None:
+        files = {
+            diff_path: lines
+            for diff_path, lines in files.items()
+            if not diff_path or _is_same_file(diff_path, path)
+        }
+    elif len(files) > 1:
+        raise ValueError(
+            f"diff changes {len(files)} files, pass the path of the file to use: "
+            + ", ".join(sorted(files))
+        )
+    return set().union(*files.values())
+
+
 def is_dunder(item: str) -> bool:
     return item.startswith("__") and item.endswith("__")
 
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import abc
+from typing import Callable, Dict, Optional, Tuple
+
+import attrs
+
+STATS_ENV_VAR = "CLASS_INSPECTOR_VALIDATOR_STATS"
+
+# (class qualname, attribute name, validator name)
+StatsKey = Tuple[str, str, str]
+
+_enabled = os.environ.get(STATS_ENV_VAR, "0").lower() in ("1", "true", "on", "yes")
+_lock = threading.Lock()
+
+
+@attrs.define
+class ValidatorStats:
+    # no validators on the counters, attrs would run them on every update
+    calls: int = attrs.field(default=0)
+    n_items: int = attrs.field(default=0)
+    total_ns: int = attrs.field(default=0)
+    failures: int = attrs.field(default=0)
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+_stats: Dict[StatsKey, ValidatorStats] = {}
+
+
+def set_validator_stats_enabled(enabled: bool) -> None:
+    """
+    Enable or disable recording stats for validators created after the call.
+
+    Validators are only wrapped while enabled, so validators created while
+    disabled cost nothing extra. Defaults to the ``CLASS_INSPECTOR_VALIDATOR_STATS``
+    environment variable.
+
+    Args:
+        enabled (bool): Whether to record stats.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_validator_stats_enabled() -> bool:
+    return _enabled
+
+
+def instrument(validator: Callable, name: str, counts_items: bool = False) -> Callable:
+    """
+    Wrap a validator to record its calls, items checked, time and failures,
+    if stats are enabled.
+
+    Args:
+        validator (Callable): The validator.
+        name (str): The name to record the validator under, e.g. the factory name.
+        counts_items (bool, optional): Record ``len(value)`` items per call instead of 1.
+            Defaults to False.
+
+    Returns:
+        Callable: The wrapped validator, or ``validator`` itself if stats are disabled.
+    """
+    if not _enabled:
+        return validator
+
+    def _(instance, attribute, value) -> None:
+        key = (type(instance).__qualname__, attribute.name, name)
+        n_items = len(value) if counts_items and isinstance(value, abc.Sized) else 1
+        failed = False
+        start = time.perf_counter_ns()
+        try:
+            validator(instance, attribute, value)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            with _lock:
+                stats = _stats.get(key)
+                if stats is None:
+                    stats = _stats[key] = ValidatorStats()
+                stats.calls += 1
+                stats.n_items += n_items
+                stats.total_ns += elapsed
+                stats.failures += failed
+
+    return _
+
+
+def get_validator_stats() -> Dict[StatsKey, ValidatorStats]:
+    """
+    Get a snapshot of the recorded stats.
+
+    Returns:
+        Dict[StatsKey, ValidatorStats]: Copies of the stats keyed by
+            (class qualname, attribute name, validator name).
+    """
+    with _lock:
+        return {key: attrs.evolve(stats) for key, stats in _stats.items()}
+
+
+def reset_validator_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def validator_stats_report(sort_by: str = "total_ns", n: Optional[int] = None) -> str:
+    """
+    Format the recorded stats as a table, slowest validators first by default.
+
+    Args:
+        sort_by (str, optional): The ``ValidatorStats`` attribute to sort by. Defaults to "total_ns".
+        n (int, optional): The number of rows to show. Defaults to all.
+
+    Returns:
+        str: The report.
+    """
+    stats = sorted(
+        get_validator_stats().items(),
+        key=lambda item: getattr(item[1], sort_by),
+        reverse=True,
+    )[:n]
+    lines = [
+        f"{'validator':<60}{'calls':>10}{'items':>12}{'failures':>10}"
+        f"{'total ms':>12}{'mean us':>10}"
+    ]
+    for (cls_name, attr_name, name), stat in stats:
+        lines.append(
+            f"{f'{cls_name}.{attr_name} {name}':<60}{stat.calls:>10}{stat.n_items:>12}"
+            f"{stat.failures:>10}{stat.total_ns / 1e6:>12.3f}{stat.mean_ns / 1e3:>10.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+from contextlib import nullcontext as does_not_raise
+
+import attrs
+import numpy as np
+import pytest
+
+import class_inspector.array_validators as av
+
+
+@pytest.mark.parametrize(
+    "shape, pattern, expected_result",
+    [
+        pytest.param((2, 3), (2, 3), True, id="Ensure matches exact shapes"),
+        pytest.param((2, 3), (None, 3), True, id="Ensure None matches any size"),
+        pytest.param((2, 3), (2,), False, id="Ensure checks the number of dims"),
+        pytest.param((4, 2, 3), (..., 3), True, id="Ensure `...` matches leading dims"),
+        pytest.param((3,), (..., 3), True, id="Ensure `...` matches no dims"),
+        pytest.param((4, 2, 3), (4, ..., 3), True, id="Ensure `...` in the middle"),
+        pytest.param((3,), (4, ..., 3), False, id="Ensure `...` needs the other dims"),
+    ],
+)
+def test_is_shape_match(shape, pattern, expected_result):
+    assert av.is_shape_match(shape, pattern) is expected_result
+
+
+def read_only(arr):
+    arr.flags.writeable = False
+    return arr
+
+
+@pytest.mark.parametrize(
+    "kwargs, value, expected_context",
+    [
+        pytest.param(
+            {
+                "dtype_kind": "f",
+                "shape": (None, 3),
+                "c_contiguous": True,
+                "finite": True,
+            },
+            np.zeros((4, 3)),
+            does_not_raise(),
+            id="Ensure passes a valid array",
+        ),
+        pytest.param({}, [1.0], pytest.raises(TypeError), id="Ensure requires ndarray"),
+        pytest.param(
+            {"dtype_kind": "iu"},
+            np.zeros(3),
+            pytest.raises(TypeError, match="dtype kind"),
+            id="Ensure checks dtype kind",
+        ),
+        pytest.param(
+            {"shape": (None, 3)},
+            np.zeros((3, 2)),
+            pytest.raises(ValueError, match=r"shape \(\*, 3\)"),
+            id="Ensure checks shape",
+        ),
+        pytest.param(
+            {"c_contiguous": True},
+            np.zeros((3, 3)).T,
+            pytest.raises(ValueError, match="C contiguous"),
+            id="Ensure checks C contiguity",
+        ),
+        pytest.param(
+            {"f_contiguous": True},
+            np.zeros((3, 3)).T,
+            does_not_raise(),
+            id="Ensure checks Fortran contiguity",
+        ),
+        pytest.param(
+            {"writeable": True},
+            read_only(np.zeros(3)),
+            pytest.raises(ValueError, match="writeable"),
+            id="Ensure checks writeable",
+        ),
+        pytest.param(
+            {"no_nan": True},
+            np.array([1.0, np.inf]),
+            does_not_raise(),
+            id="Ensure `no_nan` allows inf",
+        ),
+        pytest.param(
+            {"no_nan": True},
+            np.array([1.0, np.nan]),
+            pytest.raises(ValueError, match="no NaN"),
+            id="Ensure `no_nan` finds NaN",
+        ),
+        pytest.param(
+            {"finite": True},
+            np.array([-np.inf, 1.0]),
+            pytest.raises(ValueError, match="finite"),
+            id="Ensure `finite` finds inf",
+        ),
+        pytest.param(
+            {"finite": True},
+            np.array([1 + 1j, complex(np.nan, 0)]),
+            pytest.raises(ValueError, match="finite"),
+            id="Ensure `finite` checks complex arrays",
+        ),
+        pytest.param(
+            {"finite": True},
+            np.array([], dtype=float),
+            does_not_raise(),
+            id="Ensure passes empty arrays",
+        ),
+        pytest.param(
+            {"finite": True},
+            np.array([1, 2]),
+            does_not_raise(),
+            id="Ensure skips value checks for int arrays",
+        ),
+    ],
+)
+def test_validate_ndarray(kwargs, value, expected_context):
+    @attrs.define
+    class TestClass:
+        attrib: np.ndarray = attrs.field(validator=[av.validate_ndarray(**kwargs)])
+
+    with expected_context:
+        TestClass(value)
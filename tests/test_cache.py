@@ -0,0 +1,74 @@
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.transform as tf
+from class_inspector.cache import MODULE_CACHE, ModuleCache, get_src_hash
+
+
+@pytest.mark.parametrize(
+    "max_bytes, operations, expected_result, expected_context",
+    [
+        pytest.param(
+            10,
+            [("a", 4), ("b", 4), ("c", 4)],
+            ["b", "c"],
+            does_not_raise(),
+            id="Ensure evicts oldest entry when over `max_bytes`",
+        ),
+        pytest.param(
+            10,
+            [("a", 4), ("b", 4), ("a", None), ("c", 4)],
+            ["a", "c"],
+            does_not_raise(),
+            id="Ensure evicts least recently used entry when oldest was read",
+        ),
+        pytest.param(
+            10,
+            [("a", 4), ("b", 11)],
+            ["a"],
+            does_not_raise(),
+            id="Ensure skips entries larger than `max_bytes`",
+        ),
+        pytest.param(
+            10,
+            [("a", 4), ("a", 6), ("b", 4)],
+            ["a", "b"],
+            does_not_raise(),
+            id="Ensure replaces the size of an existing key",
+        ),
+    ],
+)
+def test_module_cache(max_bytes, operations, expected_result, expected_context):
+    with expected_context:
+        cache = ModuleCache(max_bytes)
+        for key, size in operations:
+            if size is None:
+                cache.get(key)
+            else:
+                cache.put(key, key.upper(), size)
+
+        assert sorted(key for key in "abc" if key in cache) == expected_result
+        assert all(cache.get(key) == key.upper() for key in expected_result)
+        assert cache.curr_bytes <= max_bytes
+
+
+@pytest.mark.parametrize(
+    "src_code, expected_context",
+    [
+        pytest.param(
+            "def f(a: int):\n    return a\n",
+            does_not_raise(),
+            id="Ensure repeated operations share one parse",
+        ),
+    ],
+)
+def test_transform_reuses_cache(src_code, expected_context):
+    with expected_context:
+        MODULE_CACHE.clear()
+        tf.add_boilerplate_from_src(src_code, add_debugs=True)
+        tf.add_boilerplate_from_src(src_code, add_debugs=False, add_guards=True)
+        tf.get_parametrized_tests_from_src(src_code)
+
+        assert (get_src_hash(src_code), "formatted") in MODULE_CACHE
+        assert (MODULE_CACHE.misses, MODULE_CACHE.hits) == (1, 2)
@@ -0,0 +1,159 @@
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.transform as tf
+from class_inspector.func_selection import FuncSelector
+
+CALLER = "def main(path: str):\n    return _check(path)\n\n\n"
+CHECK = "def _check(path: str):\n    return path\n"
+
+
+@pytest.mark.parametrize(
+    "src_code, selector, expected_result, expected_context",
+    [
+        pytest.param(
+            CALLER + CHECK,
+            None,
+            {"_check"},
+            does_not_raise(),
+            id="Ensure elides a private callee",
+        ),
+        pytest.param(
+            "def main(path: str):\n    return _a(path)\n\n\n"
+            "def _a(path: str):\n    return _b(path)\n\n\n"
+            "def _b(path: str):\n    return path\n",
+            None,
+            {"_a", "_b"},
+            does_not_raise(),
+            id="Ensure elides a chain of private callees",
+        ),
+        pytest.param(
+            "def main(path: str):\n    return _check(path=path)\n\n\n" + CHECK,
+            None,
+            {"_check"},
+            does_not_raise(),
+            id="Ensure elides when passed by keyword",
+        ),
+        pytest.param(
+            CALLER.replace("path: str", "path: bytes") + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when the caller's annotation differs",
+        ),
+        pytest.param(
+            "def main(path: str):\n    path = path.strip()\n    return _check(path)\n\n\n"
+            + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when the caller reassigns the param",
+        ),
+        pytest.param(
+            "def main(path: str, paths: list):\n"
+            "    return [_check(path) for path in paths]\n\n\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when a comprehension shadows the param",
+        ),
+        pytest.param(
+            "def main(path: str):\n    return map(lambda path: _check(path), [1])\n\n\n"
+            + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when a lambda shadows the param",
+        ),
+        pytest.param(
+            "def main(path: str):\n    match path:\n        case [*path]:\n"
+            "            return _check(path)\n\n\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when a match capture shadows the param",
+        ),
+        pytest.param(
+            "def main(path: str):\n    def path():\n        pass\n\n"
+            "    return _check(path)\n\n\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when a nested def shadows the param",
+        ),
+        pytest.param(
+            "def main(path):\n    return _check(path)\n\n\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when the caller is not guarded",
+        ),
+        pytest.param(
+            CALLER + CHECK + "\n\n_check('a')\n",
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when called at module level",
+        ),
+        pytest.param(
+            CALLER + CHECK + "\n\nCHECKS = [_check]\n",
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when referenced other than by a call",
+        ),
+        pytest.param(
+            "def main(paths: str):\n    return _check(*paths)\n\n\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when called with star args",
+        ),
+        pytest.param(
+            CALLER + "@register\n" + CHECK,
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards of decorated functions",
+        ),
+        pytest.param(
+            CALLER + "def check(path: str):\n    return path\n",
+            None,
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards of public functions",
+        ),
+        pytest.param(
+            CALLER + CHECK,
+            FuncSelector(exclude=["main"]),
+            set(),
+            does_not_raise(),
+            id="Ensure keeps guards when the caller is not selected",
+        ),
+    ],
+)
+def test_get_elided_guards(src_code, selector, expected_result, expected_context):
+    with expected_context:
+        module, funcs = tf._parse_src(src_code)
+        assert tf.get_elided_guards(module, funcs, selector) == expected_result
+
+
+@pytest.mark.parametrize(
+    "sample_every, expected_result, expected_context",
+    [
+        pytest.param(1, 1, does_not_raise(), id="Ensure guards the entry point only"),
+        pytest.param(
+            10,
+            2,
+            does_not_raise(),
+            id="Ensure guards every function when sampling",
+        ),
+    ],
+)
+def test_add_boilerplate_elide_guards(sample_every, expected_result, expected_context):
+    with expected_context:
+        output = tf.add_boilerplate_from_src(
+            CALLER + CHECK, False, True, sample_every=sample_every, elide_guards=True
+        )
+        assert output.count("raise TypeError(") == expected_result
@@ -0,0 +1,353 @@
+import cProfile
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.cli as cli
+from class_inspector.utils import format_code_str
+
+SRC_CODE = "def f(a: int):\n    return a\n"
+TRANSFORMED_SRC_CODE = format_code_str(
+    "def f(a: int):\n    logger.debug(locals())\n    return a\n"
+)
+UNFORMATTED_SRC_CODE = "import os, sys\ndef f(a:int): return os, sys, a\n"
+SAMPLED_SRC_CODE = format_code_str(
+    "from class_inspector.instrumentation import sample_call\n\n\n"
+    "def f(a: int):\n    if sample_call(__name__, 'f', 5):\n"
+    "        logger.debug(locals())\n    return a\n"
+)
+TIMED_SRC_CODE = format_code_str(
+    "from time import perf_counter_ns\n\n"
+    "from class_inspector.instrumentation import record_timing\n\n\n"
+    "def f(a: int):\n    _ci_start_ns = perf_counter_ns()\n    try:\n        return a\n"
+    "    finally:\n"
+    '        record_timing(__name__, "f", perf_counter_ns() - _ci_start_ns)\n'
+)
+
+
+@pytest.fixture
+def src_files(tmp_path):
+    paths = []
+    for idx in range(3):
+        path = tmp_path / "pkg" / f"mod_{idx}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SRC_CODE)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize(
+    "args, expected_exit_code, expected_src_code, expected_context",
+    [
+        pytest.param(
+            ["--add-debugs"],
+            0,
+            TRANSFORMED_SRC_CODE,
+            does_not_raise(),
+            id="Ensure rewrites files in place",
+        ),
+        pytest.param(
+            ["--add-debugs", "--check"],
+            1,
+            SRC_CODE,
+            does_not_raise(),
+            id="Ensure exits 1 without writing when `--check` and files would change",
+        ),
+        pytest.param(
+            ["--add-debugs", "--diff", "--jobs", "2"],
+            0,
+            SRC_CODE,
+            does_not_raise(),
+            id="Ensure prints a diff without writing when `--diff`",
+        ),
+        pytest.param(
+            ["--add-timing"],
+            0,
+            TIMED_SRC_CODE,
+            does_not_raise(),
+            id="Ensure times each function when `--add-timing`",
+        ),
+        pytest.param(
+            ["--add-debugs", "--sample-every", "5"],
+            0,
+            SAMPLED_SRC_CODE,
+            does_not_raise(),
+            id="Ensure samples debugs when `--sample-every`",
+        ),
+        pytest.param(
+            ["--add-debugs", "--exclude", "f"],
+            0,
+            SRC_CODE,
+            does_not_raise(),
+            id="Ensure skips excluded functions when `--exclude`",
+        ),
+        pytest.param(
+            [],
+            0,
+            SRC_CODE,
+            does_not_raise(),
+            id="Ensure leaves files alone when no boilerplate is requested",
+        ),
+    ],
+)
+def test_main_boilerplate(
+    capsys,
+    tmp_path,
+    src_files,
+    args,
+    expected_exit_code,
+    expected_src_code,
+    expected_context,
+):
+    with expected_context:
+        exit_code = cli.main(
+            [
+                "boilerplate",
+                str(tmp_path / "pkg"),
+                "--cache-dir",
+                str(tmp_path / "cache"),
+                *args,
+            ]
+        )
+        assert exit_code == expected_exit_code
+        assert all(path.read_text() == expected_src_code for path in src_files)
+        if "--diff" in args:
+            assert capsys.readouterr().out.count("+    logger.debug(locals())") == 3
+
+
+@pytest.mark.parametrize(
+    "src_code, args, expected_exit_code, expected_src_code, expected_context",
+    [
+        pytest.param(
+            TIMED_SRC_CODE,
+            [],
+            0,
+            SRC_CODE,
+            does_not_raise(),
+            id="Ensure strips files in place",
+        ),
+        pytest.param(
+            TIMED_SRC_CODE,
+            ["--check", "--jobs", "2"],
+            1,
+            TIMED_SRC_CODE,
+            does_not_raise(),
+            id="Ensure exits 1 without writing when `--check` and files would change",
+        ),
+        pytest.param(
+            UNFORMATTED_SRC_CODE,
+            ["--check"],
+            0,
+            UNFORMATTED_SRC_CODE,
+            does_not_raise(),
+            id="Ensure files without boilerplate are not reformatted",
+        ),
+    ],
+)
+def test_main_strip(
+    tmp_path,
+    src_files,
+    src_code,
+    args,
+    expected_exit_code,
+    expected_src_code,
+    expected_context,
+):
+    with expected_context:
+        for path in src_files:
+            path.write_text(src_code)
+        exit_code = cli.main(["strip", str(tmp_path / "pkg"), "--no-cache", *args])
+        assert exit_code == expected_exit_code
+        assert all(path.read_text() == expected_src_code for path in src_files)
+
+
+@pytest.mark.parametrize(
+    "jobs, expected_context",
+    [
+        pytest.param(1, does_not_raise(), id="Ensure second run is served from cache"),
+        pytest.param(
+            2, does_not_raise(), id="Ensure cache is filled by parallel workers"
+        ),
+    ],
+)
+def test_process_paths_cache(tmp_path, src_files, jobs, expected_context):
+    with expected_context:
+        paths = [str(path) for path in src_files]
+        cache = cli.ResultCache(str(tmp_path / "cache"))
+        options = {"add_debugs": True, "add_guards": False}
+
+        first = cli.process_paths(paths, "boilerplate", options, jobs, cache)
+        second = cli.process_paths(paths, "boilerplate", options, jobs, cache)
+
+        assert [result.cached for result in first] == [False] * 3
+        assert [result.cached for result in second] == [True] * 3
+        assert [result.output for result in first] == [
+            result.output for result in second
+        ]
+
+
+@pytest.mark.parametrize(
+    "args, expected_context",
+    [
+        pytest.param(
+            ["--add-debugs", "--add-guards"],
+            does_not_raise(),
+            id="Ensure debugs and guards are not added twice",
+        ),
+        pytest.param(
+            ["--add-timing", "--add-guards", "--sample-every", "10"],
+            does_not_raise(),
+            id="Ensure timing and sampling gates are not added twice",
+        ),
+        pytest.param(
+            ["--add-guards", "--elide-guards"],
+            does_not_raise(),
+            id="Ensure elided guards are not added twice",
+        ),
+    ],
+)
+def test_main_boilerplate_rerun(tmp_path, src_files, args, expected_context):
+    with expected_context:
+        argv = [
+            "boilerplate",
+            str(tmp_path / "pkg"),
+            "--cache-dir",
+            str(tmp_path / "cache"),
+            *args,
+        ]
+        assert cli.main(argv) == 0
+        transformed = [path.read_text() for path in src_files]
+        mtimes = [path.stat().st_mtime_ns for path in src_files]
+
+        # the rewritten files are served from the cache and left alone
+        results = cli.process_paths(
+            [str(path) for path in src_files],
+            "boilerplate",
+            cli.get_options(cli.get_parser().parse_args(argv)),
+            cache=cli.ResultCache(str(tmp_path / "cache")),
+        )
+        assert [result.cached for result in results] == [True] * 3
+        assert not any(result.changed for result in results)
+
+        assert cli.main([*argv, "--no-cache"]) == 0
+        assert [path.read_text() for path in src_files] == transformed
+        assert [path.stat().st_mtime_ns for path in src_files] == mtimes
+
+
+@pytest.mark.parametrize(
+    "src_code, expected_exit_code, expected_output, expected_context",
+    [
+        pytest.param(
+            SRC_CODE,
+            0,
+            "def test_f(a, expected_result, expected_context):",
+            does_not_raise(),
+            id="Ensure prints tests",
+        ),
+        pytest.param(
+            "def f(:\n",
+            1,
+            "",
+            does_not_raise(),
+            id="Ensure exits 1 when a file does not parse",
+        ),
+    ],
+)
+def test_main_tests(
+    capsys, tmp_path, src_code, expected_exit_code, expected_output, expected_context
+):
+    path = tmp_path / "mod.py"
+    path.write_text(src_code)
+    with expected_context:
+        assert cli.main(["tests", str(path), "--no-cache", "-q"]) == expected_exit_code
+        assert expected_output in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "patterns, expected_result, expected_context",
+    [
+        pytest.param(
+            ["pkg"],
+            ["pkg/mod_0.py", "pkg/mod_1.py", "pkg/mod_2.py"],
+            does_not_raise(),
+            id="Ensure expands directories",
+        ),
+        pytest.param(
+            ["pkg/mod_[01].py", "pkg/mod_0.py"],
+            ["pkg/mod_0.py", "pkg/mod_1.py"],
+            does_not_raise(),
+            id="Ensure expands globs without duplicates",
+        ),
+    ],
+)
+def test_expand_paths(
+    monkeypatch, tmp_path, src_files, patterns, expected_result, expected_context
+):
+    monkeypatch.chdir(tmp_path)
+    with expected_context:
+        assert cli.expand_paths(patterns) == expected_result
+
+
+@pytest.mark.parametrize(
+    "transformed_idxs, expected_result, expected_context",
+    [
+        pytest.param(
+            [0], ("f",), does_not_raise(), id="Ensure ranks the transformed files"
+        ),
+        pytest.param(
+            [1], (), does_not_raise(), id="Ensure skips files not being transformed"
+        ),
+    ],
+)
+def test_get_selector_profile(
+    tmp_path, src_files, transformed_idxs, expected_result, expected_context
+):
+    namespace = {}
+    exec(compile(SRC_CODE, str(src_files[0]), "exec"), namespace)
+    profiler = cProfile.Profile()
+    profiler.runcall(lambda: [namespace["f"](idx) for idx in range(10)])
+    profile_path = tmp_path / "app.prof"
+    profiler.dump_stats(str(profile_path))
+
+    argv = [
+        "boilerplate",
+        *(str(src_files[idx]) for idx in transformed_idxs),
+        "--profile",
+        str(profile_path),
+        "--top-n",
+        "5",
+    ]
+    with expected_context:
+        selector = cli.get_selector(cli.get_parser().parse_args(argv))
+        assert selector.hot_names == expected_result
+
+
+@pytest.mark.parametrize(
+    "bad_src_bytes, expected_error, expected_context",
+    [
+        pytest.param(
+            None,
+            "FileNotFoundError",
+            does_not_raise(),
+            id="Ensure a missing file is reported on its own",
+        ),
+        pytest.param(
+            b"a = 1\nb = 2\nx = '\xff'\n",
+            "UnicodeDecodeError",
+            does_not_raise(),
+            id="Ensure a file invalid in its encoding is reported on its own",
+        ),
+    ],
+)
+def test_process_paths_bad_file(
+    tmp_path, src_files, bad_src_bytes, expected_error, expected_context
+):
+    bad_path = tmp_path / "bad.py"
+    if bad_src_bytes is not None:
+        bad_path.write_bytes(bad_src_bytes)
+    paths = [str(src_files[0]), str(bad_path), str(src_files[1])]
+    with expected_context:
+        results = cli.process_paths(paths, "boilerplate", {"add_debugs": True})
+        assert [result.path for result in results] == paths
+        assert results[1].error.startswith(expected_error)
+        assert [results[0].output, results[2].output] == [TRANSFORMED_SRC_CODE] * 2
@@ -1,3 +1,4 @@
+import types
 from collections import abc
 from contextlib import nullcontext as does_not_raise
 
@@ -5,7 +6,9 @@ import attr
 import numpy as np
 import pytest
 
+import class_inspector.custom_validators as cv
 from class_inspector.custom_validators import (
+    compile_generic_of_type,
     validate_bool_func,
     validate_collection,
     validate_collection_of_type,
@@ -180,6 +183,66 @@ def test_validate_generic_bool_func(gen_type, val_func, inputs, expectation):
         TestClass(inputs)
 
 
+class ListSubclass(list):
+    pass
+
+
+@pytest.mark.parametrize(
+    "generic_type, allowed_type, inputs, expectation",
+    [
+        (abc.Collection, int, [1, 2, 3], does_not_raise()),
+        (abc.Collection, int, [True, False], does_not_raise()),
+        (abc.Collection, int, [1, 2, "3"], pytest.raises(TypeError)),
+        (abc.Iterable, float, 0, pytest.raises(TypeError)),
+        (abc.Sequence, str, ListSubclass(["1", "2"]), does_not_raise()),
+        (abc.Sequence, str, {"1", "2"}, pytest.raises(TypeError)),
+        (abc.Sequence, (int, str), (1, "2"), does_not_raise()),
+        (abc.Sequence, (int, str), (1, 2.0), pytest.raises(TypeError)),
+        (list, int, (1, 2), pytest.raises(TypeError)),
+    ],
+)
+def test_compile_generic_of_type(generic_type, allowed_type, inputs, expectation):
+    @attr.define
+    class TestClass:
+        attrib: generic_type = attr.ib(
+            validator=[compile_generic_of_type(generic_type, allowed_type)]
+        )
+
+    with expectation:
+        TestClass(inputs)
+
+
+@pytest.mark.parametrize(
+    "generic_type, allowed_type, inputs",
+    [
+        (abc.Sequence, int, 0),
+        (abc.Sequence, int, [1, "2"]),
+        (abc.Iterable, float, [1.0, 2]),
+    ],
+)
+def test_compile_generic_of_type_matches_validate_generic_of_type(
+    generic_type, allowed_type, inputs
+):
+    errors = []
+    for val_func in (
+        validate_generic_of_type(generic_type, allowed_type),
+        compile_generic_of_type(generic_type, allowed_type),
+    ):
+
+        @attr.define
+        class TestClass:
+            attrib: generic_type = attr.ib(validator=[val_func])
+
+        with pytest.raises(TypeError) as exc_info:
+            TestClass(inputs)
+        errors.append(str(exc_info.value))
+
+    assert errors[0] == errors[1]
+    assert compile_generic_of_type(
+        generic_type, allowed_type
+    ) is compile_generic_of_type(generic_type, allowed_type)
+
+
 @pytest.mark.parametrize(
     "gen_type, val_func, inputs, expectation",
     [
@@ -330,3 +393,196 @@ def test_validate_sequence_of_type(gen_type, val_func, inputs, expectation):
 
     with expectation:
         TestClass(inputs)
+
+
+@pytest.fixture
+def validation_overrides(monkeypatch):
+    overrides = {}
+    monkeypatch.setattr(cv, "_validation_overrides", overrides)
+    monkeypatch.delenv(cv.VALIDATION_ENV_VAR, raising=False)
+    return overrides
+
+
+@pytest.mark.parametrize(
+    "overrides, env_var, module, expected_result",
+    [
+        pytest.param({}, None, "pkg.mod", True, id="Ensure enabled by default"),
+        pytest.param({}, "0", "pkg.mod", False, id="Ensure env var disables"),
+        pytest.param({None: False}, None, "pkg.mod", False, id="Ensure global setting"),
+        pytest.param(
+            {None: True}, "0", "pkg.mod", True, id="Ensure global setting beats env var"
+        ),
+        pytest.param(
+            {None: False, "pkg": True},
+            None,
+            "pkg.mod",
+            True,
+            id="Ensure parent package override beats global setting",
+        ),
+        pytest.param(
+            {"pkg": False, "pkg.mod": True},
+            None,
+            "pkg.mod",
+            True,
+            id="Ensure closest override wins",
+        ),
+        pytest.param(
+            {"pkg": False},
+            None,
+            "pkgs.mod",
+            True,
+            id="Ensure overrides only match whole module names",
+        ),
+    ],
+)
+def test_is_validation_enabled(
+    monkeypatch, validation_overrides, overrides, env_var, module, expected_result
+):
+    validation_overrides.update(overrides)
+    if env_var is not None:
+        monkeypatch.setenv(cv.VALIDATION_ENV_VAR, env_var)
+    assert cv.is_validation_enabled(module) == expected_result
+
+
+@pytest.mark.parametrize(
+    "factory, args",
+    [
+        pytest.param(validate_bool_func, (np.isnan,), id="Ensure disables bool func"),
+        pytest.param(validate_generic, (abc.Sequence,), id="Ensure disables generic"),
+        pytest.param(
+            validate_sequence_of_type, (int,), id="Ensure disables sequence of type"
+        ),
+        pytest.param(
+            compile_generic_of_type,
+            (abc.Sequence, int),
+            id="Ensure disables compiled validators",
+        ),
+    ],
+)
+def test_set_validation_enabled(validation_overrides, factory, args):
+    cv.set_validation_enabled(False, __name__)
+    assert factory(*args) is cv.disabled_validator
+
+    cv.set_validation_enabled(None, __name__)
+    assert factory(*args) is not cv.disabled_validator
+
+
+@pytest.mark.parametrize(
+    "converter, inputs, expected_items, expectation",
+    [
+        (
+            cv.lazy_iterable_of_type(int),
+            (i for i in range(3)),
+            [0, 1, 2],
+            does_not_raise(),
+        ),
+        (
+            cv.lazy_iterable_of_type(int),
+            iter([0, "1", 2]),
+            [0],
+            pytest.raises(TypeError),
+        ),
+        (cv.lazy_iterable_of_type(int), 0, [], pytest.raises(TypeError)),
+        (
+            cv.lazy_iterable_bool_func(lambda item: item > 0),
+            iter([1, 0]),
+            [1],
+            pytest.raises(ValueError),
+        ),
+    ],
+)
+def test_lazy_iterable(converter, inputs, expected_items, expectation):
+    @attr.define
+    class TestClass:
+        attrib: abc.Iterator = attr.ib(
+            converter=converter,
+            validator=[
+                validate_iterable_of_type(object),
+                validate_generic_bool_func(abc.Iterable, lambda item: True),
+            ],
+        )
+
+    consumed = []
+    with expectation:
+        for item in TestClass(inputs).attrib:
+            consumed.append(item)
+
+    assert consumed == expected_items
+
+
+@pytest.mark.parametrize(
+    "validator, inputs, expected_items, expectation",
+    [
+        (validate_iterable_of_type(int), iter([1, 2]), [1, 2], does_not_raise()),
+        (
+            validate_iterable_of_type(int),
+            iter([1, "a", 2]),
+            [1],
+            pytest.raises(TypeError, match="attrib expecting a iterable of int"),
+        ),
+        (
+            validate_generic_bool_func(abc.Iterable, lambda item: item > 0),
+            iter([1, 0]),
+            [1],
+            pytest.raises(ValueError, match="attrib does not pass"),
+        ),
+    ],
+)
+def test_lazy_iterable_chains_validators(
+    validator, inputs, expected_items, expectation
+):
+    # the converter accepts every item, the validator's check must still run
+    @attr.define
+    class TestClass:
+        attrib: abc.Iterator = attr.ib(
+            converter=cv.lazy_iterable_bool_func(lambda item: True),
+            validator=[validator],
+        )
+
+    consumed = []
+    with expectation:
+        for item in TestClass(inputs).attrib:
+            consumed.append(item)
+
+    assert consumed == expected_items
+
+
+def test_lazy_iterable_reports_index():
+    converter = cv.lazy_iterable_of_type(int, "rows")
+    with pytest.raises(
+        TypeError, match="rows expecting a iterable of int.* at index 2"
+    ):
+        list(converter(iter([0, 1, "2"])))
+
+
+@pytest.mark.parametrize(
+    "val_func, inputs, expectation",
+    [
+        (cv.validate_mapping, {"a": 1}, does_not_raise()),
+        (cv.validate_mapping, [("a", 1)], pytest.raises(TypeError)),
+        (cv.validate_mapping_of_type(str, int), {"a": 1, "b": True}, does_not_raise()),
+        (
+            cv.validate_mapping_of_type(str, (int, float)),
+            types.MappingProxyType({"a": 1, "b": 2.0}),
+            does_not_raise(),
+        ),
+        (
+            cv.validate_mapping_of_type(str, int),
+            {"a": 1, 2: 2},
+            pytest.raises(TypeError, match="received key of <class 'int'>"),
+        ),
+        (
+            cv.validate_mapping_of_type(str, int),
+            {"a": 1, "b": "2"},
+            pytest.raises(TypeError, match="received <class 'str'> for key 'b'"),
+        ),
+        (cv.validate_mapping_of_type(str, int), ["a"], pytest.raises(TypeError)),
+    ],
+)
+def test_validate_mapping(val_func, inputs, expectation):
+    @attr.define
+    class TestClass:
+        attrib: abc.Mapping = attr.ib(validator=[val_func])
+
+    with expectation:
+        TestClass(inputs)
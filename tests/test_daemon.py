@@ -0,0 +1,134 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.daemon as daemon
+from class_inspector.utils import format_code_str
+
+SRC_CODE = "def f(a: int):\n    return a\n"
+
+
+def _is_listening(socket_path):
+    try:
+        return daemon.request({"op": "ping"}, socket_path)["ok"]
+    except OSError:
+        return False
+
+
+@pytest.fixture
+def socket_path():
+    # unix socket paths are limited to ~100 characters so avoid the long `tmp_path`
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, "ci.sock")
+        server = threading.Thread(target=daemon.serve, args=(socket_path,))
+        server.start()
+        # the socket file exists from bind, wait until the server is listening too
+        while not _is_listening(socket_path):
+            time.sleep(0.01)
+
+        yield socket_path
+
+        daemon.request({"op": "shutdown"}, socket_path)
+        server.join(timeout=5)
+
+
+@pytest.mark.parametrize(
+    "payload, expected_result, expected_context",
+    [
+        pytest.param(
+            {"op": "ping"},
+            {"ok": True, "pid": os.getpid()},
+            does_not_raise(),
+            id="Ensure responds to `ping`",
+        ),
+        pytest.param(
+            {"op": "transform", "src_code": SRC_CODE, "options": {"add_debugs": True}},
+            {
+                "ok": True,
+                "output": format_code_str(
+                    "def f(a: int):\n    logger.debug(locals())\n    return a\n"
+                ),
+                "error": "",
+            },
+            does_not_raise(),
+            id="Ensure returns transformed code when given `src_code`",
+        ),
+        pytest.param(
+            {"op": "transform", "src_code": "def f(:\n"},
+            {"ok": False},
+            does_not_raise(),
+            id="Ensure reports errors without stopping the daemon",
+        ),
+        pytest.param(
+            {"op": "run", "argv": ["daemon"]},
+            {"ok": False},
+            does_not_raise(),
+            id="Ensure refuses to start a nested daemon",
+        ),
+        pytest.param(
+            {"op": "unknown"},
+            {"ok": False, "error": "unknown op: unknown"},
+            does_not_raise(),
+            id="Ensure rejects unknown ops",
+        ),
+    ],
+)
+def test_request(socket_path, payload, expected_result, expected_context):
+    with expected_context:
+        response = daemon.request(payload, socket_path)
+        assert {key: response[key] for key in expected_result} == expected_result
+
+
+def test_client_main(monkeypatch, capsys, tmp_path, socket_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SRC_CODE)
+    monkeypatch.setenv("CLASS_INSPECTOR_SOCKET", socket_path)
+
+    exit_code = daemon.client_main(["tests", str(path), "--no-cache", "-q"])
+
+    assert exit_code == 0
+    assert "def test_f(" in capsys.readouterr().out
+
+
+def test_client_main_without_daemon(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text(SRC_CODE)
+    monkeypatch.setenv("CLASS_INSPECTOR_SOCKET", str(tmp_path / "missing.sock"))
+
+    exit_code = daemon.client_main(["tests", str(path), "--no-cache", "-q"])
+
+    assert exit_code == 0
+    assert "def test_f(" in capsys.readouterr().out
+
+
+def test_serve_refuses_running_daemon(socket_path):
+    with pytest.raises(FileExistsError):
+        daemon.serve(socket_path)
+    # the running daemon is left listening
+    assert daemon.request({"op": "ping"}, socket_path)["ok"]
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_request_refuses_socket_of_another_user(socket_path, monkeypatch):
+    monkeypatch.setattr(daemon.os, "getuid", lambda: os.stat(socket_path).st_uid + 1)
+    with pytest.raises(PermissionError):
+        daemon.request({"op": "ping"}, socket_path)
+
+
+def test_get_default_socket_path_private_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(daemon.tempfile, "gettempdir", lambda: str(tmp_path))
+    socket_dir = os.path.dirname(daemon.get_default_socket_path())
+    assert os.path.dirname(socket_dir) == str(tmp_path)
+
+    daemon._make_private_dir(socket_dir)
+    assert stat.S_IMODE(os.stat(socket_dir).st_mode) == 0o700
+    # a directory squatted by another user is not used
+    monkeypatch.setattr(daemon.os, "getuid", lambda: os.stat(socket_dir).st_uid + 1)
+    with pytest.raises(PermissionError):
+        daemon._make_private_dir(socket_dir)
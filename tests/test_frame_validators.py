@@ -0,0 +1,97 @@
+from contextlib import nullcontext as does_not_raise
+
+import attrs
+import numpy as np
+import pandas as pd
+import pytest
+
+import class_inspector.frame_validators as fv
+
+
+def is_positive(col):
+    return col > 0
+
+
+def make_df():
+    return pd.DataFrame(
+        {"id": [1, 2, 3], "price": [1.0, 2.0, 3.0], "name": ["a", "b", None]},
+        index=pd.date_range("2024-01-01", periods=3),
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, value, expected_context",
+    [
+        pytest.param(
+            {
+                "columns": ["id", "name"],
+                "dtypes": {"id": "int64"},
+                "dtype_kinds": {"price": "f"},
+                "index_type": pd.DatetimeIndex,
+                "non_null": ["price"],
+                "predicates": {"price": is_positive},
+            },
+            make_df(),
+            does_not_raise(),
+            id="Ensure passes a valid frame",
+        ),
+        pytest.param(
+            {}, {"id": [1]}, pytest.raises(TypeError), id="Ensure requires a DataFrame"
+        ),
+        pytest.param(
+            {"columns": ["id", "qty"], "non_null": ["other"]},
+            make_df(),
+            pytest.raises(ValueError, match=r"missing columns \['qty', 'other'\]"),
+            id="Ensure lists every missing column",
+        ),
+        pytest.param(
+            {"dtypes": {"id": "float64"}},
+            make_df(),
+            pytest.raises(TypeError, match="'id' of dtype float64"),
+            id="Ensure checks exact dtypes",
+        ),
+        pytest.param(
+            {"dtype_kinds": {"price": "iu"}},
+            make_df(),
+            pytest.raises(TypeError, match="dtype kind"),
+            id="Ensure checks dtype kinds",
+        ),
+        pytest.param(
+            {"index_type": pd.RangeIndex},
+            make_df(),
+            pytest.raises(TypeError, match="index of RangeIndex"),
+            id="Ensure checks the index type",
+        ),
+        pytest.param(
+            {"non_null": ["name"]},
+            make_df(),
+            pytest.raises(ValueError, match="received 1"),
+            id="Ensure counts nulls",
+        ),
+        pytest.param(
+            {"predicates": {"price": lambda col: col < 2}},
+            make_df(),
+            pytest.raises(ValueError, match="2 rows failed, first at index Timestamp"),
+            id="Ensure reports rows failing predicates",
+        ),
+        pytest.param(
+            {"predicates": {"name": lambda col: col.str.len() == 1}},
+            make_df(),
+            pytest.raises(ValueError, match="1 rows failed"),
+            id="Ensure treats missing predicate results as failures",
+        ),
+        pytest.param(
+            {"predicates": {"id": lambda col: np.asarray(col) > 0}},
+            make_df(),
+            does_not_raise(),
+            id="Ensure accepts predicates returning arrays",
+        ),
+    ],
+)
+def test_validate_dataframe(kwargs, value, expected_context):
+    @attrs.define
+    class TestClass:
+        attrib: pd.DataFrame = attrs.field(validator=[fv.validate_dataframe(**kwargs)])
+
+    with expected_context:
+        TestClass(value)
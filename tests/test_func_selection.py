@@ -0,0 +1,189 @@
+import cProfile
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.transform as tf
+from class_inspector.data_structures import FuncDetails
+from class_inspector.func_selection import FuncSelector, load_profile
+from class_inspector.utils import format_code_str
+
+
+@pytest.mark.parametrize(
+    "selector, qualname, decorators, expected_result, expected_context",
+    [
+        pytest.param(
+            FuncSelector(),
+            "A.f",
+            [],
+            True,
+            does_not_raise(),
+            id="Ensure selects all by default",
+        ),
+        pytest.param(
+            FuncSelector(include=["A.*"]),
+            "B.f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure skips names not matching `include`",
+        ),
+        pytest.param(
+            FuncSelector(include=["A.*"], exclude=["*.f"]),
+            "A.f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure `exclude` wins over `include`",
+        ),
+        pytest.param(
+            FuncSelector(include_decorators=["app.*"]),
+            "f",
+            ["staticmethod", "app.route"],
+            True,
+            does_not_raise(),
+            id="Ensure selects decorators matching `include_decorators`",
+        ),
+        pytest.param(
+            FuncSelector(include_decorators=["app.*"]),
+            "f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure skips undecorated functions when `include_decorators`",
+        ),
+        pytest.param(
+            FuncSelector(exclude_decorators=["functools.lru_cache"]),
+            "f",
+            ["functools.lru_cache"],
+            False,
+            does_not_raise(),
+            id="Ensure skips decorators matching `exclude_decorators`",
+        ),
+        pytest.param(
+            FuncSelector(skip_private=True),
+            "_Helper.f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure skips methods of private classes when `skip_private`",
+        ),
+        pytest.param(
+            FuncSelector(skip_private=True),
+            "f.<locals>.__call__",
+            [],
+            True,
+            does_not_raise(),
+            id="Ensure dunders are not private when `skip_private`",
+        ),
+        pytest.param(
+            FuncSelector(hot_names=["g"]),
+            "A.f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure skips names not in `hot_names`",
+        ),
+        pytest.param(
+            FuncSelector(skip_names=["f"]),
+            "A.f",
+            [],
+            False,
+            does_not_raise(),
+            id="Ensure skips names in `skip_names`",
+        ),
+    ],
+)
+def test_is_selected(selector, qualname, decorators, expected_result, expected_context):
+    with expected_context:
+        func = FuncDetails(qualname.rsplit(".", 1)[-1], decorators=decorators)
+        assert selector.is_selected(qualname, func) == expected_result
+
+
+def hot_helper(x):
+    return x + 1
+
+
+def slow_caller():
+    return sum(hot_helper(x) for x in range(20_000))
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    profiler = cProfile.Profile()
+    profiler.runcall(slow_caller)
+    path = tmp_path / "profile.prof"
+    profiler.dump_stats(str(path))
+    return str(path)
+
+
+def test_load_profile(profile_path):
+    entries, total_time = load_profile(profile_path)
+    assert entries["hot_helper"].calls == 20_000
+    assert entries["slow_caller"].cumtime >= entries["hot_helper"].cumtime
+    assert total_time > 0
+    # builtins, e.g. sum, and generator expressions can't be instrumented
+    assert sorted(entries) == ["hot_helper", "slow_caller"]
+    assert load_profile(profile_path, [__file__])[0].keys() == entries.keys()
+    assert load_profile(profile_path, ["other.py"])[0] == {}
+
+
+@pytest.mark.parametrize(
+    "top_n, max_call_rate, expected_result, expected_context",
+    [
+        pytest.param(
+            1,
+            None,
+            [False, True],
+            does_not_raise(),
+            id="Ensure selects the hottest function when `top_n` is 1",
+        ),
+        pytest.param(
+            None,
+            10_000.0,
+            [False, True],
+            does_not_raise(),
+            id="Ensure skips frequently called functions when `max_call_rate` is given",
+        ),
+        pytest.param(
+            2,
+            None,
+            [True, True],
+            does_not_raise(),
+            id="Ensure only ranks functions that can be instrumented",
+        ),
+        pytest.param(
+            None,
+            None,
+            [True, True],
+            does_not_raise(),
+            id="Ensure selects all functions without `top_n` or `max_call_rate`",
+        ),
+    ],
+)
+def test_from_profile(
+    profile_path, top_n, max_call_rate, expected_result, expected_context
+):
+    with expected_context:
+        selector = FuncSelector.from_profile(profile_path, top_n, max_call_rate)
+        assert [
+            selector.is_selected(name, FuncDetails(name))
+            for name in ["hot_helper", "slow_caller"]
+        ] == expected_result
+
+
+def test_add_boilerplate_selector():
+    src_code = (
+        "import functools\n\n\nclass A:\n    @staticmethod\n    def f(a: int):\n"
+        "        return a\n\n    def _g(self, a: int):\n        return a\n\n\n"
+        "@functools.lru_cache(maxsize=None)\ndef h(a: int):\n    return a\n"
+    )
+    selector = FuncSelector(
+        exclude_decorators=["functools.lru_cache"], skip_private=True
+    )
+    assert tf.add_boilerplate_from_src(src_code, selector=selector) == format_code_str(
+        "import functools\n\n\nclass A:\n    @staticmethod\n    def f(a: int):\n"
+        "        logger.debug(locals())\n        return a\n\n"
+        "    def _g(self, a: int):\n        return a\n\n\n"
+        "@functools.lru_cache(maxsize=None)\ndef h(a: int):\n    return a\n"
+    )
@@ -0,0 +1,237 @@
+from collections import abc
+from contextlib import nullcontext as does_not_raise
+
+import attrs
+import pytest
+from attrs.validators import disabled, instance_of, optional
+
+import class_inspector.custom_validators as cv
+from class_inspector.custom_validators import (
+    validate_bool_func,
+    validate_generic_of_type,
+    validate_iterable,
+    validate_sequence_of_type,
+)
+from class_inspector.fused_validators import VALIDATOR_KEY, define_fused
+
+
+def is_positive(value):
+    return value > 0
+
+
+def make_classes():
+    classes = []
+    for decorator in (attrs.define, define_fused):
+
+        @decorator
+        class Record:
+            name: str = attrs.field(validator=[instance_of(str)])
+            count: int = attrs.field(
+                validator=[instance_of(int), validate_bool_func(is_positive)]
+            )
+            values: list = attrs.field(validator=[validate_sequence_of_type(int)])
+            tags: set = attrs.field(validator=[validate_generic_of_type(abc.Set, str)])
+            items: list = attrs.field(validator=[validate_iterable])
+            config: dict = attrs.field(
+                factory=dict, validator=[cv.validate_mapping_of_type(str, int)]
+            )
+            note: str = attrs.field(default=None, validator=optional(instance_of(str)))
+
+        classes.append(Record)
+    return classes
+
+
+VALID_ARGS = ("a", 1, [1, 2], {"b"}, [])
+
+
+@pytest.mark.parametrize(
+    "args, expected_context",
+    [
+        pytest.param(VALID_ARGS, does_not_raise(), id="Ensure passes valid args"),
+        pytest.param(
+            ("a", 1, [1, 2], {"b"}, [], {"c": 1}, "c"),
+            does_not_raise(),
+            id="Ensure passes `optional` fields that are set",
+        ),
+        pytest.param(
+            (1, 1, [1], {"b"}, []),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for `instance_of`",
+        ),
+        pytest.param(
+            ("a", 0, [1], {"b"}, []),
+            pytest.raises(ValueError),
+            id="Ensure calls validators that can't be inlined",
+        ),
+        pytest.param(
+            ("a", 1, [1, "2"], {"b"}, []),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for items of the wrong type",
+        ),
+        pytest.param(
+            ("a", 1, [1], ["b"], []),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for the wrong generic type",
+        ),
+        pytest.param(
+            ("a", 1, [1], {"b"}, 0),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for validators without arguments",
+        ),
+        pytest.param(
+            ("a", 1, [1], {"b"}, [], {"c": "1"}),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for mapping values of the wrong type",
+        ),
+        pytest.param(
+            ("a", 1, [1], {"b"}, [], {}, 1),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for `optional` fields that are set",
+        ),
+    ],
+)
+def test_define_fused_matches_define(args, expected_context):
+    errors = []
+    for cls in make_classes():
+        with expected_context as exc_info:
+            cls(*args)
+        # the attribute in the error args differs, it no longer holds the validator
+        errors.append(None if exc_info is None else exc_info.value.args[0])
+
+    assert errors[0] == errors[1]
+
+
+@pytest.mark.parametrize(
+    "kwargs, value, expected_context",
+    [
+        pytest.param({}, 1, does_not_raise(), id="Ensure assignments are allowed"),
+        pytest.param(
+            {}, "1", pytest.raises(TypeError), id="Ensure assignments are validated"
+        ),
+        pytest.param(
+            {"on_setattr": attrs.setters.NO_OP},
+            "1",
+            does_not_raise(),
+            id="Ensure respects `on_setattr`",
+        ),
+        pytest.param(
+            {"frozen": True},
+            1,
+            pytest.raises(attrs.exceptions.FrozenInstanceError),
+            id="Ensure supports frozen classes",
+        ),
+    ],
+)
+def test_define_fused_on_setattr(kwargs, value, expected_context):
+    @define_fused(**kwargs)
+    class Record:
+        count: int = attrs.field(validator=[instance_of(int)])
+
+    record = Record(0)
+    with expected_context:
+        record.count = value
+
+
+def test_define_fused_keeps_post_init():
+    @define_fused
+    class Record:
+        count: int = attrs.field(validator=[instance_of(int)])
+        double: int = attrs.field(init=False, default=0)
+
+        def __attrs_post_init__(self):
+            self.double = self.count * 2
+
+    assert Record(2).double == 4
+    assert attrs.fields(Record).count.validator is None
+    assert attrs.fields(Record).count.metadata[VALIDATOR_KEY] is not None
+    with pytest.raises(TypeError):
+        Record("2")
+
+
+def test_define_fused_validates_inherited_fields():
+    @define_fused
+    class Base:
+        count: int = attrs.field(validator=[instance_of(int)])
+
+    @define_fused
+    class Child(Base):
+        name: str = attrs.field(validator=[instance_of(str)])
+
+    Child(1, "a")
+    with pytest.raises(TypeError, match="count"):
+        Child("1", "a")
+    with pytest.raises(TypeError, match="name"):
+        Child(1, 1)
+
+
+def test_define_fused_respects_disabled():
+    @define_fused
+    class Record:
+        count: int = attrs.field(validator=[instance_of(int)])
+
+    with disabled():
+        record = Record("1")
+        record.count = "2"
+    assert record.count == "2"
+
+
+def test_define_fused_drops_disabled_validators(monkeypatch):
+    monkeypatch.setattr(cv, "_validation_overrides", {})
+    cv.set_validation_enabled(False, __name__)
+
+    @define_fused
+    class Record:
+        count: int = attrs.field(validator=[instance_of(int)])
+        values: list = attrs.field(validator=[validate_sequence_of_type(int)])
+
+    assert not hasattr(Record, "__attrs_post_init__")
+    record = Record("1", ["2"])
+    record.count = "3"
+
+    cv.set_validation_enabled(True, __name__)
+
+    @define_fused
+    class Child(Record):
+        pass
+
+    with pytest.raises(TypeError):
+        Child("1", [2])
+
+
+def test_define_fused_does_not_consume_streams():
+    @define_fused
+    class Stream:
+        rows: abc.Iterator = attrs.field(
+            converter=cv.lazy_iterable_of_type(int),
+            validator=[cv.validate_iterable_of_type(int)],
+        )
+
+    assert list(Stream(iter([1, 2])).rows) == [1, 2]
+    with pytest.raises(TypeError):
+        list(Stream(iter([1, "2"])).rows)
+
+
+def test_define_fused_chains_stream_checks():
+    @define_fused
+    class Stream:
+        rows: abc.Iterator = attrs.field(
+            converter=cv.lazy_iterable_bool_func(lambda item: True),
+            validator=[cv.validate_iterable_of_type(int)],
+        )
+
+    assert list(Stream(iter([1, 2])).rows) == [1, 2]
+    with pytest.raises(TypeError, match="rows expecting a iterable of int"):
+        list(Stream(iter(["a", "b"])).rows)
+
+
+def test_define_fused_skips_unset_fields():
+    @define_fused(on_setattr=attrs.setters.validate)
+    class Record:
+        x: int = attrs.field(validator=[instance_of(int)])
+        y: int = attrs.field(init=False, validator=[instance_of(int)])
+
+    record = Record(1)
+    assert not hasattr(record, "y")
+    record.y = 2
+    with pytest.raises(TypeError):
+        record.y = "2"
@@ -0,0 +1,142 @@
+import json
+import threading
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.instrumentation as inst
+import class_inspector.transform as tf
+import mock_package.transformed.src.mock_module_guards_timing as mock_module_guards_timing
+
+
+@pytest.fixture(autouse=True)
+def reset_timings():
+    inst.reset_timings()
+    yield
+    inst.reset_timings()
+
+
+@pytest.mark.parametrize(
+    "elapsed_ns, expected_result, expected_context",
+    [
+        pytest.param(0, 0, does_not_raise(), id="Ensure 0ns is in the first bucket"),
+        pytest.param(
+            1_023, 10, does_not_raise(), id="Ensure bounds are exclusive upper bounds"
+        ),
+        pytest.param(
+            1_024, 11, does_not_raise(), id="Ensure a bound is in the next bucket"
+        ),
+        pytest.param(10**11, 37, does_not_raise(), id="Ensure slow calls are bucketed"),
+    ],
+)
+def test_record_timing(elapsed_ns, expected_result, expected_context):
+    with expected_context:
+        inst.record_timing("mod", "f", elapsed_ns)
+        histogram = inst.get_timings()["mod.f"]
+        assert histogram.counts.index(1) == expected_result
+        assert (histogram.calls, histogram.total_ns) == (1, elapsed_ns)
+
+
+def test_record_timing_merges_threads():
+    def record():
+        for _ in range(1000):
+            inst.record_timing("mod", "f", 2_000)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    histogram = inst.get_timings()["mod.f"]
+    assert (histogram.calls, histogram.total_ns, histogram.mean_ns) == (
+        4000,
+        8_000_000,
+        2_000,
+    )
+
+
+def test_quantile():
+    for elapsed_ns in [500] * 90 + [30_000] * 9 + [10**11]:
+        inst.record_timing("mod", "f", elapsed_ns)
+    histogram = inst.get_timings()["mod.f"]
+    assert histogram.quantile(0.5) == 512
+    assert histogram.quantile(0.95) == 32_768
+    assert histogram.quantile(1) == 2**37
+    assert inst.TimingHistogram("empty").quantile(0.5) == 0
+
+
+def test_transformed_functions_are_timed():
+    mock_module_guards_timing.mock_function(1.0, 2, True)
+    mock_module_guards_timing.MockClass().mock_method(1, "a")
+    with pytest.raises(TypeError):
+        mock_module_guards_timing.mock_function(1, 2, True)
+
+    timings = inst.get_timings()
+    module = mock_module_guards_timing.__name__
+    assert timings[f"{module}.mock_function"].calls == 2
+    assert timings[f"{module}.MockClass.mock_method"].calls == 1
+
+
+def test_dump_and_export_timings(tmp_path):
+    inst.record_timing("mod", "f", 2_000)
+    path = tmp_path / "timings.json"
+    inst.export_timings(str(path))
+
+    dumped = json.loads(path.read_text())
+    assert dumped == inst.dump_timings()
+    assert dumped["bucket_bounds_ns"] == list(inst.BUCKET_BOUNDS_NS)
+    assert dumped["functions"]["mod.f"]["calls"] == 1
+    assert dumped["functions"]["mod.f"]["p50_ns"] == 2_048
+
+
+def test_timings_report():
+    inst.record_timing("mod", "fast", 1_000)
+    inst.record_timing("mod", "slow", 1_000_000)
+    lines = inst.timings_report().splitlines()
+    assert lines[0].startswith("function")
+    assert [line.split()[0] for line in lines[1:]] == ["mod.slow", "mod.fast"]
+    assert len(inst.timings_report(n=1).splitlines()) == 2
+
+
+def test_sample_call():
+    sampled = [inst.sample_call("mod", "sampled", 3) for _ in range(7)]
+    assert sampled == [True, False, False, True, False, False, True]
+
+
+def test_sample_call_counts_per_thread():
+    sampled = []
+    thread = threading.Thread(
+        target=lambda: sampled.append(inst.sample_call("mod", "per_thread", 100))
+    )
+    inst.sample_call("mod", "per_thread", 100)
+    thread.start()
+    thread.join()
+    assert sampled == [True]
+
+
+def test_take_token(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(inst.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(inst, "_buckets", {})
+
+    # a second's worth of tokens to start with
+    assert [inst.take_token("mod", "f", 2) for _ in range(3)] == [True, True, False]
+    now[0] = 0.5
+    assert [inst.take_token("mod", "f", 2) for _ in range(2)] == [True, False]
+    now[0] = 100.0
+    assert [inst.take_token("mod", "f", 2) for _ in range(3)] == [True, True, False]
+    # slow rates still allow one call
+    assert [inst.take_token("mod", "slow", 0.1) for _ in range(2)] == [True, False]
+
+
+def test_sampled_guards_run_on_sampled_calls():
+    src_code = tf.add_boilerplate_from_src(
+        "def f(a: int):\n    return a\n", False, True, sample_every=2
+    )
+    namespace = {"__name__": "sampled_guards"}
+    exec(src_code, namespace)
+
+    with pytest.raises(TypeError):
+        namespace["f"]("first call is checked")
+    assert namespace["f"]("second call is not") == "second call is not"
@@ -0,0 +1,115 @@
+import array
+from contextlib import nullcontext as does_not_raise
+
+import attrs
+import numpy as np
+import pytest
+
+import class_inspector.parallel_validators as pv
+
+
+@pytest.mark.parametrize(
+    "value, expected_result",
+    [
+        pytest.param(np.arange(3.0), np.float64, id="Ensure returns numpy dtype"),
+        pytest.param(
+            np.array([1, "a"], dtype=object), None, id="Ensure skips object arrays"
+        ),
+        pytest.param(np.zeros((2, 2)), None, id="Ensure skips nd arrays"),
+        pytest.param(array.array("q", [1, 2]), int, id="Ensure maps array typecodes"),
+        pytest.param([1, 2], None, id="Ensure skips lists"),
+    ],
+)
+def test_get_item_type(value, expected_result):
+    assert pv.get_item_type(value) == expected_result
+
+
+@pytest.mark.parametrize(
+    "free_threaded, allowed_type, value, expected_context",
+    [
+        pytest.param(
+            False,
+            int,
+            list(range(10)),
+            does_not_raise(),
+            id="Ensure passes sequentially",
+        ),
+        pytest.param(
+            True, int, list(range(10)), does_not_raise(), id="Ensure passes in parallel"
+        ),
+        pytest.param(
+            False,
+            int,
+            [*range(9), "9"],
+            pytest.raises(TypeError, match="received <class 'str'>"),
+            id="Ensure raises `TypeError` sequentially",
+        ),
+        pytest.param(
+            True,
+            int,
+            [*range(9), "9"],
+            pytest.raises(TypeError, match="received <class 'str'>"),
+            id="Ensure raises `TypeError` in the last chunk",
+        ),
+        pytest.param(
+            True,
+            int,
+            [1.0, *range(8), "9"],
+            pytest.raises(TypeError, match="received <class 'float'>"),
+            id="Ensure reports the first invalid item",
+        ),
+        pytest.param(
+            True,
+            int,
+            {*range(9), "9"},
+            pytest.raises(TypeError),
+            id="Ensure checks collections that can't be chunked",
+        ),
+        pytest.param(
+            False,
+            float,
+            np.arange(10.0),
+            does_not_raise(),
+            id="Ensure passes numpy arrays of the allowed type",
+        ),
+        pytest.param(
+            False,
+            int,
+            np.arange(10.0),
+            pytest.raises(TypeError, match="numpy.float64"),
+            id="Ensure raises `TypeError` for numpy arrays of the wrong type",
+        ),
+        pytest.param(
+            False,
+            int,
+            np.array([], dtype=float),
+            does_not_raise(),
+            id="Ensure passes empty arrays",
+        ),
+        pytest.param(
+            False,
+            int,
+            0,
+            pytest.raises(TypeError, match="Collection"),
+            id="Ensure raises `TypeError` if not a collection",
+        ),
+    ],
+)
+def test_validate_large_collection_of_type(
+    monkeypatch, free_threaded, allowed_type, value, expected_context
+):
+    monkeypatch.setattr(pv, "FREE_THREADED", free_threaded)
+    monkeypatch.setattr(pv, "MIN_CHUNK_SIZE", 3)
+
+    @attrs.define
+    class TestClass:
+        attrib: list = attrs.field(
+            validator=[
+                pv.validate_large_collection_of_type(
+                    allowed_type, threshold=5, max_workers=2
+                )
+            ]
+        )
+
+    with expected_context:
+        TestClass(value)
@@ -0,0 +1,181 @@
+import asyncio
+from contextlib import nullcontext as does_not_raise
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
+
+import class_inspector.runtime_guards as rg
+import mock_package.transformed.src.mock_module_guards as mock_module_guards
+from mock_package.original import mock_module
+
+
+@pytest.mark.parametrize(
+    "hint, expected_result, expected_context",
+    [
+        pytest.param(int, int, does_not_raise(), id="Ensure returns simple type"),
+        pytest.param(List[int], list, does_not_raise(), id="Ensure returns outer type"),
+        pytest.param(
+            Optional[int],
+            (int, type(None)),
+            does_not_raise(),
+            id="Ensure adds `NoneType` when `hint` is `Optional`",
+        ),
+        pytest.param(
+            Union[int, Optional[str]],
+            (int, str, type(None)),
+            does_not_raise(),
+            id="Ensure flattens nested unions",
+        ),
+        pytest.param(
+            Dict[str, Any],
+            dict,
+            does_not_raise(),
+            id="Ensure ignores inner types of containers",
+        ),
+        pytest.param(Any, None, does_not_raise(), id="Ensure skips `Any`"),
+        pytest.param(
+            Optional[Any],
+            None,
+            does_not_raise(),
+            id="Ensure skips unions containing unchecked types",
+        ),
+    ],
+)
+def test_get_runtime_isinstance_type(hint, expected_result, expected_context):
+    with expected_context:
+        assert rg.get_runtime_isinstance_type(hint) == expected_result
+
+
+@pytest.mark.parametrize(
+    "func_name, args, expected_context",
+    [
+        pytest.param(
+            "mock_function",
+            (1.0, 2, True),
+            does_not_raise(),
+            id="Ensure passes through valid args",
+        ),
+        pytest.param(
+            "mock_function",
+            (1.0, 2, True, 3),
+            pytest.raises(TypeError),
+            id="Ensure checks args given for defaulted params",
+        ),
+        pytest.param(
+            "mock_function_with_optional",
+            (True, "a"),
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` if given wrong type for `Optional`",
+        ),
+    ],
+)
+def test_guard_matches_source_guards(func_name, args, expected_context):
+    with expected_context as exc_info:
+        res = rg.guard(getattr(mock_module, func_name))(*args)
+        assert res == getattr(mock_module, func_name)(*args)
+
+    if exc_info is not None:
+        # `NoneType` is not a builtin so the source guards are given it here
+        mock_module_guards.NoneType = type(None)
+        with pytest.raises(TypeError) as src_exc_info:
+            getattr(mock_module_guards, func_name)(*args)
+        assert str(exc_info.value) == str(src_exc_info.value)
+
+
+def test_guard_signature():
+    def func(a: int, /, b: str = "b", *args: int, c: float = 1.0, **kwargs: Any):
+        return a, b, args, c, kwargs
+
+    guarded = rg.guard(func)
+
+    assert guarded(1, "x", 2, 3, c=2.0, d=4) == (1, "x", (2, 3), 2.0, {"d": 4})
+    assert guarded(1) == (1, "b", (), 1.0, {})
+    assert guarded.__wrapped__ is func
+    with pytest.raises(TypeError, match=r"expects arg types: \[int, str, float\]"):
+        guarded(1, c="2")
+
+
+def test_guard_returns_unannotated_func():
+    def func(a, b):
+        return a, b
+
+    assert rg.guard(func) is func
+
+
+def test_guard_async():
+    @rg.guard
+    async def func(a: int) -> int:
+        return a
+
+    assert asyncio.run(func(1)) == 1
+    with pytest.raises(TypeError):
+        asyncio.run(func("1"))
+
+
+def test_guard_deferred_forward_reference():
+    @rg.guard
+    def func(a: "NotYetDefined") -> None:  # noqa: F821
+        return a
+
+    globals()["NotYetDefined"] = int
+    try:
+        assert func(1) == 1
+        with pytest.raises(TypeError):
+            func("1")
+    finally:
+        del globals()["NotYetDefined"]
+
+
+def test_guard_class():
+    @rg.guard_class
+    class Guarded:
+        def __init__(self, a: int):
+            self.a = a
+
+        def method(self, other: "Guarded") -> int:
+            return self.a + other.a
+
+        @staticmethod
+        def static(a: str) -> str:
+            return a
+
+        @classmethod
+        def create(cls, a: int) -> "Guarded":
+            return cls(a)
+
+    guarded = Guarded.create(1)
+    assert guarded.method(Guarded(2)) == 3
+    assert Guarded("dunders are not guarded").a == "dunders are not guarded"
+    assert Guarded.static("a") == "a"
+    with pytest.raises(TypeError, match="method expects arg types: \\[Guarded\\]"):
+        guarded.method(1)
+    with pytest.raises(TypeError):
+        Guarded.static(1)
+    with pytest.raises(TypeError):
+        Guarded.create("1")
+
+
+def test_guard_class_deferred_forward_reference():
+    @rg.guard_class
+    class Guarded:
+        def method(self, a: "DefinedLater") -> int:  # noqa: F821
+            return a
+
+    # the class is passed as localns, module globals must still resolve
+    globals()["DefinedLater"] = int
+    try:
+        assert Guarded().method(1) == 1
+        with pytest.raises(TypeError):
+            Guarded().method("1")
+    finally:
+        del globals()["DefinedLater"]
+
+
+def test_guard_params_shadowing_builtins():
+    @rg.guard
+    def func(type: str, isinstance: int) -> str:
+        return type * isinstance
+
+    assert func("a", 2) == "aa"
+    with pytest.raises(TypeError, match="func expects arg types: \\[str, int\\]"):
+        func(1, 1)
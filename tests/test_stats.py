@@ -0,0 +1,113 @@
+import sys
+import tracemalloc
+from contextlib import nullcontext as does_not_raise
+
+import pytest
+
+import class_inspector.transform as tf
+from class_inspector._logger import get_dir_path
+from class_inspector.cache import MODULE_CACHE
+from class_inspector.stats import PipelineStats, profile_file
+
+MOCK_MODULE_PATH = get_dir_path(__file__, 1, "mock_package/original/mock_module.py")
+
+
+@pytest.mark.parametrize(
+    "stage_names, expected_result, expected_context",
+    [
+        pytest.param(
+            ["parse", "visit", "parse"],
+            {"parse": 2, "visit": 1},
+            does_not_raise(),
+            id="Ensure calls accumulate per stage name",
+        ),
+    ],
+)
+def test_pipeline_stats_stage(stage_names, expected_result, expected_context):
+    with expected_context:
+        stats = PipelineStats()
+        for name in stage_names:
+            with stats.stage(name):
+                sum(range(1000))
+
+        assert {
+            name: stage.calls for name, stage in stats.stages.items()
+        } == expected_result
+        assert stats.wall_time > 0
+        assert "total" in stats.report()
+
+
+@pytest.mark.parametrize(
+    "func, args, expected_result, expected_context",
+    [
+        pytest.param(
+            tf.add_boilerplate_from_path,
+            (MOCK_MODULE_PATH, True, True),
+            ["read", "format_input", "parse", "visit", "transform", "format_output"],
+            does_not_raise(),
+            id="Ensure records each stage of `add_boilerplate_from_path`",
+        ),
+        pytest.param(
+            tf.get_parametrized_tests_from_path,
+            (MOCK_MODULE_PATH, True, False, {14}),
+            ["read", "parse", "visit", "get_tests"],
+            does_not_raise(),
+            id="Ensure records each stage of a diff aware `get_parametrized_tests`",
+        ),
+    ],
+)
+def test_transform_stats(func, args, expected_result, expected_context):
+    with expected_context:
+        MODULE_CACHE.clear()
+        stats = PipelineStats()
+        func(*args, stats=stats)
+
+        assert list(stats.stages) == expected_result
+        assert stats.path == MOCK_MODULE_PATH
+        assert stats.n_bytes > 0 and stats.n_nodes > 0 and stats.n_funcs > 0
+
+        cached_stats = PipelineStats()
+        func(*args, stats=cached_stats)
+        assert cached_stats.cache_hits == 1
+        assert "parse" not in cached_stats.stages
+
+
+@pytest.mark.parametrize(
+    "func, expected_context",
+    [
+        pytest.param(
+            tf.add_boilerplate_from_path,
+            does_not_raise(),
+            id="Ensure profiles `add_boilerplate_from_path`",
+        ),
+    ],
+)
+def test_profile_file(func, expected_context):
+    with expected_context:
+        report = profile_file(func, MOCK_MODULE_PATH, add_guards=True)
+
+        assert report.result == tf.add_boilerplate_from_path(
+            MOCK_MODULE_PATH, add_guards=True
+        )
+        assert report.peak_bytes > 0
+        assert report.top_allocations
+        assert "function calls" in report.report()
+
+
+@pytest.mark.parametrize(
+    "was_tracing, expected_context",
+    [
+        pytest.param(False, does_not_raise(), id="Ensure stops the tracing it started"),
+        pytest.param(True, does_not_raise(), id="Ensure keeps the caller's tracing"),
+    ],
+)
+def test_profile_file_cleans_up_on_error(tmp_path, was_tracing, expected_context):
+    if was_tracing:
+        tracemalloc.start()
+    try:
+        with pytest.raises(FileNotFoundError):
+            profile_file(tf.add_boilerplate_from_path, str(tmp_path / "missing.py"))
+        assert sys.getprofile() is None
+        assert tracemalloc.is_tracing() == was_tracing
+    finally:
+        tracemalloc.stop()
@@ -1,12 +1,18 @@
 import inspect
+import re
 from contextlib import nullcontext as does_not_raise
 
 import pytest
 
 import class_inspector.transform as tf
+import mock_package.original.mock_call_chain as mock_call_chain
 import mock_package.original.mock_module as mock_module
+import mock_package.original.mock_utils_c as mock_utils_c
+import mock_package.transformed.src.mock_call_chain_guards_elided as mock_call_chain_guards_elided
 import mock_package.transformed.src.mock_module_debugs_guards as mock_module_debugs_guards
 import mock_package.transformed.src.mock_module_guards as mock_module_guards
+import mock_package.transformed.src.mock_module_guards_timing as mock_module_guards_timing
+from class_inspector._logger import get_dir_path
 from class_inspector.utils import format_code_str
 
 
@@ -40,6 +46,157 @@ def test_add_boilerplate(
         ) == format_code_str(expected_result)
 
 
+@pytest.mark.parametrize(
+    "src_code, add_guards, expected_result, expected_context",
+    [
+        pytest.param(
+            inspect.getsource(mock_module),
+            True,
+            inspect.getsource(mock_module_guards_timing),
+            does_not_raise(),
+            id="Ensure guards are timed with the body when `add_guards` is True",
+        ),
+        pytest.param(
+            '"""doc"""\nfrom __future__ import annotations\n\n\n'
+            "class A:\n    def f(self):\n        def g():\n            return 1\n\n"
+            "        return g()\n\n\ndef gen(a):\n    yield a\n",
+            False,
+            '"""doc"""\nfrom __future__ import annotations\n\n'
+            "from time import perf_counter_ns\n\n"
+            "from class_inspector.instrumentation import record_timing\n\n\n"
+            "class A:\n    def f(self):\n        _ci_start_ns = perf_counter_ns()\n"
+            "        try:\n\n            def g():\n"
+            "                _ci_start_ns = perf_counter_ns()\n                try:\n"
+            "                    return 1\n                finally:\n"
+            "                    record_timing(\n"
+            '                        __name__, "A.f.<locals>.g", perf_counter_ns() - _ci_start_ns\n'
+            "                    )\n\n            return g()\n        finally:\n"
+            '            record_timing(__name__, "A.f", perf_counter_ns() - _ci_start_ns)\n\n\n'
+            "def gen(a):\n    yield a\n",
+            does_not_raise(),
+            id="Ensure qualified names are used and generators are not timed",
+        ),
+        pytest.param(
+            "def f():\n    yield 1\n",
+            False,
+            "def f():\n    yield 1\n",
+            does_not_raise(),
+            id="Ensure no timing imports when no functions are timed",
+        ),
+    ],
+)
+def test_add_boilerplate_timing(
+    src_code, add_guards, expected_result, expected_context
+):
+    with expected_context:
+        assert tf.add_boilerplate_from_src(
+            src_code, False, add_guards, add_timing=True
+        ) == format_code_str(expected_result)
+
+
+SAMPLED_SRC_CODE = "def f(a: int):\n    return a\n"
+
+
+@pytest.mark.parametrize(
+    "add_debugs, sample_every, rate_limit, expected_result, expected_context",
+    [
+        pytest.param(
+            True,
+            10,
+            None,
+            "from class_inspector.instrumentation import sample_call\n\n\n"
+            "def f(a: int):\n    if sample_call(__name__, 'f', 10):\n"
+            "        logger.debug(locals())\n"
+            "        if not all([isinstance(a, int)]):\n            raise TypeError(\n"
+            '                "f expects arg types: [int], " f"received: [{type(a).__name__}]"\n'
+            "            )\n    return a\n",
+            does_not_raise(),
+            id="Ensure debugs and guards are sampled when `sample_every` is 10",
+        ),
+        pytest.param(
+            False,
+            10,
+            2.5,
+            "from class_inspector.instrumentation import sample_call, take_token\n\n\n"
+            "def f(a: int):\n"
+            "    if sample_call(__name__, 'f', 10) and take_token(__name__, 'f', 2.5):\n"
+            "        if not all([isinstance(a, int)]):\n            raise TypeError(\n"
+            '                "f expects arg types: [int], " f"received: [{type(a).__name__}]"\n'
+            "            )\n    return a\n",
+            does_not_raise(),
+            id="Ensure sampled calls are rate limited when `rate_limit` is given",
+        ),
+        pytest.param(
+            False,
+            1,
+            None,
+            "def f(a: int):\n    if not all([isinstance(a, int)]):\n"
+            "        raise TypeError(\n"
+            '            "f expects arg types: [int], " f"received: [{type(a).__name__}]"\n'
+            "        )\n    return a\n",
+            does_not_raise(),
+            id="Ensure no gate when `sample_every` is 1",
+        ),
+        pytest.param(
+            False,
+            0,
+            None,
+            None,
+            pytest.raises(ValueError),
+            id="Ensure raises `ValueError` when `sample_every` is 0",
+        ),
+        pytest.param(
+            False,
+            1,
+            0.0,
+            None,
+            pytest.raises(ValueError),
+            id="Ensure raises `ValueError` when `rate_limit` is 0",
+        ),
+    ],
+)
+def test_add_boilerplate_sampled(
+    add_debugs, sample_every, rate_limit, expected_result, expected_context
+):
+    with expected_context:
+        assert tf.add_boilerplate_from_src(
+            SAMPLED_SRC_CODE,
+            add_debugs,
+            True,
+            sample_every=sample_every,
+            rate_limit=rate_limit,
+        ) == format_code_str(expected_result)
+
+
+def test_add_boilerplate_elide_guards():
+    assert tf.add_boilerplate(
+        mock_call_chain, False, True, elide_guards=True
+    ) == format_code_str(inspect.getsource(mock_call_chain_guards_elided))
+
+
+@pytest.mark.parametrize(
+    "obj, expected_result, expected_context",
+    [
+        pytest.param(
+            mock_utils_c.read_data,
+            "FileNotFoundError",
+            does_not_raise(),
+            id="Ensure records exceptions raised without calling them",
+        ),
+        pytest.param(
+            mock_utils_c,
+            "FileNotFoundError",
+            does_not_raise(),
+            id="Ensure modules with bare raises can be transformed",
+        ),
+    ],
+)
+def test_get_parametrized_tests_raise_names(obj, expected_result, expected_context):
+    with expected_context:
+        tf.add_boilerplate(obj, False, True)
+        assert f"pytest.raises({expected_result})" in tf.get_parametrized_tests(obj)
+
+
 @pytest.mark.parametrize(
     "obj, test_raises, raises_arg_types, expected_result_fixture_name, expected_context",
     [
@@ -66,3 +223,288 @@ def test_get_parametrized_tests(
         assert format_code_str(
             tf.get_parametrized_tests(obj, test_raises, raises_arg_types)
         ) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "obj, changed_lines, expected_result, expected_context",
+    [
+        pytest.param(
+            mock_module,
+            {14},
+            ["test_mock_function"],
+            does_not_raise(),
+            id="Ensure only tests touched function when `changed_lines` is a set",
+        ),
+        pytest.param(
+            mock_module,
+            "@@ -8 +8 @@ class MockClass:\n-        return a + b\n+        return str(a) + b\n"
+            "@@ -44,0 +45 @@ def mock_func_with_lambda_and_raises(a: int, b: bool):\n"
+            "+    if b:\n",
+            ["test_mock_method", "test_mock_func_with_lambda_and_raises"],
+            does_not_raise(),
+            id="Ensure tests each touched function when `changed_lines` is a diff",
+        ),
+        pytest.param(
+            mock_module,
+            {1, 2, 3},
+            [],
+            does_not_raise(),
+            id="Ensure no tests when `changed_lines` is outside any function",
+        ),
+        pytest.param(
+            mock_module.mock_function,
+            {12},
+            ["test_mock_function"],
+            does_not_raise(),
+            id="Ensure line numbers are file relative when `obj` is a function",
+        ),
+    ],
+)
+def test_get_parametrized_tests_changed_lines(
+    obj, changed_lines, expected_result, expected_context
+):
+    with expected_context:
+        tests = tf.get_parametrized_tests(obj, changed_lines=changed_lines)
+        assert re.findall(r"def (test_\w+)\(", tests) == expected_result
+
+
+MOCK_MODULE_PATH = get_dir_path(__file__, 1, "mock_package/original/mock_module.py")
+# changes line 5 of other.py and line 2 of pkg/mod.py
+MULTI_FILE_DIFF = (
+    "diff --git a/other.py b/other.py\n--- a/other.py\n+++ b/other.py\n"
+    "@@ -5 +5 @@\n-x = 1\n+x = 2\n"
+    "diff --git a/pkg/mod.py b/pkg/mod.py\n--- a/pkg/mod.py\n+++ b/pkg/mod.py\n"
+    "@@ -2 +2 @@ def f(a):\n-    return 1\n+    return a\n"
+)
+
+
+@pytest.mark.parametrize(
+    "path, add_debugs, add_guards, expected_result, expected_context",
+    [
+        pytest.param(
+            MOCK_MODULE_PATH,
+            True,
+            True,
+            inspect.getsource(mock_module_debugs_guards),
+            does_not_raise(),
+            id="Ensure matches module transform when `path` is the module file",
+        ),
+        pytest.param(
+            "does_not_exist.py",
+            True,
+            False,
+            None,
+            pytest.raises(FileNotFoundError),
+            id="Ensure raises `FileNotFoundError` if `path` does not exist",
+        ),
+    ],
+)
+def test_add_boilerplate_from_path(
+    path, add_debugs, add_guards, expected_result, expected_context
+):
+    with expected_context:
+        assert format_code_str(
+            tf.add_boilerplate_from_path(path, add_debugs, add_guards)
+        ) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "src_code, expected_result, expected_context",
+    [
+        pytest.param(
+            "import not_an_installed_package\n\n\ndef f(a: int):\n    return a\n",
+            "import not_an_installed_package\n\n\ndef f(a: int):\n"
+            "    logger.debug(locals())\n    return a\n",
+            does_not_raise(),
+            id="Ensure target imports are never executed when given `src_code`",
+        ),
+    ],
+)
+def test_add_boilerplate_from_src(src_code, expected_result, expected_context):
+    with expected_context:
+        assert tf.add_boilerplate_from_src(src_code) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "obj, add_debugs, add_guards, add_timing, expected_result, expected_context",
+    [
+        pytest.param(
+            mock_module_debugs_guards,
+            True,
+            True,
+            False,
+            inspect.getsource(mock_module_debugs_guards),
+            does_not_raise(),
+            id="Ensure debugs and guards are not added twice",
+        ),
+        pytest.param(
+            mock_module_guards_timing,
+            False,
+            True,
+            True,
+            inspect.getsource(mock_module_guards_timing),
+            does_not_raise(),
+            id="Ensure timing and its imports are not added twice",
+        ),
+        pytest.param(
+            mock_module_guards_timing,
+            True,
+            True,
+            False,
+            inspect.getsource(mock_module_debugs_guards),
+            does_not_raise(),
+            id="Ensure existing boilerplate is replaced when the options change",
+        ),
+    ],
+)
+def test_add_boilerplate_rerun(
+    obj, add_debugs, add_guards, add_timing, expected_result, expected_context
+):
+    with expected_context:
+        assert tf.add_boilerplate(
+            obj, add_debugs, add_guards, add_timing
+        ) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "obj, expected_result, expected_context",
+    [
+        pytest.param(
+            mock_module_debugs_guards,
+            inspect.getsource(mock_module),
+            does_not_raise(),
+            id="Ensure removes debugs and guards",
+        ),
+        pytest.param(
+            mock_module_guards_timing,
+            inspect.getsource(mock_module),
+            does_not_raise(),
+            id="Ensure removes timing and its imports",
+        ),
+        pytest.param(
+            mock_module,
+            inspect.getsource(mock_module),
+            does_not_raise(),
+            id="Ensure leaves code without boilerplate unchanged",
+        ),
+    ],
+)
+def test_strip_boilerplate(obj, expected_result, expected_context):
+    with expected_context:
+        assert tf.strip_boilerplate(obj) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "src_code, expected_result, expected_context",
+    [
+        pytest.param(
+            tf.add_boilerplate_from_src(
+                "from class_inspector.instrumentation import get_timings\n\n\n"
+                "def f(a: int):\n    return get_timings()\n",
+                True,
+                True,
+                True,
+                10,
+                2.0,
+            ),
+            "from class_inspector.instrumentation import get_timings\n\n\n"
+            "def f(a: int):\n    return get_timings()\n",
+            does_not_raise(),
+            id="Ensure removes sampling gates and keeps imports still in use",
+        ),
+        pytest.param(
+            "def f(a: int):\n    a += 1\n    logger.debug(locals())\n    return a\n",
+            "def f(a: int):\n    a += 1\n    logger.debug(locals())\n    return a\n",
+            does_not_raise(),
+            id="Ensure keeps debugs after the start of the function",
+        ),
+        pytest.param(
+            "def f(a: int):\n    if not all([isinstance(a, int)]):\n"
+            '        raise TypeError("a must be an int")\n    return a\n',
+            "def f(a: int):\n    if not all([isinstance(a, int)]):\n"
+            '        raise TypeError("a must be an int")\n    return a\n',
+            does_not_raise(),
+            id="Ensure keeps hand written guards",
+        ),
+        pytest.param(
+            "from time import perf_counter_ns\n\n\ndef f(a: int):\n"
+            "    _ci_start_ns = perf_counter_ns()\n    try:\n        return a\n"
+            "    except ValueError:\n        return None\n    finally:\n"
+            "        record_timing(__name__, 'f', perf_counter_ns() - _ci_start_ns)\n",
+            "from time import perf_counter_ns\n\n\ndef f(a: int):\n"
+            "    _ci_start_ns = perf_counter_ns()\n    try:\n        return a\n"
+            "    except ValueError:\n        return None\n    finally:\n"
+            "        record_timing(__name__, 'f', perf_counter_ns() - _ci_start_ns)\n",
+            does_not_raise(),
+            id="Ensure keeps try blocks with handlers",
+        ),
+    ],
+)
+def test_strip_boilerplate_from_src(src_code, expected_result, expected_context):
+    with expected_context:
+        # source without boilerplate is returned as is, without being reformatted
+        if expected_result != src_code:
+            expected_result = format_code_str(expected_result)
+        assert tf.strip_boilerplate_from_src(src_code) == expected_result
+
+
+@pytest.mark.parametrize(
+    "path, changed_lines, expected_result_fixture_name, expected_context",
+    [
+        pytest.param(
+            MOCK_MODULE_PATH,
+            None,
+            "get_fixture_test_mock_module",
+            does_not_raise(),
+            id="Ensure matches module tests when `path` is the module file",
+        ),
+    ],
+)
+def test_get_parametrized_tests_from_path(
+    request, path, changed_lines, expected_result_fixture_name, expected_context
+):
+    with expected_context:
+        expected_result = request.getfixturevalue(expected_result_fixture_name)
+        assert format_code_str(
+            tf.get_parametrized_tests_from_path(path, changed_lines=changed_lines)
+        ) == format_code_str(expected_result)
+
+
+@pytest.mark.parametrize(
+    "src_code, changed_lines, expected_result, expected_context",
+    [
+        pytest.param(
+            "import not_an_installed_package\n\n\ndef f(a):\n    return a\n\n\n"
+            "def g(b):\n    return b\n",
+            {9},
+            ["test_g"],
+            does_not_raise(),
+            id="Ensure only touched functions when given `src_code` and `changed_lines`",
+        ),
+        pytest.param(
+            "def f(a):\n    return a\n",
+            MULTI_FILE_DIFF,
+            None,
+            pytest.raises(ValueError, match="diff changes 2 files"),
+            id="Ensure raises `ValueError` when the diff changes several files",
+        ),
+    ],
+)
+def test_get_parametrized_tests_from_src(
+    src_code, changed_lines, expected_result, expected_context
+):
+    with expected_context:
+        tests = tf.get_parametrized_tests_from_src(
+            src_code, changed_lines=changed_lines
+        )
+        assert re.findall(r"def (test_\w+)\(", tests) == expected_result
+
+
+def test_get_parametrized_tests_from_path_multi_file_diff(tmp_path):
+    path = tmp_path / "pkg" / "mod.py"
+    path.parent.mkdir()
+    path.write_text("def f(a):\n    return a\n\n\ndef g(b):\n    return b\n")
+    tests = tf.get_parametrized_tests_from_path(
+        str(path), changed_lines=MULTI_FILE_DIFF
+    )
+    assert re.findall(r"def (test_\w+)\(", tests) == ["test_f"]
@@ -0,0 +1,133 @@
+import sys
+from contextlib import nullcontext as does_not_raise
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    NewType,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import attrs
+import pytest
+
+import class_inspector.type_validators as tv
+
+# `X | Y` is a syntax error before python 3.10
+INT_OR_STR = eval("int | str") if sys.version_info >= (3, 10) else Union[int, str]
+UserId = NewType("UserId", int)
+Number = TypeVar("Number", bound=float)
+
+
+@pytest.mark.parametrize(
+    "hint, value, expected_result",
+    [
+        pytest.param(int, True, True, id="Ensure accepts subclasses"),
+        pytest.param(Any, object(), True, id="Ensure accepts anything for `Any`"),
+        pytest.param(None, None, True, id="Ensure checks `None`"),
+        pytest.param(Optional[int], None, True, id="Ensure checks `Optional`"),
+        pytest.param(INT_OR_STR, 1.0, False, id="Ensure checks `X | Y` unions"),
+        pytest.param(Literal["a", 1], "a", True, id="Ensure accepts literal values"),
+        pytest.param(
+            Literal["a", 1], True, False, id="Ensure compares literal types too"
+        ),
+        pytest.param(Literal["a"], ["a"], False, id="Ensure handles unhashables"),
+        pytest.param(List[int], [1, "2"], False, id="Ensure checks list items"),
+        pytest.param(List[Any], [1, "2"], True, id="Ensure skips `Any` items"),
+        pytest.param(Dict[str, int], {"a": 1}, True, id="Ensure checks mappings"),
+        pytest.param(
+            Dict[str, int], {"a": "1"}, False, id="Ensure checks mapping values"
+        ),
+        pytest.param(Tuple[int, ...], (1, 2, 3), True, id="Ensure variadic tuples"),
+        pytest.param(Tuple[int, str], (1, 2), False, id="Ensure fixed tuple items"),
+        pytest.param(Tuple[int, str], (1,), False, id="Ensure fixed tuple length"),
+        pytest.param(Tuple[()], (), True, id="Ensure accepts the empty tuple"),
+        pytest.param(Tuple[()], (1,), False, id="Ensure empty tuple length"),
+        pytest.param(Tuple, (1,), True, id="Ensure bare tuples of any length"),
+        pytest.param(
+            List[Tuple[()]], [(), (1,)], False, id="Ensure nested empty tuple length"
+        ),
+        pytest.param(
+            List[Dict[str, Optional[float]]],
+            [{"a": 1.0, "b": None}, {}],
+            True,
+            id="Ensure accepts nested generics",
+        ),
+        pytest.param(
+            List[Dict[str, Optional[float]]],
+            [{"a": 1.0}, {"b": 1}],
+            False,
+            id="Ensure checks deeply nested items",
+        ),
+        pytest.param(
+            Union[List[int], Dict[str, int]],
+            {"a": 1},
+            True,
+            id="Ensure checks unions of several generics",
+        ),
+        pytest.param(
+            Union[List[int], Dict[str, int]],
+            ["a"],
+            False,
+            id="Ensure rejects unions of several generics",
+        ),
+        pytest.param(
+            Iterable[int],
+            (item for item in "ab"),
+            True,
+            id="Ensure does not consume iterators",
+        ),
+        pytest.param(Annotated[int, "meta"], "1", False, id="Ensure unwraps Annotated"),
+        pytest.param(UserId, 1, True, id="Ensure unwraps NewType"),
+        pytest.param(Number, 1, False, id="Ensure uses TypeVar bounds"),
+    ],
+)
+def test_compile_type_check(hint, value, expected_result):
+    assert tv.compile_type_check(hint)(value) is expected_result
+
+
+@pytest.mark.parametrize(
+    "hint, expected_context",
+    [
+        pytest.param(List[int], does_not_raise(), id="Ensure compiles typing hints"),
+        pytest.param(
+            List["int"],
+            pytest.raises(TypeError),
+            id="Ensure raises `TypeError` for forward references",
+        ),
+    ],
+)
+def test_compile_type_check_raises(hint, expected_context):
+    with expected_context:
+        assert tv.compile_type_check(hint) is tv.compile_type_check(hint)
+
+
+@pytest.mark.parametrize(
+    "value, expected_context",
+    [
+        pytest.param([{"a": 1.0}], does_not_raise(), id="Ensure passes valid value"),
+        pytest.param(
+            [{"a": "1"}],
+            pytest.raises(
+                TypeError,
+                match=r"attrib expecting List\[Dict\[str, Optional\[float\]\]\]",
+            ),
+            id="Ensure raises `TypeError` naming the hint",
+        ),
+    ],
+)
+def test_validate_type(value, expected_context):
+    @attrs.define
+    class TestClass:
+        attrib: list = attrs.field(
+            validator=[tv.validate_type(List[Dict[str, Optional[float]]])]
+        )
+
+    with expected_context:
+        TestClass(value)
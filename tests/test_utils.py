@@ -1,3 +1,4 @@
+import os
 from contextlib import nullcontext as does_not_raise
 
 import pytest
@@ -115,3 +116,201 @@ def test_catch_raise(
                 err.args[0]["caught_error"], type(exp_err.args[0]["caught_error"])
             )
             assert err.args[0]["msg"] == exp_err.args[0]["msg"]
+
+
+@pytest.mark.parametrize(
+    "diff, expected_result, expected_context",
+    [
+        pytest.param(
+            "--- a/mod.py\n+++ b/mod.py\n@@ -14 +14,2 @@ def f(\n-    a = 1\n+    a = 2\n+    b = 3\n",
+            {14, 15},
+            does_not_raise(),
+            id="Ensure returns the added lines of a replacement",
+        ),
+        pytest.param(
+            "--- a/mod.py\n+++ b/mod.py\n@@ -6 +5,0 @@ def g(\n-    b = 2\n",
+            {5},
+            does_not_raise(),
+            id="Ensure marks the line above a removal when `-U0`",
+        ),
+        pytest.param(
+            "@@ -4,3 +4,2 @@\n x = 1\n-y = 2\n z = 3\n",
+            {4},
+            does_not_raise(),
+            id="Ensure marks the line above a removal between context lines",
+        ),
+        pytest.param(
+            "@@ -4,2 +4,1 @@\n x = 1\n-y = 2\n",
+            {4},
+            does_not_raise(),
+            id="Ensure marks the line above a removal ending a hunk",
+        ),
+        pytest.param(
+            "@@ -1 +0,0 @@\n-x = 1\n",
+            {1},
+            does_not_raise(),
+            id="Ensure marks the first line when the removal is at the top",
+        ),
+        pytest.param(
+            "@@ -3,3 +3,3 @@\n x = 1\n-y = 2\n+y = 3\n z = 4\n\\ No newline at end of file\n",
+            {4},
+            does_not_raise(),
+            id="Ensure context lines advance the position without being marked",
+        ),
+        pytest.param(
+            "@@ -1,2 +1,2 @@\n--- removed comment\n+--- added comment\n a = 1\n",
+            {1},
+            does_not_raise(),
+            id="Ensure changed lines resembling file headers are kept",
+        ),
+        pytest.param(
+            "",
+            set(),
+            does_not_raise(),
+            id="Ensure returns empty set when `diff` is empty",
+        ),
+    ],
+)
+def test_get_changed_lines(diff, expected_result, expected_context):
+    with expected_context:
+        assert utils.get_changed_lines(diff) == expected_result
+
+
+MULTI_FILE_DIFF = (
+    "diff --git a/other.py b/other.py\n--- a/other.py\n+++ b/other.py\n"
+    "@@ -5 +5 @@\n-x = 1\n+x = 2\n"
+    "diff --git a/pkg/mod.py b/pkg/mod.py\n--- a/pkg/mod.py\n+++ b/pkg/mod.py\n"
+    "@@ -2 +2,2 @@\n-y = 1\n+y = 2\n+z = 3\n"
+    "diff --git a/old.py b/old.py\n--- a/old.py\n+++ /dev/null\n"
+    "@@ -1 +0,0 @@\n-w = 1\n"
+)
+
+
+@pytest.mark.parametrize(
+    "path, expected_result, expected_context",
+    [
+        pytest.param(
+            "pkg/mod.py",
+            {2, 3},
+            does_not_raise(),
+            id="Ensure only returns the lines of `path`",
+        ),
+        pytest.param(
+            os.path.abspath("other.py"),
+            {5},
+            does_not_raise(),
+            id="Ensure matches absolute paths to the diff's relative paths",
+        ),
+        pytest.param(
+            "mod.py",
+            set(),
+            does_not_raise(),
+            id="Ensure a file name alone doesn't match a file in a directory",
+        ),
+        pytest.param(
+            None,
+            None,
+            pytest.raises(ValueError, match="diff changes 2 files"),
+            id="Ensure raises `ValueError` without `path` when the diff changes several files",
+        ),
+    ],
+)
+def test_get_changed_lines_multi_file(path, expected_result, expected_context):
+    with expected_context:
+        assert utils.get_changed_lines(MULTI_FILE_DIFF, path) == expected_result
+
+
+@pytest.mark.parametrize(
+    "src_bytes, expected_result, expected_context",
+    [
+        pytest.param(
+            b"# -*- coding: latin-1 -*-\nname = '\xe9'\n",
+            "# -*- coding: latin-1 -*-\nname = '\xe9'\n",
+            does_not_raise(),
+            id="Ensure decodes with the PEP 263 cookie when `src_bytes` declares one",
+        ),
+        pytest.param(
+            b"\xef\xbb\xbfname = 'caf\xc3\xa9'\r\n",
+            "name = 'caf\xe9'\n",
+            does_not_raise(),
+            id="Ensure strips BOM and normalises newlines when `src_bytes` is utf-8",
+        ),
+        pytest.param(
+            b"# coding: not-a-codec\n",
+            None,
+            pytest.raises(SyntaxError),
+            id="Ensure raises `SyntaxError` if the coding cookie is unknown",
+        ),
+    ],
+)
+def test_get_src_code(tmp_path, src_bytes, expected_result, expected_context):
+    path = tmp_path / "mod.py"
+    path.write_bytes(src_bytes)
+    with expected_context:
+        assert utils.get_src_code(str(path)) == expected_result
+
+
+@pytest.mark.parametrize(
+    "src_bytes, expected_context",
+    [
+        pytest.param(
+            b"def f(a: int):\n    return a\n" * 10,
+            does_not_raise(),
+            id="Ensure reads the bytes of the file",
+        ),
+        pytest.param(b"", does_not_raise(), id="Ensure reads empty files"),
+    ],
+)
+def test_read_src_bytes(tmp_path, src_bytes, expected_context):
+    path = tmp_path / "mod.py"
+    path.write_bytes(src_bytes)
+    with expected_context:
+        assert utils.read_src_bytes(str(path)) == src_bytes
+
+
+@pytest.mark.parametrize(
+    "n_files, max_workers, expected_context",
+    [
+        pytest.param(0, 4, does_not_raise(), id="Ensure handles no paths"),
+        pytest.param(10, 3, does_not_raise(), id="Ensure keeps order of `paths`"),
+        pytest.param(2, 4, does_not_raise(), id="Ensure handles fewer paths"),
+    ],
+)
+def test_read_src_modules(tmp_path, n_files, max_workers, expected_context):
+    paths = []
+    for idx in range(n_files):
+        path = tmp_path / f"mod_{idx}.py"
+        path.write_bytes(
+            f"# -*- coding: latin-1 -*-\nx_{idx} = '\xe9'\n".encode("latin-1")
+        )
+        paths.append(str(path))
+
+    with expected_context:
+        res = list(utils.read_src_modules(paths, max_workers))
+        assert [path for path, _ in res] == paths
+        assert [module.code for _, module in res] == [
+            utils.get_src_code(path) for path in paths
+        ]
+
+
+@pytest.mark.parametrize(
+    "max_workers, expected_context",
+    [
+        pytest.param(1, does_not_raise(), id="Ensure reads one file ahead"),
+        pytest.param(8, does_not_raise(), id="Ensure handles more workers than paths"),
+    ],
+)
+def test_prefetch(tmp_path, max_workers, expected_context):
+    paths = [str(tmp_path / f"mod_{idx}.py") for idx in range(4)]
+    for idx, path in enumerate(paths):
+        if idx != 1:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"x = {idx}\n")
+
+    with expected_context:
+        res = list(utils.prefetch(utils.get_src_code, paths, max_workers))
+        assert [path for path, _ in res] == paths
+        # the missing file only fails its own future
+        with pytest.raises(FileNotFoundError):
+            res[1][1].result()
+        assert [future.result() for _, future in res[2:]] == ["x = 2\n", "x = 3\n"]
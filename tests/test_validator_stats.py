@@ -0,0 +1,82 @@
+import attrs
+import pytest
+
+import class_inspector.validator_stats as vs
+from class_inspector.custom_validators import (
+    validate_bool_func,
+    validate_sequence_of_type,
+)
+
+
+@pytest.fixture
+def stats_enabled(monkeypatch):
+    monkeypatch.setattr(vs, "_enabled", True)
+    vs.reset_validator_stats()
+    yield
+    vs.reset_validator_stats()
+
+
+def is_positive(value):
+    return value > 0
+
+
+def test_instrument_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(vs, "_enabled", False)
+    validator = validate_bool_func(is_positive)
+    assert vs.instrument(validator, "validate_bool_func") is validator
+
+
+@pytest.mark.usefixtures("stats_enabled")
+def test_get_validator_stats():
+    @attrs.define
+    class Record:
+        count: int = attrs.field(validator=[validate_bool_func(is_positive)])
+        values: list = attrs.field(validator=[validate_sequence_of_type(int)])
+
+    Record(1, [1, 2, 3])
+    Record(2, [])
+    with pytest.raises(ValueError):
+        Record(0, [1])
+
+    stats = vs.get_validator_stats()
+    count_stats = stats[
+        ("test_get_validator_stats.<locals>.Record", "count", "validate_bool_func")
+    ]
+    values_stats = stats[
+        (
+            "test_get_validator_stats.<locals>.Record",
+            "values",
+            "validate_sequence_of_type",
+        )
+    ]
+    assert (count_stats.calls, count_stats.n_items, count_stats.failures) == (3, 3, 1)
+    assert (values_stats.calls, values_stats.n_items, values_stats.failures) == (
+        2,
+        3,
+        0,
+    )
+    assert count_stats.total_ns > 0
+
+    # snapshots are copies
+    count_stats.calls = 100
+    assert (
+        vs.get_validator_stats()[
+            ("test_get_validator_stats.<locals>.Record", "count", "validate_bool_func")
+        ].calls
+        == 3
+    )
+
+
+@pytest.mark.usefixtures("stats_enabled")
+def test_validator_stats_report():
+    @attrs.define
+    class Record:
+        count: int = attrs.field(validator=[validate_bool_func(is_positive)])
+        values: list = attrs.field(validator=[validate_sequence_of_type(int)])
+
+    Record(1, list(range(1000)))
+
+    report = vs.validator_stats_report(sort_by="n_items", n=1)
+    lines = report.splitlines()
+    assert len(lines) == 2
+    assert "Record.values validate_sequence_of_type" in lines[1]